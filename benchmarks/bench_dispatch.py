@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Замер скорости поиска команд CommandProcessor
+
+Генерирует синтетические команды (10-10000 штук) и корпус фраз трех видов:
+попадания (ключевое слово в окружении других слов), почти попадания
+(ключевое слово с опечаткой распознавания) и посторонние фразы. Выполнение
+команд заменено заглушкой, так что замеряется только поиск.
+
+Пример:
+    python benchmarks/bench_dispatch.py --sizes 10 100 1000 --output dispatch.json
+
+Сводка печатается по ходу замера, полные результаты сохраняются в JSON,
+чтобы сравнивать запуски между собой.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from commands.base_command import BaseCommand
+from commands.command_processor import CommandProcessor
+from utils.latency_stats import LatencyStats
+
+
+# Повелительная форма и инфинитив
+VERBS = [
+    ("открой", "открыть"), ("закрой", "закрыть"), ("запусти", "запустить"),
+    ("покажи", "показать"), ("включи", "включить"), ("выключи", "выключить"),
+    ("найди", "найти"), ("обнови", "обновить"), ("проверь", "проверить"),
+    ("сохрани", "сохранить")
+]
+
+# Без слов, совпадающих с ключевыми словами встроенных команд
+OBJECTS = [
+    "календарь", "заметки", "карту", "новости", "фотографии", "видео", "документы",
+    "загрузки", "терминал", "калькулятор", "плеер", "радио", "подкаст", "чат",
+    "контакты", "будильник", "таймер", "напоминания", "список покупок", "презентацию",
+    "таблицу", "редактор", "камеру", "галерею", "диспетчер задач", "настройки", "свет",
+    "кондиционер", "телевизор", "торрент", "переводчик", "словарь", "блокнот", "сканер",
+    "принтер", "проектор", "архив", "корзину", "буфер обмена", "проводник"
+]
+
+CONTEXTS = [
+    "на работе", "дома", "в облаке", "из архива", "для отчета", "для проекта",
+    "на сервере", "на ноутбуке", "на телефоне", "в офисе", "в машине", "на кухне",
+    "в спальне", "для детей", "для гостей", "за неделю", "за месяц", "за вчера",
+    "по умолчанию", "по расписанию", "в фоне", "в новом окне", "на втором экране",
+    "на весь экран", "без звука"
+]
+
+PREFIXES = ["", "пожалуйста ", "сенди ", "слушай "]
+SUFFIXES = ["", " пожалуйста", " сейчас", " быстрее"]
+
+# Посторонняя речь: подлежащее и сказуемое
+OPENERS = ["", "слушай ", "знаешь ", "а "]
+SUBJECTS = [
+    "кот", "сосед", "начальник", "мой брат", "бабушка", "этот фильм", "новый сериал",
+    "наш город", "футбольный матч", "дождь"
+]
+PREDICATES = [
+    "опять опаздывает", "очень понравился", "был вчера вечером", "кажется скучным",
+    "ждет нас в гости", "снова начался", "совсем не изменился", "слишком шумный",
+    "уже закончился", "всех удивил"
+]
+
+CATEGORIES = ("hit", "near_miss", "non_command")
+MAX_COMMANDS = len(VERBS) * len(OBJECTS) * len(CONTEXTS)
+
+
+class SyntheticCommand(BaseCommand):
+    """Команда с синтетическими ключевыми словами"""
+    
+    def __init__(self, verb: tuple, obj: str, context: str):
+        super().__init__(
+            name=f"{verb[0]} {obj} {context}",
+            description="Синтетическая команда для замера",
+            keywords=[f"{verb[0]} {obj} {context}", f"{verb[1]} {obj} {context}"]
+        )
+    
+    def execute(self, command_text: str):
+        return True, self.name
+
+
+def build_commands(count: int, rng: random.Random) -> list:
+    """Случайные, но воспроизводимые сочетания глагола, объекта и уточнения"""
+    combos = [(v, o, c) for v in VERBS for o in OBJECTS for c in CONTEXTS]
+    rng.shuffle(combos)
+    return [SyntheticCommand(*combo) for combo in combos[:count]]
+
+
+def typo(text: str, rng: random.Random) -> str:
+    """Одна ошибка распознавания: пропуск, повтор, перестановка или замена буквы"""
+    positions = [i for i, char in enumerate(text) if char.isalpha()]
+    i = rng.choice(positions[1:-1] or positions)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return text[:i] + text[i + 1:]
+    if kind == 1:
+        return text[:i] + text[i] + text[i:]
+    if kind == 2 and i + 1 < len(text) and text[i + 1].isalpha():
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    replacement = rng.choice([c for c in "аеиоуы" if c != text[i]])
+    return text[:i] + replacement + text[i + 1:]
+
+
+def build_corpus(commands: list, size: int, rng: random.Random) -> dict:
+    """
+    Фразы каждого вида
+    
+    Returns:
+        dict: вид -> список (фраза, ожидаемая команда или None)
+    """
+    corpus = {category: [] for category in CATEGORIES}
+    for _ in range(size):
+        command = rng.choice(commands)
+        keyword = rng.choice(command.keywords)
+        frame = rng.choice(PREFIXES) + "{}" + rng.choice(SUFFIXES)
+        corpus["hit"].append((frame.format(keyword), command))
+        corpus["near_miss"].append((frame.format(typo(keyword, rng)), command))
+        phrase = rng.choice(OPENERS) + rng.choice(SUBJECTS) + " " + rng.choice(PREDICATES)
+        corpus["non_command"].append((phrase, None))
+    return corpus
+
+
+def create_processor(commands: list, mode: str, fuzzy_threshold: float) -> CommandProcessor:
+    """Обработчик с синтетическими командами и заглушкой выполнения"""
+    processor = CommandProcessor(max_workers=1, fuzzy_threshold=fuzzy_threshold, dispatch_mode=mode)
+    for command in commands:
+        processor.add_command(command)
+    # Без пула потоков и кэша: замеряется только поиск команды
+    processor.execute_cached = lambda command, command_text: (True, command.name)
+    return processor
+
+
+def measure(processor: CommandProcessor, phrases: list) -> dict:
+    """Пропускная способность, задержки и доля верных ответов"""
+    stats = LatencyStats(window=len(phrases))
+    correct = 0
+    process = processor.process_command
+    clock = time.perf_counter
+    
+    started = clock()
+    for text, expected in phrases:
+        call_started = clock()
+        success, result = process(text)
+        stats.add(clock() - call_started)
+        if expected is None:
+            correct += not success
+        else:
+            correct += success and result == expected.name
+    elapsed = clock() - started
+    
+    return {
+        'calls': len(phrases),
+        'throughput_per_s': round(len(phrases) / elapsed, 1) if elapsed else None,
+        'latency': stats.summary(),
+        'accuracy': round(correct / len(phrases), 4) if phrases else None
+    }
+
+
+def measure_allocations(processor: CommandProcessor, phrases: list) -> dict:
+    """
+    Выделения памяти под tracemalloc (отдельный проход, он сильно замедляет)
+    
+    blocks_per_call и bytes_per_call — оставшиеся после прохода блоки
+    (в том числе заполнение кэшей), peak_kb — пик временной памяти,
+    gc_collections — число сборок мусора за проход.
+    """
+    gc.collect()
+    collections_before = sum(generation['collections'] for generation in gc.get_stats())
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        baseline, _ = tracemalloc.get_traced_memory()
+        for text, _ in phrases:
+            processor.process_command(text)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    collections = sum(generation['collections'] for generation in gc.get_stats()) - collections_before
+    
+    diff = after.compare_to(before, 'filename')
+    blocks = sum(stat.count_diff for stat in diff)
+    size = sum(stat.size_diff for stat in diff)
+    calls = max(1, len(phrases))
+    return {
+        'calls': len(phrases),
+        'blocks_per_call': round(blocks / calls, 2),
+        'bytes_per_call': round(size / calls, 1),
+        'peak_kb': round((peak - baseline) / 1024, 1),
+        'gc_collections': collections
+    }
+
+
+def run(args) -> dict:
+    results = []
+    for count in args.sizes:
+        rng = random.Random(args.seed)
+        commands = build_commands(count, rng)
+        corpus = build_corpus(commands, args.calls, rng)
+        
+        for mode in args.modes:
+            started = time.perf_counter()
+            processor = create_processor(commands, mode, args.fuzzy_threshold)
+            # Ленивые индексы строятся при первом поиске
+            processor.process_command(corpus["hit"][0][0])
+            build_ms = round((time.perf_counter() - started) * 1000, 1)
+            
+            try:
+                for category in CATEGORIES:
+                    phrases = corpus[category]
+                    measure(processor, phrases[:args.warmup])
+                    entry = {
+                        'commands': count,
+                        'registered': len(processor.all_commands),
+                        'mode': mode,
+                        'category': category,
+                        'build_ms': build_ms
+                    }
+                    entry.update(measure(processor, phrases))
+                    if not args.no_alloc:
+                        entry['alloc'] = measure_allocations(processor, phrases[:args.alloc_calls])
+                    results.append(entry)
+                    print_entry(entry)
+            finally:
+                processor.shutdown()
+    
+    return {
+        'benchmark': 'dispatch',
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'processor': platform.processor()
+        },
+        'parameters': {
+            'sizes': args.sizes,
+            'modes': args.modes,
+            'calls': args.calls,
+            'warmup': args.warmup,
+            'seed': args.seed,
+            'fuzzy_threshold': args.fuzzy_threshold
+        },
+        'results': results
+    }
+
+
+def print_entry(entry: dict):
+    latency = entry['latency']
+    print(f"{entry['commands']:>6} {entry['mode']:<12} {entry['category']:<12} "
+          f"{entry['throughput_per_s']:>10} вызовов/с  p50 {latency['p50_ms']} мс  "
+          f"p99 {latency['p99_ms']} мс  точность {entry['accuracy']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Замер скорости поиска команд")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000],
+                        help="Число синтетических команд (до %d)" % MAX_COMMANDS)
+    parser.add_argument('--modes', nargs='+', default=[CommandProcessor.FIRST_MATCH, CommandProcessor.RANKED],
+                        choices=[CommandProcessor.FIRST_MATCH, CommandProcessor.RANKED])
+    parser.add_argument('--calls', type=int, default=2000, help="Фраз каждого вида")
+    parser.add_argument('--warmup', type=int, default=200, help="Фраз для прогрева")
+    parser.add_argument('--alloc-calls', type=int, default=300, help="Фраз для замера памяти")
+    parser.add_argument('--no-alloc', action='store_true', help="Не замерять выделения памяти")
+    parser.add_argument('--fuzzy-threshold', type=float, default=0.75)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='bench_dispatch.json', help="Файл для JSON")
+    args = parser.parse_args(argv)
+    
+    for count in args.sizes:
+        if not 0 < count <= MAX_COMMANDS:
+            parser.error(f"число команд должно быть от 1 до {MAX_COMMANDS}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
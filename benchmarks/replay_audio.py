@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Прогон голосового помощника на записанных фразах
+
+Записи из каталога (WAV/FLAC) подаются вместо микрофона и проходят тот же
+конвейер захват → распознавание → выполнение → речь на общем ядре
+помощника (без Qt). Распознавание заменено заглушкой: текст каждой записи
+берется из transcripts.json, файла .txt рядом с записью или имени файла
+("который_час.wav" → "который час"). Звуковая карта не нужна.
+
+По умолчанию команды только ищутся, как в run_bulk.py --match-only: прогон
+не открывает браузер, не создает папки и не запускает приложения. С
+--execute найденные команды выполняются и их ответы озвучиваются.
+
+Пример:
+    python benchmarks/replay_audio.py fixtures/audio --speed 4 --output replay.json
+    python benchmarks/replay_audio.py fixtures/audio --execute --mute
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from config.config_manager import ConfigManager
+from voice.assistant_core import AssistantCore
+from voice.audio_source import FileReplaySource
+from voice.recognizers import RecognitionError, StubRecognizer
+
+
+def build_settings(args) -> dict:
+    """Настройки помощника для прогона"""
+    settings = ConfigManager(args.config).get_assistant_settings() if args.config else {}
+    settings.update({
+        # Записи начинаются с тишины: калибровка по ним не нужна
+        'ambient_duration': 0,
+        'trace_latency': True,
+        'early_dispatch': False,
+        'require_wake_word': args.wake_word
+    })
+    if args.mute:
+        settings['volume'] = 0.0
+    return settings
+
+
+def wait_until_idle(core, source, settle: float, timeout: float) -> bool:
+    """
+    Ожидание конца записей и опустошения конвейера
+    
+    Returns:
+        bool: False если не дождались за timeout
+    """
+    deadline = time.monotonic() + timeout
+    last_processed = None
+    quiet_since = None
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        if not source.finished.is_set() or core.pipeline is None:
+            continue
+        stages = core.pipeline.stages
+        processed = sum(stage.processed for stage in stages)
+        busy = any(stage.queue.qsize() for stage in stages)
+        if busy or processed != last_processed:
+            last_processed = processed
+            quiet_since = time.monotonic()
+        elif time.monotonic() - quiet_since >= settle:
+            return True
+    return False
+
+
+def run(args) -> dict:
+    source = FileReplaySource(args.path, speed=args.speed, gap_seconds=args.gap)
+    recognizer = StubRecognizer.for_source(source)
+    # Без выполнения отвечать нечего, поэтому и синтез не нужен
+    core = AssistantCore(build_settings(args), speak=args.execute, speech_backend=recognizer)
+    
+    recognized = []
+    matched = []
+    
+    def recognize(audio):
+        try:
+            text = core.transcribe(audio)
+        except RecognitionError:
+            return None
+        if text:
+            recognized.append(text)
+        return text
+    
+    def dispatch(text):
+        if args.execute:
+            return core.execute(text)['spoken']
+        match = core.command_processor.match_details(text.lower().strip())
+        matched.append(match['command'].name if match['command'] else None)
+        return None
+    
+    started = time.monotonic()
+    core.start_pipeline(source, recognize, dispatch)
+    completed = wait_until_idle(core, source, args.settle, args.timeout)
+    elapsed = time.monotonic() - started
+    
+    stats = core.get_statistics()
+    core.shutdown()
+    
+    dispatch = stats.get('dispatch', {})
+    return {
+        'benchmark': 'replay',
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform()
+        },
+        'parameters': {
+            'path': args.path,
+            'speed': args.speed,
+            'gap': args.gap,
+            'files': len(source.paths),
+            'execute': args.execute
+        },
+        'completed': completed,
+        'audio_seconds': round(source.total_seconds, 3),
+        'wall_seconds': round(elapsed, 3),
+        'phrases_per_second': round(len(recognized) / elapsed, 3) if elapsed else None,
+        'recognized': len(recognized),
+        'unknown_phrases': recognizer.unknown,
+        'dispatched': dispatch.get('processed', 0),
+        'transcripts': recognized,
+        'matched_commands': matched if not args.execute else None,
+        'pipeline': stats
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Прогон помощника на записанных фразах")
+    parser.add_argument('path', help="Каталог с записями WAV/FLAC или один файл")
+    parser.add_argument('--speed', type=float, default=1.0, help="Скорость воспроизведения (1.0 — реальное время)")
+    parser.add_argument('--gap', type=float, default=1.0, help="Пауза между записями (секунды)")
+    parser.add_argument('--config', default=None, help="Файл конфигурации помощника")
+    parser.add_argument('--wake-word', action='store_true', help="Требовать слово активации")
+    parser.add_argument('--execute', action='store_true',
+                        help="Выполнять найденные команды и озвучивать ответы (по умолчанию только поиск)")
+    parser.add_argument('--mute', action='store_true', help="Синтез без звука")
+    parser.add_argument('--settle', type=float, default=1.5, help="Сколько секунд конвейер должен простаивать в конце")
+    parser.add_argument('--timeout', type=float, default=600.0, help="Предельное время прогона (секунды)")
+    parser.add_argument('--output', default='replay_audio.json', help="Файл для JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    
+    trace = report['pipeline'].get('trace', {})
+    handled = "выполнено" if args.execute else "передано на поиск команды"
+    print(f"Фраз распознано: {report['recognized']} из {report['parameters']['files']} записей, "
+          f"{handled}: {report['dispatched']}, за {report['wall_seconds']} с")
+    if trace.get('completed'):
+        total = trace['total']
+        print(f"Полный цикл: p50 {total['p50_ms']} мс, p95 {total['p95_ms']} мс")
+    print(f"Результаты сохранены в {args.output}")
+    if not report['completed']:
+        print("Конвейер не опустел за отведенное время")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Пакетная обработка текстовых команд Sendi (фразы из файла или stdin, результаты в JSONL)
+"""
+
+import sys
+import os
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+    from headless.bulk import main
+    main()
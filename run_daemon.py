@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Запуск Sendi без графического интерфейса (служба с Unix-сокетом)
+"""
+
+import sys
+import os
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+    from headless.server import main
+    main()
@@ -6,5 +6,7 @@ from .command_processor import CommandProcessor
 from .base_command import BaseCommand
 from .system_commands import SystemCommands
 from .web_commands import WebCommands
+from .cache_policy import CachePolicy
+from .intent_ranker import IntentRanker
 
-__all__ = ['CommandProcessor', 'BaseCommand', 'SystemCommands', 'WebCommands'] 
\ No newline at end of file
+__all__ = ['CommandProcessor', 'BaseCommand', 'SystemCommands', 'WebCommands', 'CachePolicy', 'IntentRanker'] 
\ No newline at end of file
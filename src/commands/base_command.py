@@ -3,12 +3,27 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Tuple, Any
+from typing import Tuple, Any, List
+
+from .cache_policy import CachePolicy
 
 
 class BaseCommand(ABC):
     """Базовый класс для всех команд"""
     
+    # Постоянные ответы команды (заранее синтезируются в кэш TTS)
+    fixed_responses: Tuple[str, ...] = ()
+    
+    # Допустимое время выполнения (секунды), после которого команда бросается
+    timeout: float = 5.0
+    
+    # Сколько времени результат команды можно отдавать повторно без выполнения
+    cache_policy: CachePolicy = CachePolicy.none()
+    
+    # Команду можно выполнять одновременно с другими (только чтение, без запуска
+    # приложений и изменений на диске)
+    parallel_safe: bool = False
+    
     def __init__(self, name: str, description: str, keywords: list):
         self.name = name
         self.description = description
@@ -40,6 +55,31 @@ class BaseCommand(ABC):
         command_lower = command_text.lower()
         return any(keyword in command_lower for keyword in self.keywords)
     
+    def cache_key(self, command_text: str) -> str:
+        """
+        Вариант результата в кэше
+        
+        Обработчик хранит результат под названием команды и этим вариантом,
+        поэтому варианты разных команд не пересекаются. По умолчанию
+        результат не зависит от формулировки запроса.
+        
+        Args:
+            command_text: Текст команды
+            
+        Returns:
+            str: Вариант ключа кэша (пустая строка — один результат на команду)
+        """
+        return ""
+    
+    def get_fixed_responses(self) -> List[str]:
+        """
+        Получение постоянных ответов команды
+        
+        Returns:
+            List[str]: Ответы, не зависящие от времени и состояния системы
+        """
+        return list(self.fixed_responses)
+    
     def get_help(self) -> str:
         """
         Получение справки по команде
@@ -0,0 +1,194 @@
+"""
+Политики кэширования результатов команд
+"""
+
+import datetime
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+
+def next_midnight(now: float) -> float:
+    """
+    Ближайшая полночь по местному времени
+    
+    Args:
+        now: Текущее время (секунды эпохи)
+    
+    Returns:
+        float: Время полуночи (секунды эпохи)
+    """
+    today = datetime.datetime.fromtimestamp(now).date()
+    midnight = datetime.datetime.combine(today + datetime.timedelta(days=1), datetime.time())
+    return midnight.timestamp()
+
+
+class CachePolicy:
+    """
+    Как долго результат команды остается верным.
+    
+    none — не кэшировать, ttl — хранить заданное число секунд,
+    until — хранить до момента, который вычисляет функция.
+    """
+    
+    NONE = "none"
+    TTL = "ttl"
+    UNTIL = "until"
+    
+    def __init__(self, kind: str = NONE, seconds: float = 0.0,
+                 expires: Optional[Callable[[float], float]] = None):
+        """
+        Args:
+            kind: none, ttl или until
+            seconds: Время жизни для ttl
+            expires: Функция now -> момент истечения для until
+        """
+        self.kind = kind
+        self.seconds = seconds
+        self.expires = expires
+    
+    @classmethod
+    def none(cls) -> 'CachePolicy':
+        return cls(cls.NONE)
+    
+    @classmethod
+    def ttl(cls, seconds: float) -> 'CachePolicy':
+        return cls(cls.TTL, seconds=seconds)
+    
+    @classmethod
+    def until(cls, expires: Callable[[float], float]) -> 'CachePolicy':
+        return cls(cls.UNTIL, expires=expires)
+    
+    def expiry(self, now: float) -> Optional[float]:
+        """
+        Момент истечения результата, полученного сейчас
+        
+        Args:
+            now: Текущее время (секунды эпохи)
+        
+        Returns:
+            Optional[float]: Время истечения или None, если кэшировать нельзя
+        """
+        if self.kind == self.TTL and self.seconds > 0:
+            return now + self.seconds
+        if self.kind == self.UNTIL and self.expires is not None:
+            return self.expires(now)
+        return None
+
+
+class ResultCache:
+    """Общий ограниченный LRU-кэш результатов команд"""
+    
+    # Разделитель названия команды и варианта в ключе (в названиях не встречается)
+    SEPARATOR = "\0"
+    
+    def __init__(self, max_entries: int = 128):
+        """
+        Args:
+            max_entries: Сколько результатов хранить
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, tuple]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: str, now: Optional[float] = None) -> Optional[tuple]:
+        """
+        Результат из кэша
+        
+        Args:
+            key: Ключ команды
+            now: Текущее время (по умолчанию time.time())
+        
+        Returns:
+            Optional[tuple]: (успех, результат) или None
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, result = entry
+            if now >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+    
+    def put(self, key: str, result: tuple, expires_at: float):
+        """
+        Сохранение результата
+        
+        Args:
+            key: Ключ команды
+            result: (успех, результат)
+            expires_at: Момент истечения (секунды эпохи)
+        """
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, key: Optional[str] = None):
+        """Удаление одного результата или всего кэша"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+    
+    @classmethod
+    def make_key(cls, command_name: str, variant: str = "") -> str:
+        """
+        Ключ результата команды
+        
+        Args:
+            command_name: Название команды
+            variant: Вариант результата (BaseCommand.cache_key)
+        
+        Returns:
+            str: Ключ кэша
+        """
+        return f"{command_name}{cls.SEPARATOR}{variant}"
+    
+    def invalidate_command(self, command_name: str) -> int:
+        """
+        Удаление всех результатов одной команды
+        
+        Args:
+            command_name: Название команды
+        
+        Returns:
+            int: Сколько результатов удалено
+        """
+        prefix = self.make_key(command_name)
+        with self._lock:
+            stale = [key for key in self._entries if key.startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+    
+    def get_statistics(self) -> dict:
+        """Счетчики попаданий, промахов и вытеснений"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'capacity': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / total if total else None
+            }
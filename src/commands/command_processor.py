@@ -2,21 +2,104 @@
 Обработчик команд голосового помощника
 """
 
-from typing import Tuple
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional, Tuple
+import sys
+import os
+
+# Добавляем путь к модулям
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from .system_commands import SystemCommands
 from .web_commands import WebCommands
+from .keyword_index import KeywordIndex
+from .cache_policy import CachePolicy, ResultCache
+from .fuzzy_matcher import FuzzyMatcher
+from .normalizer import TextNormalizer
+from .intent_ranker import IntentRanker
+from utils.latency_stats import LatencyStats
+from utils.launcher import ProcessLauncher
+from utils.tracing import current_trace
 
 
 class CommandProcessor:
     """Обработчик команд"""
     
-    def __init__(self):
+    TIMEOUT_RESPONSE = "Команда выполняется слишком долго"
+    BUSY_RESPONSE = "Предыдущие команды еще выполняются"
+    
+    # Режимы выбора команды
+    FIRST_MATCH = "first_match"
+    RANKED = "ranked"
+    
+    def __init__(self, max_workers: int = 4, cache_size: int = 128,
+                 fuzzy_threshold: float = 0.75, dispatch_mode: str = FIRST_MATCH,
+                 intent_threshold: float = 0.35, ambiguity_margin: float = 0.1):
+        """
+        Args:
+            max_workers: Число потоков выполнения команд
+            cache_size: Емкость кэша результатов
+            fuzzy_threshold: Минимальная похожесть для нечеткого совпадения
+                (1.0 — только точные совпадения)
+            dispatch_mode: first_match — первая совпавшая по порядку регистрации,
+                ranked — лучшая по оценке всех команд
+            intent_threshold: Минимальная оценка команды в режиме ranked
+            ambiguity_margin: Минимальный отрыв от второй команды в режиме ranked
+        """
         self.system_commands = SystemCommands()
         self.web_commands = WebCommands()
         self.all_commands = (
             self.system_commands.get_all_commands() + 
             self.web_commands.get_all_commands()
         )
+        
+        # Индекс ключевых слов для поиска команды за один проход
+        self.keyword_index = KeywordIndex()
+        # Те же ключевые слова в нормальной форме: ловит другие формы слов
+        self.normalizer = TextNormalizer()
+        self.lemma_index = KeywordIndex()
+        # Запасной нечеткий поиск для ошибок распознавания
+        self.fuzzy_threshold = fuzzy_threshold
+        self.fuzzy_matcher = FuzzyMatcher(min_score=fuzzy_threshold)
+        # Оценка всех команд сразу для режима ranked
+        self.dispatch_mode = dispatch_mode
+        self.intent_ranker = IntentRanker(self.normalizer, intent_threshold, ambiguity_margin)
+        for command in self.all_commands:
+            self._index_command(command)
+        
+        # Команды выполняются вне потока распознавания: зависшая команда
+        # занимает один поток пула, а не весь конвейер
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Command")
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.execution_stats: Dict[str, LatencyStats] = {}
+        self.timeouts: Dict[str, int] = {}
+        
+        # Результаты команд с политикой кэширования
+        self.result_cache = ResultCache(cache_size)
+    
+    @classmethod
+    def from_settings(cls, settings: dict, max_workers: int = 4) -> 'CommandProcessor':
+        """
+        Создание обработчика по секции commands конфигурации
+        
+        Args:
+            settings: Настройки (fuzzy_threshold, dispatch_mode,
+                intent_threshold, ambiguity_margin)
+            max_workers: Число потоков выполнения команд
+        
+        Returns:
+            CommandProcessor: Обработчик с настройками поиска команд
+        """
+        return cls(
+            max_workers=max_workers,
+            fuzzy_threshold=settings.get('fuzzy_threshold', 0.75),
+            dispatch_mode=settings.get('dispatch_mode', cls.FIRST_MATCH),
+            intent_threshold=settings.get('intent_threshold', 0.35),
+            ambiguity_margin=settings.get('ambiguity_margin', 0.1)
+        )
     
     def process_command(self, command_text: str) -> Tuple[bool, str]:
         """
@@ -24,19 +107,251 @@ class CommandProcessor:
         
         Args:
             command_text: Текст команды
-            
+        
         Returns:
             Tuple[bool, str]: (успех, результат)
         """
         command_text = command_text.lower().strip()
         
         # Поиск подходящей команды
-        for command in self.all_commands:
-            if command.matches(command_text):
-                return command.execute(command_text)
+        trace = current_trace()
+        match = self.match_details(command_text)
+        if trace is not None:
+            trace.mark('match')
+        result = self.execute_match(match, command_text)
+        if trace is not None and match['command']:
+            trace.mark('execute')
+        return result
+    
+    def execute_match(self, match: dict, command_text: str) -> Tuple[bool, str]:
+        """
+        Выполнение уже найденной команды
+        
+        Args:
+            match: Результат match_details
+            command_text: Текст команды в нижнем регистре
+        
+        Returns:
+            Tuple[bool, str]: (успех, результат)
+        """
+        if match['command']:
+            return self.execute_cached(match['command'], command_text)
         
+        if match['ambiguous']:
+            names = " или ".join(command.name for command in match['candidates'])
+            return False, f"Команда неоднозначна: {names}"
         return False, "Команда не распознана"
     
+    def match_command(self, command_text: str) -> Tuple[Optional[object], float]:
+        """
+        Поиск команды без подробностей
+        
+        Args:
+            command_text: Текст команды в нижнем регистре
+        
+        Returns:
+            Tuple[команда или None, оценка 0..1]
+        """
+        match = self.match_details(command_text)
+        return match['command'], match['score']
+    
+    def match_details(self, command_text: str) -> dict:
+        """
+        Поиск команды с указанием способа и оценки
+        
+        В режиме first_match: точное совпадение, совпадение нормальных форм,
+        затем нечеткое. В режиме ranked сначала ранжируются все команды, а
+        нечеткий поиск остается запасным для ошибок распознавания.
+        
+        Args:
+            command_text: Текст команды в нижнем регистре
+        
+        Returns:
+            dict: command (или None), score, method, ambiguous, candidates
+        """
+        result = {'command': None, 'score': 0.0, 'method': None, 'ambiguous': False, 'candidates': []}
+        
+        if self.dispatch_mode == self.RANKED:
+            decision = self.intent_ranker.decide(command_text)
+            result['score'] = decision['score']
+            result['candidates'] = [command for command, _ in decision['ranking'][:2]]
+            if decision['command'] is not None:
+                result.update(command=decision['command'], method='ranked')
+                return result
+            if decision['ambiguous']:
+                result['ambiguous'] = True
+                return result
+        else:
+            command = self.keyword_index.find(command_text)
+            if command is None:
+                # Границы слов обозначены пробелами, чтобы основа не совпала внутри другого слова
+                command = self.lemma_index.find(f" {self.normalizer.normalize(command_text)} ")
+            if command is not None:
+                result.update(command=command, score=1.0, method='exact', candidates=[command])
+                return result
+        
+        if self.fuzzy_threshold < 1.0:
+            match = self.fuzzy_matcher.match(command_text)
+            if match:
+                result.update(
+                    command=match['command'], score=match['score'],
+                    method='fuzzy', candidates=[match['command']]
+                )
+        return result
+    
+    def rank_commands(self, command_text: str, top_k: int = 5) -> list:
+        """
+        Лучшие команды по оценке (независимо от режима)
+        
+        Args:
+            command_text: Текст команды
+            top_k: Сколько команд вернуть
+        
+        Returns:
+            list: Пары (команда, оценка) по убыванию оценки
+        """
+        return self.intent_ranker.rank(command_text.lower().strip(), top_k)
+    
+    def _index_command(self, command):
+        """Добавление команды в точный, нормализованный и нечеткий индексы"""
+        priority = self.keyword_index.add(command)
+        lemmas = [f" {self.normalizer.normalize(keyword)} " for keyword in command.keywords]
+        # Приоритеты совпадают, потому что команды добавляются в оба индекса по порядку
+        self.lemma_index.add(command, [lemma for lemma in lemmas if lemma.strip()])
+        self.fuzzy_matcher.add(command, priority)
+        self.intent_ranker.add(command)
+    
+    def execute_cached(self, command, command_text: str) -> Tuple[bool, str]:
+        """
+        Выполнение команды с учетом ее политики кэширования
+        
+        Args:
+            command: Команда
+            command_text: Текст команды
+        
+        Returns:
+            Tuple[bool, str]: (успех, результат)
+        """
+        policy = command.cache_policy
+        if policy.kind == CachePolicy.NONE:
+            return self.execute_with_timeout(command, command_text)
+        
+        key = self.result_cache.make_key(command.name, command.cache_key(command_text))
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = self.execute_with_timeout(command, command_text)
+        now = time.time()
+        expires_at = policy.expiry(now)
+        # Ошибки и таймауты не кэшируются
+        if result[0] and expires_at is not None and expires_at > now:
+            self.result_cache.put(key, result, expires_at)
+        return result
+    
+    def execute_with_timeout(self, command, command_text: str) -> Tuple[bool, str]:
+        """
+        Выполнение команды в пуле с ограничением по времени
+        
+        Команду, не уложившуюся в command.timeout, нельзя прервать
+        принудительно: если она еще не началась, она отменяется, иначе
+        результат просто не ждут, а поток освободится по ее завершении.
+        
+        Args:
+            command: Команда
+            command_text: Текст команды
+        
+        Returns:
+            Tuple[bool, str]: (успех, результат) или (False, TIMEOUT_RESPONSE)
+        """
+        with self._lock:
+            # Брошенные команды еще занимают потоки: не копим очередь за ними
+            if self._in_flight >= self.max_workers * 2:
+                return False, self.BUSY_RESPONSE
+            self._in_flight += 1
+        
+        try:
+            future = self.executor.submit(self._run_command, command, command_text)
+        except RuntimeError:
+            # Пул уже остановлен (shutdown): команда не попала в работу
+            self._finish()
+            return False, self.BUSY_RESPONSE
+        # Отмененная команда (по таймауту или позже, при shutdown) не дойдет до
+        # _run_command, поэтому ее место освобождает callback, когда бы отмена ни случилась
+        future.add_done_callback(lambda done: done.cancelled() and self._finish())
+        try:
+            return future.result(timeout=command.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts[command.name] = self.timeouts.get(command.name, 0) + 1
+            print(f"Команда {command.name} не уложилась в {command.timeout} с")
+            return False, self.TIMEOUT_RESPONSE
+        except CancelledError:
+            # Пул остановлен, пока команда ждала в очереди
+            return False, self.BUSY_RESPONSE
+    
+    def _run_command(self, command, command_text: str) -> Tuple[bool, str]:
+        """Выполнение в потоке пула с замером времени"""
+        started = time.perf_counter()
+        try:
+            return command.execute(command_text)
+        finally:
+            self._stats_for(command.name).add(time.perf_counter() - started)
+            self._finish()
+    
+    def _finish(self):
+        with self._lock:
+            self._in_flight -= 1
+    
+    def _stats_for(self, name: str) -> LatencyStats:
+        with self._lock:
+            stats = self.execution_stats.get(name)
+            if stats is None:
+                stats = self.execution_stats[name] = LatencyStats()
+            return stats
+    
+    def get_execution_statistics(self) -> dict:
+        """
+        Время выполнения каждой команды
+        
+        Returns:
+            dict: commands — {название: перцентили p50/p95/p99 и число таймаутов},
+                in_flight — число выполняемых команд, cache — счетчики кэша результатов
+        """
+        with self._lock:
+            names = set(self.execution_stats) | set(self.timeouts)
+            stats = dict(self.execution_stats)
+            timeouts = dict(self.timeouts)
+        
+        commands = {}
+        for name in sorted(names):
+            summary = stats[name].summary() if name in stats else LatencyStats().summary()
+            summary['timeouts'] = timeouts.get(name, 0)
+            commands[name] = summary
+        return {
+            'commands': commands,
+            'in_flight': self._in_flight,
+            'cache': self.result_cache.get_statistics()
+        }
+    
+    def shutdown(self):
+        """Остановка пула без ожидания брошенных команд"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+    
+    def find_command(self, command_text: str):
+        """
+        Поиск команды без выполнения
+        
+        Args:
+            command_text: Текст команды
+        
+        Returns:
+            Подходящая команда или None
+        """
+        command, _ = self.match_command(command_text.lower().strip())
+        return command
+    
     def get_available_commands(self) -> list:
         """
         Получение списка доступных команд
@@ -46,6 +361,20 @@ class CommandProcessor:
         """
         return [command.get_help() for command in self.all_commands]
     
+    def get_fixed_responses(self) -> list:
+        """
+        Получение постоянных ответов всех команд
+        
+        Returns:
+            list: Уникальные ответы в порядке регистрации команд
+        """
+        responses = [self.TIMEOUT_RESPONSE, self.BUSY_RESPONSE, ProcessLauncher.REJECTED_RESPONSE]
+        for command in self.all_commands:
+            for response in command.get_fixed_responses():
+                if response not in responses:
+                    responses.append(response)
+        return responses
+    
     def add_command(self, command):
         """
         Добавление новой команды
@@ -54,6 +383,7 @@ class CommandProcessor:
             command: Экземпляр команды
         """
         self.all_commands.append(command)
+        self._index_command(command)
     
     def remove_command(self, command_name: str):
         """
@@ -62,6 +392,18 @@ class CommandProcessor:
         Args:
             command_name: Название команды
         """
+        removed = [
+            cmd for cmd in self.all_commands 
+            if cmd.name.lower() == command_name.lower()
+        ]
+        for command in removed:
+            self.keyword_index.remove(command)
+            self.lemma_index.remove(command)
+            self.fuzzy_matcher.remove(command)
+            self.intent_ranker.remove(command)
+            # Ключи зависят от текста запроса, поэтому удаляем все результаты команды
+            self.result_cache.invalidate_command(command.name)
+        
         self.all_commands = [
             cmd for cmd in self.all_commands 
             if cmd.name.lower() != command_name.lower()
@@ -73,7 +415,7 @@ class CommandProcessor:
         
         Args:
             command_name: Название команды
-            
+        
         Returns:
             str: Справка по команде
         """
@@ -0,0 +1,294 @@
+"""
+Нечеткий поиск команд по n-граммному индексу ключевых слов
+"""
+
+import itertools
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set
+
+
+def ngrams(text: str, n: int = 3) -> Set[str]:
+    """
+    Символьные n-граммы строки с границами слов
+    
+    Args:
+        text: Строка
+        n: Длина n-граммы
+    
+    Returns:
+        Set[str]: Множество n-грамм
+    """
+    padded = f" {text} "
+    if len(padded) < n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def bounded_levenshtein(a: str, b: str, bound: int) -> Optional[int]:
+    """
+    Расстояние Левенштейна, если оно не больше bound
+    
+    Считается только полоса шириной 2*bound+1 вокруг диагонали, и расчет
+    прекращается, как только вся строка таблицы превысила bound.
+    
+    Args:
+        a: Первая строка
+        b: Вторая строка
+        bound: Максимальное интересующее расстояние
+    
+    Returns:
+        Optional[int]: Расстояние или None, если оно больше bound
+    """
+    if abs(len(a) - len(b)) > bound:
+        return None
+    if a == b:
+        return 0
+    
+    big = bound + 1
+    previous = [j if j <= bound else big for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        low = max(1, i - bound)
+        high = min(len(b), i + bound)
+        current = [big] * (len(b) + 1)
+        current[0] = i if i <= bound else big
+        row_min = current[0]
+        char = a[i - 1]
+        for j in range(low, high + 1):
+            cost = 0 if char == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if value > big:
+                value = big
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > bound:
+            return None
+        previous = current
+    
+    distance = previous[len(b)]
+    return distance if distance <= bound else None
+
+
+class FuzzyMatcher:
+    """
+    Приближенное сопоставление текста с ключевыми словами.
+    
+    Ключевые слова разбиты на n-граммы с инвертированным индексом
+    n-грамма → ключевые слова. Каждая правка меняет не больше n n-грамм,
+    поэтому у окна текста и ключевого слова на расстоянии k должно быть
+    не меньше |G| - n*k общих n-грамм (фильтр по числу общих n-грамм).
+    Отсюда следует, что такое ключевое слово есть хотя бы в одном из
+    |G| - T + 1 самых редких списков окна: просматриваются только они,
+    а частые n-граммы, общие почти для всех слов, пропускаются. Выжившие
+    кандидаты проверяются ограниченным расстоянием Левенштейна.
+    
+    Число допустимых правок растет с длиной ключевого слова; короткие
+    слова (до short_length символов) совпадают только точно.
+    """
+    
+    def __init__(self, n: int = 3, min_score: float = 0.75, short_length: int = 5,
+                 max_postings: int = 1000, max_candidates: int = 64,
+                 compact_ratio: float = 0.25):
+        """
+        Args:
+            n: Длина n-граммы
+            min_score: Минимальная похожесть (1 - расстояние / длина)
+            short_length: Длина, до которой ключевые слова не допускают правок
+            max_postings: Списки n-грамм длиннее этого не просматриваются
+            max_candidates: Сколько кандидатов проверять для одного окна
+            compact_ratio: Доля удаленных ключевых слов, после которой индекс перестраивается
+        """
+        self.n = n
+        self.min_score = min_score
+        self.short_length = short_length
+        self.max_postings = max_postings
+        self.max_candidates = max_candidates
+        self.compact_ratio = compact_ratio
+        
+        # Ключевое слово: (текст, число слов, n-граммы, приоритет команды)
+        self._keywords: List[Optional[tuple]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._commands: Dict[int, object] = {}
+        self._window_sizes: Set[int] = set()
+        self._removed = 0
+    
+    def max_edits(self, length: int, min_score: Optional[float] = None) -> int:
+        """
+        Допустимое число правок для ключевого слова
+        
+        Args:
+            length: Длина ключевого слова
+            min_score: Требуемая похожесть (по умолчанию self.min_score)
+        
+        Returns:
+            int: 0 для коротких слов, иначе (1 - min_score) * length
+        """
+        if length <= self.short_length:
+            return 0
+        if min_score is None:
+            min_score = self.min_score
+        # Поправка на погрешность: оценка, равная порогу, должна проходить
+        return int((1.0 - min_score) * length + 1e-9)
+    
+    def add(self, command, priority: int):
+        """
+        Добавление ключевых слов команды
+        
+        Args:
+            command: Экземпляр команды
+            priority: Приоритет команды (меньше — важнее)
+        """
+        self._commands[priority] = command
+        for keyword in command.keywords:
+            keyword = " ".join(keyword.lower().split())
+            if keyword:
+                self._add_keyword(keyword, priority)
+    
+    def _add_keyword(self, keyword: str, priority: int):
+        grams = frozenset(ngrams(keyword, self.n))
+        keyword_id = len(self._keywords)
+        size = len(keyword.split())
+        self._keywords.append((keyword, size, grams, priority))
+        self._window_sizes.add(size)
+        for gram in grams:
+            self._postings[gram].append(keyword_id)
+    
+    def remove(self, command) -> bool:
+        """
+        Удаление команды
+        
+        Ключевые слова помечаются удаленными, а когда их доля превышает
+        compact_ratio, индекс перестраивается без них.
+        
+        Returns:
+            bool: True если команда была в индексе
+        """
+        priorities = {p for p, indexed in self._commands.items() if indexed is command}
+        if not priorities:
+            return False
+        for priority in priorities:
+            del self._commands[priority]
+        for keyword_id, entry in enumerate(self._keywords):
+            if entry is not None and entry[3] in priorities:
+                self._keywords[keyword_id] = None
+                self._removed += 1
+        if self._removed > self.compact_ratio * len(self._keywords):
+            self._compact()
+        return True
+    
+    def _compact(self):
+        """Перестроение индекса без удаленных ключевых слов"""
+        entries = [entry for entry in self._keywords if entry is not None]
+        self._keywords = []
+        self._postings = defaultdict(list)
+        self._window_sizes = set()
+        self._removed = 0
+        for keyword, _, _, priority in entries:
+            self._add_keyword(keyword, priority)
+    
+    def clear(self):
+        """Очистка индекса"""
+        self._keywords.clear()
+        self._postings.clear()
+        self._commands.clear()
+        self._window_sizes.clear()
+        self._removed = 0
+    
+    def _windows(self, tokens: List[str]):
+        """Окна из подряд идущих слов размеров, близких к размерам ключевых слов"""
+        sizes = set()
+        for size in self._window_sizes:
+            sizes.update((size - 1, size, size + 1))
+        for size in sorted(s for s in sizes if 0 < s <= len(tokens)):
+            for start in range(len(tokens) - size + 1):
+                yield size, " ".join(tokens[start:start + size])
+    
+    def _candidates(self, window: str, grams: Set[str]) -> List[int]:
+        """
+        Ключевые слова, которые могут быть не дальше допустимого от окна
+        
+        Длина подходящего ключевого слова не больше len(window) / min_score,
+        что ограничивает число правок k и требуемое число общих n-грамм T.
+        Просматриваются len(grams) - T + 1 самых редких списков (не длиннее
+        max_postings), из кандидатов остаются max_candidates с наибольшим
+        числом общих n-грамм в них.
+        """
+        longest = int(len(window) / self.min_score) if self.min_score > 0 else len(window) * 4
+        required = max(1, len(grams) - self.n * self.max_edits(longest))
+        postings = sorted(
+            (self._postings[gram] for gram in grams if gram in self._postings), key=len
+        )
+        
+        probes = itertools.takewhile(
+            lambda posting: len(posting) <= self.max_postings,
+            postings[:len(grams) - required + 1]
+        )
+        shared = Counter(itertools.chain.from_iterable(probes))
+        if len(shared) <= self.max_candidates:
+            return list(shared)
+        return [keyword_id for keyword_id, _ in shared.most_common(self.max_candidates)]
+    
+    def match(self, text: str) -> Optional[dict]:
+        """
+        Поиск самой похожей команды
+        
+        Пары окно–кандидат упорядочиваются по верхней оценке похожести (из
+        разницы длин и числа общих n-грамм) и проверяются расстоянием
+        Левенштейна по убыванию этой оценки, пока она не опустится ниже
+        лучшей найденной.
+        
+        Args:
+            text: Текст команды в нижнем регистре
+        
+        Returns:
+            Optional[dict]: command, keyword, fragment, score (0..1) или None
+        """
+        pairs = []
+        for size, window in self._windows(text.split()):
+            grams = ngrams(window, self.n)
+            for keyword_id in self._candidates(window, grams):
+                entry = self._keywords[keyword_id]
+                if entry is None:
+                    continue
+                keyword, keyword_size, keyword_grams, priority = entry
+                if abs(keyword_size - size) > 1:
+                    continue
+                
+                bound = self.max_edits(len(keyword))
+                difference = abs(len(keyword) - len(window))
+                if difference > bound:
+                    continue
+                # Каждая правка убирает не больше n общих n-грамм
+                missing = max(len(grams), len(keyword_grams)) - len(grams & keyword_grams)
+                lower = max(difference, -(-missing // self.n))
+                if lower > bound:
+                    continue
+                longest = max(len(keyword), len(window))
+                pairs.append((1.0 - lower / longest, priority, window, keyword, longest, bound))
+        
+        pairs.sort(key=lambda pair: (-pair[0], pair[1]))
+        best = None
+        for upper, priority, window, keyword, longest, bound in pairs:
+            if best is not None:
+                if upper < best['score'] or (upper == best['score'] and priority >= best['priority']):
+                    break
+                bound = min(bound, self.max_edits(longest, best['score']))
+            distance = bounded_levenshtein(window, keyword, bound)
+            if distance is None:
+                continue
+            
+            score = 1.0 - distance / longest
+            if (best is None or score > best['score']
+                    or (score == best['score'] and priority < best['priority'])):
+                best = {
+                    'command': self._commands[priority],
+                    'keyword': keyword,
+                    'fragment': window,
+                    'score': score,
+                    'priority': priority
+                }
+        
+        return best
+    
+    def __len__(self) -> int:
+        return len(self._commands)
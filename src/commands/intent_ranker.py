@@ -0,0 +1,203 @@
+"""
+Ранжирование команд по TF-IDF через инвертированный индекс признаков
+"""
+
+import math
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .normalizer import TextNormalizer
+
+
+class IntentRanker:
+    """
+    Оценка фразы относительно всех команд сразу.
+    
+    Ключевые слова каждой команды (нормальные формы слов и пары соседних
+    слов) разбираются один раз при добавлении. Из них строится
+    инвертированный индекс признак → (строки команд, нормированные веса
+    TF-IDF), поэтому косинусная близость считается только по признакам
+    фразы и затрагивает лишь команды, у которых они есть.
+    
+    Индекс строится лениво под блокировкой и публикуется одним
+    неизменяемым кортежем (idf, postings, commands), так что оценка из
+    нескольких потоков всегда видит согласованное состояние.
+    """
+    
+    def __init__(self, normalizer: Optional[TextNormalizer] = None,
+                 threshold: float = 0.35, margin: float = 0.1):
+        """
+        Args:
+            normalizer: Нормализатор слов (общий с обработчиком команд)
+            threshold: Минимальная оценка лучшей команды
+            margin: Минимальный отрыв лучшей команды от второй
+        """
+        self.normalizer = normalizer or TextNormalizer()
+        self.threshold = threshold
+        self.margin = margin
+        
+        # Команды и частоты их признаков, в порядке регистрации
+        self._commands: List[object] = []
+        self._documents: List[Dict[str, int]] = []
+        self._lock = threading.Lock()
+        self._state = None
+    
+    def add(self, command):
+        """Добавление команды (индекс пересчитается при следующей оценке)"""
+        counts: Dict[str, int] = {}
+        for keyword in command.keywords:
+            for feature in self._features(keyword):
+                counts[feature] = counts.get(feature, 0) + 1
+        with self._lock:
+            self._commands.append(command)
+            self._documents.append(counts)
+            self._state = None
+    
+    def remove(self, command) -> bool:
+        """Удаление команды"""
+        with self._lock:
+            for position, indexed in enumerate(self._commands):
+                if indexed is command:
+                    del self._commands[position]
+                    del self._documents[position]
+                    self._state = None
+                    return True
+        return False
+    
+    def _features(self, text: str) -> List[str]:
+        """Нормальные формы слов и пары соседних слов"""
+        words = self.normalizer.normalize(text).split()
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    
+    def _get_state(self) -> tuple:
+        """Текущий индекс (строится при первой оценке после изменений)"""
+        state = self._state
+        if state is not None:
+            return state
+        with self._lock:
+            if self._state is None:
+                self._state = self._build()
+            return self._state
+    
+    def _build(self) -> tuple:
+        """Построение IDF и списков признаков (вызывается под _lock)"""
+        documents = self._documents
+        document_frequency: Dict[str, int] = {}
+        for counts in documents:
+            for feature in counts:
+                document_frequency[feature] = document_frequency.get(feature, 0) + 1
+        
+        # Сглаженный IDF: признаки, общие для многих команд, весят меньше
+        total = len(documents)
+        idf = {
+            feature: math.log((1 + total) / (1 + frequency)) + 1
+            for feature, frequency in document_frequency.items()
+        }
+        
+        rows: Dict[str, List[int]] = {}
+        weights: Dict[str, List[float]] = {}
+        for row, counts in enumerate(documents):
+            vector = {feature: count * idf[feature] for feature, count in counts.items()}
+            norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+            for feature, weight in vector.items():
+                rows.setdefault(feature, []).append(row)
+                weights.setdefault(feature, []).append(weight / norm)
+        
+        postings = {
+            feature: (np.array(rows[feature], dtype=np.int32),
+                      np.array(weights[feature], dtype=np.float32))
+            for feature in rows
+        }
+        return idf, postings, tuple(self._commands)
+    
+    def _score(self, text: str, state: tuple) -> tuple:
+        """
+        Оценки команд, у которых есть признаки фразы
+        
+        Returns:
+            tuple: (строки команд по возрастанию, оценки)
+        """
+        idf, postings, commands = state
+        query: Dict[str, float] = {}
+        for feature in self._features(text):
+            if feature in idf:
+                query[feature] = query.get(feature, 0.0) + idf[feature]
+        if not query:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        
+        norm = math.sqrt(sum(weight * weight for weight in query.values()))
+        scores = np.zeros(len(commands), dtype=np.float32)
+        touched = []
+        for feature, weight in query.items():
+            feature_rows, feature_weights = postings[feature]
+            # Строки внутри одного списка уникальны, поэтому сложение без np.add.at
+            scores[feature_rows] += feature_weights * (weight / norm)
+            touched.append(feature_rows)
+        rows = np.unique(np.concatenate(touched))
+        return rows, scores[rows]
+    
+    def scores(self, text: str) -> np.ndarray:
+        """
+        Косинусная близость фразы ко всем командам
+        
+        Args:
+            text: Текст команды
+        
+        Returns:
+            np.ndarray: Оценки в порядке регистрации команд
+        """
+        state = self._get_state()
+        result = np.zeros(len(state[2]), dtype=np.float32)
+        rows, values = self._score(text, state)
+        result[rows] = values
+        return result
+    
+    def rank(self, text: str, top_k: Optional[int] = None) -> List[tuple]:
+        """
+        Команды по убыванию оценки
+        
+        Args:
+            text: Текст команды
+            top_k: Сколько лучших вернуть (None — все с ненулевой оценкой)
+        
+        Returns:
+            List[tuple]: Пары (команда, оценка)
+        """
+        state = self._get_state()
+        commands = state[2]
+        rows, values = self._score(text, state)
+        # Стабильная сортировка: при равных оценках раньше идет команда, добавленная раньше
+        order = np.argsort(-values, kind='stable')
+        if top_k is not None:
+            order = order[:top_k]
+        return [(commands[rows[i]], float(values[i])) for i in order if values[i] > 0]
+    
+    def decide(self, text: str) -> dict:
+        """
+        Выбор команды с проверкой порога и неоднозначности
+        
+        Args:
+            text: Текст команды
+        
+        Returns:
+            dict: command (или None), score, margin, ambiguous, ranking
+        """
+        ranking = self.rank(text)
+        best_score = ranking[0][1] if ranking else 0.0
+        second_score = ranking[1][1] if len(ranking) > 1 else 0.0
+        margin = best_score - second_score
+        
+        confident = best_score >= self.threshold
+        ambiguous = confident and margin < self.margin
+        return {
+            'command': ranking[0][0] if confident and not ambiguous else None,
+            'score': best_score,
+            'margin': margin,
+            'ambiguous': ambiguous,
+            'ranking': ranking
+        }
+    
+    def __len__(self) -> int:
+        return len(self._commands)
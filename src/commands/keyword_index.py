@@ -0,0 +1,159 @@
+"""
+Индекс ключевых слов команд (автомат Ахо-Корасик)
+"""
+
+from collections import deque
+from typing import Dict, List, Optional
+
+
+class _Node:
+    """Узел префиксного дерева"""
+    
+    __slots__ = ('children', 'fail', 'outputs')
+    
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.fail: Optional['_Node'] = None
+        # Приоритеты команд, ключевые слова которых заканчиваются в узле
+        self.outputs: List[int] = []
+
+
+class KeywordIndex:
+    """
+    Мультишаблонный индекс ключевых слов.
+    
+    Находит команду за один проход по тексту независимо от количества
+    зарегистрированных команд и ключевых слов. При нескольких совпадениях
+    побеждает команда, добавленная раньше (как при линейном переборе).
+    """
+    
+    def __init__(self):
+        self._root = _Node()
+        self._commands: Dict[int, object] = {}
+        self._keywords: Dict[int, List[str]] = {}
+        self._next_priority = 0
+        self._dirty = False
+    
+    def add(self, command, keywords: Optional[List[str]] = None) -> int:
+        """
+        Добавление команды в индекс
+        
+        Args:
+            command: Экземпляр команды
+            keywords: Ключевые слова вместо command.keywords
+                (например, нормализованные)
+        
+        Returns:
+            int: Приоритет команды (меньше — важнее)
+        """
+        priority = self._next_priority
+        self._next_priority += 1
+        
+        if keywords is None:
+            keywords = command.keywords
+        keywords = [kw.lower() for kw in keywords if kw]
+        self._commands[priority] = command
+        self._keywords[priority] = keywords
+        
+        for keyword in keywords:
+            node = self._root
+            for char in keyword:
+                child = node.children.get(char)
+                if child is None:
+                    child = _Node()
+                    node.children[char] = child
+                    # Новый узел требует пересчета суффиксных ссылок
+                    self._dirty = True
+                node = child
+            node.outputs.append(priority)
+        
+        return priority
+    
+    def remove(self, command) -> bool:
+        """
+        Удаление команды из индекса
+        
+        Args:
+            command: Экземпляр команды
+        
+        Returns:
+            bool: True если команда была в индексе
+        """
+        for priority, indexed in self._commands.items():
+            if indexed is command:
+                break
+        else:
+            return False
+        
+        for keyword in self._keywords.pop(priority):
+            node = self._root
+            for char in keyword:
+                node = node.children[char]
+            node.outputs.remove(priority)
+        
+        del self._commands[priority]
+        return True
+    
+    def clear(self):
+        """Очистка индекса"""
+        self._root = _Node()
+        self._commands.clear()
+        self._keywords.clear()
+        self._dirty = False
+    
+    def _build_links(self):
+        """Построение суффиксных ссылок обходом в ширину"""
+        self._root.fail = self._root
+        queue = deque()
+        
+        for child in self._root.children.values():
+            child.fail = self._root
+            queue.append(child)
+        
+        while queue:
+            node = queue.popleft()
+            for char, child in node.children.items():
+                fail = node.fail
+                while fail is not self._root and char not in fail.children:
+                    fail = fail.fail
+                child.fail = fail.children.get(char, self._root)
+                if child.fail is child:
+                    child.fail = self._root
+                queue.append(child)
+        
+        self._dirty = False
+    
+    def find(self, text: str):
+        """
+        Поиск команды по тексту
+        
+        Args:
+            text: Текст команды в нижнем регистре
+        
+        Returns:
+            Команда с наивысшим приоритетом или None
+        """
+        if self._dirty:
+            self._build_links()
+        
+        root = self._root
+        node = root
+        best = None
+        
+        for char in text:
+            while node is not root and char not in node.children:
+                node = node.fail
+            node = node.children.get(char, root)
+            
+            match = node
+            while match is not root:
+                if match.outputs:
+                    candidate = min(match.outputs)
+                    if best is None or candidate < best:
+                        best = candidate
+                match = match.fail
+        
+        return self._commands[best] if best is not None else None
+    
+    def __len__(self) -> int:
+        return len(self._commands)
@@ -0,0 +1,120 @@
+"""
+Морфологическая нормализация русского текста для поиска команд
+"""
+
+import re
+from functools import lru_cache
+from typing import List
+
+try:
+    import pymorphy3 as pymorphy
+except ImportError:
+    try:
+        import pymorphy2 as pymorphy
+    except ImportError:
+        pymorphy = None
+
+
+class SuffixStemmer:
+    """
+    Упрощенный стеммер для русского языка (по мотивам Snowball).
+    
+    Используется, когда pymorphy не установлен: отрезает самое длинное
+    подходящее окончание, оставляя основу не короче MIN_STEM символов.
+    """
+    
+    MIN_STEM = 3
+    
+    # Окончания по убыванию длины внутри каждой группы
+    ENDINGS = (
+        # возвратные частицы
+        ("ся", "сь"),
+        # глагольные и причастные
+        ("ивши", "ывши", "вшись", "ите", "ете", "ешь", "ишь", "ает", "яет", "ует",
+         "ить", "ать", "ять", "еть", "уть", "ти", "ть", "ла", "ло", "ли", "ет", "ит",
+         "йте", "ьте", "ем", "им", "ут", "ют", "ат", "ят", "й"),
+        # прилагательные
+        ("ого", "его", "ому", "ему", "ыми", "ими", "ая", "яя", "ое", "ее", "ые", "ие",
+         "ый", "ий", "ой", "ую", "юю", "ых", "их", "ым"),
+        # существительные
+        ("иями", "ями", "ами", "иях", "ях", "ах", "ией", "ей", "ой", "ом", "ем", "ям",
+         "ам", "ию", "ью", "ия", "ья", "ии", "ев", "ов", "а", "я", "о", "е", "ы", "и",
+         "у", "ю", "ь")
+    )
+    
+    def __init__(self):
+        self._groups = [sorted(group, key=len, reverse=True) for group in self.ENDINGS]
+    
+    def stem(self, word: str) -> str:
+        for group in self._groups:
+            for ending in group:
+                if word.endswith(ending) and len(word) - len(ending) >= self.MIN_STEM:
+                    word = word[:-len(ending)]
+                    break
+        return word
+
+
+class TextNormalizer:
+    """
+    Приведение слов к нормальной форме.
+    
+    С pymorphy слова лемматизируются ("почту" → "почта", "создайте" →
+    "создать"), без него — обрезаются до основы. Результат для каждого
+    слова запоминается в ограниченном LRU-кэше, так что повторяющиеся
+    слова обходятся в один поиск по словарю.
+    """
+    
+    TOKEN_PATTERN = re.compile(r"[\w-]+")
+    
+    def __init__(self, cache_size: int = 4096, use_morphology: bool = True):
+        """
+        Args:
+            cache_size: Сколько слов хранить в кэше лемм
+            use_morphology: Использовать pymorphy, если он установлен
+        """
+        self.backend = "stemmer"
+        self._morph = None
+        if use_morphology and pymorphy is not None:
+            try:
+                self._morph = pymorphy.MorphAnalyzer()
+                self.backend = pymorphy.__name__
+            except Exception as e:
+                print(f"Ошибка инициализации pymorphy, используется стеммер: {e}")
+        self._stemmer = SuffixStemmer()
+        self.lemma = lru_cache(maxsize=cache_size)(self._lemmatize)
+    
+    def _lemmatize(self, token: str) -> str:
+        """Нормальная форма одного слова (без кэша)"""
+        if self._morph is not None:
+            return self._morph.parse(token)[0].normal_form.replace("ё", "е")
+        if token.isalpha():
+            return self._stemmer.stem(token)
+        return token
+    
+    def tokens(self, text: str) -> List[str]:
+        """Слова текста в нижнем регистре"""
+        return self.TOKEN_PATTERN.findall(text.lower().replace("ё", "е"))
+    
+    def normalize(self, text: str) -> str:
+        """
+        Нормализация фразы
+        
+        Args:
+            text: Исходный текст
+        
+        Returns:
+            str: Нормальные формы слов через пробел
+        """
+        lemma = self.lemma
+        return " ".join(lemma(token) for token in self.tokens(text))
+    
+    def get_statistics(self) -> dict:
+        """Попадания и промахи кэша лемм"""
+        info = self.lemma.cache_info()
+        return {
+            'backend': self.backend,
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'capacity': info.maxsize
+        }
@@ -3,7 +3,6 @@
 """
 
 import datetime
-import webbrowser
 from typing import Tuple
 import sys
 import os
@@ -11,12 +10,18 @@ import os
 # Добавляем путь к модулям
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from .base_command import BaseCommand
+from .cache_policy import CachePolicy, next_midnight
 from utils.system_utils import SystemUtils
+from utils.metrics_sampler import MetricsSampler
+from utils.launcher import ProcessLauncher
 
 
 class TimeCommand(BaseCommand):
     """Команда для получения времени"""
     
+    cache_policy = CachePolicy.none()
+    parallel_safe = True
+    
     def __init__(self):
         super().__init__(
             name="Время",
@@ -32,6 +37,10 @@ class TimeCommand(BaseCommand):
 class DateCommand(BaseCommand):
     """Команда для получения даты"""
     
+    # Дата меняется только в полночь
+    cache_policy = CachePolicy.until(next_midnight)
+    parallel_safe = True
+    
     def __init__(self):
         super().__init__(
             name="Дата",
@@ -47,6 +56,9 @@ class DateCommand(BaseCommand):
 class SystemInfoCommand(BaseCommand):
     """Команда для получения информации о системе"""
     
+    cache_policy = CachePolicy.ttl(300)
+    parallel_safe = True
+    
     def __init__(self):
         super().__init__(
             name="Система",
@@ -86,6 +98,8 @@ class CreateFolderCommand(BaseCommand):
 class OpenBrowserCommand(BaseCommand):
     """Команда для открытия браузера"""
     
+    fixed_responses = ("Браузер открыт",)
+    
     def __init__(self):
         super().__init__(
             name="Открыть браузер",
@@ -94,16 +108,18 @@ class OpenBrowserCommand(BaseCommand):
         )
     
     def execute(self, command_text: str) -> Tuple[bool, str]:
-        try:
-            webbrowser.open("https://www.google.com")
-            return True, "Браузер открыт"
-        except Exception as e:
-            return False, f"Ошибка при открытии браузера: {str(e)}"
+        launcher = ProcessLauncher.instance()
+        if not launcher.open_url("https://www.google.com"):
+            return False, ProcessLauncher.REJECTED_RESPONSE
+        return True, "Браузер открыт"
 
 
 class ProcessesCommand(BaseCommand):
     """Команда для получения списка процессов"""
     
+    fixed_responses = ("Нет активных процессов",)
+    parallel_safe = True
+    
     def __init__(self):
         super().__init__(
             name="Процессы",
@@ -113,20 +129,12 @@ class ProcessesCommand(BaseCommand):
     
     def execute(self, command_text: str) -> Tuple[bool, str]:
         try:
-            import psutil
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent']):
-                try:
-                    if proc.info['cpu_percent'] > 5.0:  # Только активные процессы
-                        processes.append(proc.info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-            
-            # Сортировка по использованию CPU
-            processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
+            # Топ-5 процессов с загрузкой выше 5% из последнего снимка
+            top_processes = MetricsSampler.instance().top_processes(
+                5, min_cpu=5.0, timeout=MetricsSampler.WARMUP_SECONDS + 1
+            )
             
-            if processes:
-                top_processes = processes[:5]  # Топ-5 процессов
+            if top_processes:
                 result = "Активные процессы:\n"
                 for proc in top_processes:
                     result += f"- {proc['name']}: {proc['cpu_percent']:.1f}% CPU\n"
@@ -2,16 +2,22 @@
 Веб-команды и команды для приложений
 """
 
-import webbrowser
 import os
-import subprocess
+import sys
 from typing import Tuple
+
+# Добавляем путь к модулям
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from .base_command import BaseCommand
+from utils.app_locator import AppLocator
+from utils.launcher import ProcessLauncher
 
 
 class CheckEmailCommand(BaseCommand):
     """Команда для проверки почты"""
     
+    fixed_responses = ("Почта Mail.ru открыта",)
+    
     def __init__(self):
         super().__init__(
             name="Проверь почту",
@@ -20,17 +26,17 @@ class CheckEmailCommand(BaseCommand):
         )
     
     def execute(self, command_text: str) -> Tuple[bool, str]:
-        try:
-            url = "https://e.mail.ru/inbox/?back=1&afterReload=1"
-            webbrowser.open(url)
-            return True, "Почта Mail.ru открыта"
-        except Exception as e:
-            return False, f"Ошибка при открытии почты: {str(e)}"
+        launcher = ProcessLauncher.instance()
+        if not launcher.open_url("https://e.mail.ru/inbox/?back=1&afterReload=1"):
+            return False, ProcessLauncher.REJECTED_RESPONSE
+        return True, "Почта Mail.ru открыта"
 
 
 class OpenTelegramCommand(BaseCommand):
     """Команда для открытия Telegram"""
     
+    fixed_responses = ("Telegram Desktop открыт", "Telegram Web открыт в браузере")
+    
     def __init__(self):
         super().__init__(
             name="Открой Телеграм",
@@ -39,31 +45,29 @@ class OpenTelegramCommand(BaseCommand):
         )
     
     def execute(self, command_text: str) -> Tuple[bool, str]:
-        try:
-            # Попытка найти Telegram в стандартных путях
-            telegram_paths = [
-                os.path.expanduser("~/AppData/Roaming/Telegram Desktop/Telegram.exe"),
-                "C:/Users/Public/Desktop/Telegram Desktop.lnk",
-                "C:/Program Files/Telegram Desktop/Telegram.exe",
-                "C:/Program Files (x86)/Telegram Desktop/Telegram.exe"
-            ]
-            
-            for path in telegram_paths:
-                if os.path.exists(path):
-                    subprocess.Popen([path])
-                    return True, "Telegram Desktop открыт"
-            
-            # Если не найден в стандартных путях, попробуем через браузер
-            webbrowser.open("https://web.telegram.org")
-            return True, "Telegram Web открыт в браузере"
-            
-        except Exception as e:
-            return False, f"Ошибка при открытии Telegram: {str(e)}"
+        locator = AppLocator.instance()
+        launcher = ProcessLauncher.instance()
+        argv = locator.resolve('telegram')
+        if argv:
+            if not launcher.launch(argv):
+                return False, ProcessLauncher.REJECTED_RESPONSE
+            return True, "Telegram Desktop открыт"
+        
+        # Если Telegram не установлен, попробуем через браузер
+        if not launcher.open_url("https://web.telegram.org"):
+            return False, ProcessLauncher.REJECTED_RESPONSE
+        return True, "Telegram Web открыт в браузере"
 
 
 class PlayMusicCommand(BaseCommand):
     """Команда для включения музыки"""
     
+    fixed_responses = tuple(
+        f"Открыто: {opera} и {spotify}"
+        for opera in ("OperaGX", "Opera", "OperaGX в браузере")
+        for spotify in ("Spotify", "Spotify в браузере")
+    )
+    
     def __init__(self):
         super().__init__(
             name="Включи музыку",
@@ -72,58 +76,45 @@ class PlayMusicCommand(BaseCommand):
         )
     
     def execute(self, command_text: str) -> Tuple[bool, str]:
-        try:
-            results = []
-            
-            # Открытие OperaGX
-            opera_paths = [
-                os.path.expanduser("~/AppData/Local/Programs/Opera GX/launcher.exe"),
-                "C:/Program Files/Opera GX/launcher.exe",
-                "C:/Program Files (x86)/Opera GX/launcher.exe"
-            ]
-            
-            opera_opened = False
-            for path in opera_paths:
-                if os.path.exists(path):
-                    subprocess.Popen([path])
-                    results.append("OperaGX")
-                    opera_opened = True
-                    break
-            
-            if not opera_opened:
-                # Если OperaGX не найден, откроем обычный браузер
-                webbrowser.open("https://www.opera.com/gx")
-                results.append("OperaGX в браузере")
-            
-            # Открытие Spotify
-            spotify_paths = [
-                os.path.expanduser("~/AppData/Roaming/Spotify/Spotify.exe"),
-                "C:/Users/Public/Desktop/Spotify.lnk",
-                "C:/Program Files/WindowsApps/SpotifyAB.SpotifyMusic_*/Spotify.exe"
-            ]
-            
-            spotify_opened = False
-            for path in spotify_paths:
-                if os.path.exists(path):
-                    subprocess.Popen([path])
-                    results.append("Spotify")
-                    spotify_opened = True
-                    break
-            
-            if not spotify_opened:
-                # Если Spotify не найден, откроем в браузере
-                webbrowser.open("https://open.spotify.com")
-                results.append("Spotify в браузере")
-            
-            return True, f"Открыто: {' и '.join(results)}"
-            
-        except Exception as e:
-            return False, f"Ошибка при открытии музыки: {str(e)}"
+        locator = AppLocator.instance()
+        launcher = ProcessLauncher.instance()
+        results = []
+        
+        # Открытие OperaGX, а без нее — обычной Opera
+        opera = locator.resolve('opera_gx')
+        browser = locator.resolve('opera')
+        if opera:
+            queued = launcher.launch(opera)
+            results.append("OperaGX")
+        elif browser:
+            queued = launcher.launch(browser)
+            results.append("Opera")
+        else:
+            # Если Opera не найдена, откроем страницу OperaGX в браузере
+            queued = launcher.open_url("https://www.opera.com/gx")
+            results.append("OperaGX в браузере")
+        
+        # Открытие Spotify
+        spotify = locator.resolve('spotify')
+        if spotify:
+            queued = launcher.launch(spotify) and queued
+            results.append("Spotify")
+        else:
+            # Если Spotify не найден, откроем в браузере
+            queued = launcher.open_url("https://open.spotify.com") and queued
+            results.append("Spotify в браузере")
+        
+        if not queued:
+            return False, ProcessLauncher.REJECTED_RESPONSE
+        return True, f"Открыто: {' и '.join(results)}"
 
 
 class EnableVPNCommand(BaseCommand):
     """Команда для включения VPN"""
     
+    NOT_INSTALLED_RESPONSE = "Psiphon VPN не найден среди установленных приложений"
+    fixed_responses = ("Psiphon VPN запущен", NOT_INSTALLED_RESPONSE)
+    
     def __init__(self):
         super().__init__(
             name="Включи VPN",
@@ -132,17 +123,14 @@ class EnableVPNCommand(BaseCommand):
         )
     
     def execute(self, command_text: str) -> Tuple[bool, str]:
-        try:
-            vpn_path = "D:/psiphon-184-20241217.exe"
-            
-            if os.path.exists(vpn_path):
-                subprocess.Popen([vpn_path])
-                return True, "Psiphon VPN запущен"
-            else:
-                return False, f"Файл VPN не найден по пути: {vpn_path}"
-                
-        except Exception as e:
-            return False, f"Ошибка при запуске VPN: {str(e)}"
+        locator = AppLocator.instance()
+        launcher = ProcessLauncher.instance()
+        argv = locator.resolve('psiphon')
+        if not argv:
+            return False, self.NOT_INSTALLED_RESPONSE
+        if not launcher.launch(argv):
+            return False, ProcessLauncher.REJECTED_RESPONSE
+        return True, "Psiphon VPN запущен"
 
 
 class WebCommands:
@@ -17,13 +17,25 @@ class ConfigManager:
                 "rate": 150,
                 "volume": 0.8,
                 "voice_id": None,
-                "language": "ru-RU"
+                "language": "ru-RU",
+                "cache_dir": None,  # None — каталог кэша пользователя (~/.cache/sendi/tts)
+                "cache_max_mb": 50
             },
             "recognition": {
                 "timeout": 1,
                 "phrase_time_limit": 5,
                 "ambient_duration": 1,
-                "language": "ru-RU"
+                "language": "ru-RU",
+                "buffer_seconds": 10,
+                "queue_size": 4,
+                "engine": "google",
+                "model_path": "models/vosk-model-small-ru",
+                "early_dispatch": False,
+                "partial_stability": 3,
+                "trace_latency": False,  # задержки по стадиям конвейера
+                "audio_source": "microphone",  # microphone или replay
+                "replay_path": "fixtures/audio",
+                "replay_speed": 1.0
             },
             "ui": {
                 "window_width": 800,
@@ -36,12 +48,29 @@ class ConfigManager:
                 "log_file": "logs/sendi.log",
                 "max_log_entries": 1000,
                 "auto_export": False,
-                "export_interval": 24  # часы
+                "export_interval": 24,  # часы
+                "compression": "gzip",  # gzip или zstd
+                "max_archives": 20
             },
             "commands": {
                 "wake_word": "sendi",
+                "require_wake_word": False,
+                "wake_word_aliases": ["сенди"],
+                "wake_window": 5,
+                "app_dirs": [],  # дополнительные директории для поиска приложений
+                "fuzzy_threshold": 0.75,  # 1.0 — только точные совпадения
+                "dispatch_mode": "first_match",  # first_match или ranked
+                "intent_threshold": 0.35,
+                "ambiguity_margin": 0.1,
                 "auto_start": False,
                 "sound_feedback": True
+            },
+            "daemon": {
+                "socket_path": None,  # None — $XDG_RUNTIME_DIR/sendi.sock или каталог кэша пользователя
+                "listen": False,  # сразу слушать микрофон
+                "speak": True,
+                "max_concurrent": 8,
+                "max_request_mb": 16
             }
         }
         self.config = self.load_config()
@@ -146,6 +175,10 @@ class ConfigManager:
         """Получение настроек команд"""
         return self.get('commands', {})
     
+    def get_daemon_settings(self):
+        """Получение настроек службы без интерфейса"""
+        return self.get('daemon', {})
+    
     def update_voice_settings(self, settings):
         """Обновление настроек голоса"""
         self.config['voice'].update(settings)
@@ -156,6 +189,19 @@ class ConfigManager:
         self.config['recognition'].update(settings)
         return self.save_config()
     
+    def get_assistant_settings(self):
+        """
+        Плоские настройки для VoiceAssistant
+        
+        Returns:
+            dict: Секции voice, commands и recognition (последняя важнее)
+        """
+        settings = {}
+        settings.update(self.get_voice_settings())
+        settings.update(self.get_command_settings())
+        settings.update(self.get_recognition_settings())
+        return settings
+    
     def get_wake_word(self):
         """Получение слова активации"""
         return self.get('commands.wake_word', 'sendi')
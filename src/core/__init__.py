@@ -4,5 +4,6 @@
 
 from .voice_assistant import VoiceAssistant
 from .tts_engine import TTSEngine
+from .status_channel import StatusChannel
 
-__all__ = ['VoiceAssistant', 'TTSEngine'] 
\ No newline at end of file
+__all__ = ['VoiceAssistant', 'TTSEngine', 'StatusChannel'] 
\ No newline at end of file
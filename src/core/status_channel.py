@@ -0,0 +1,140 @@
+"""
+Доставка статусов помощника в интерфейс с объединением всплесков
+"""
+
+import threading
+from typing import List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class StatusChannel(QObject):
+    """
+    Канал статусов между рабочими потоками и интерфейсом.
+    
+    publish() можно вызывать из любого потока. Статусы доставляются в
+    потоке интерфейса не чаще раза за кадр: из обычных статусов, пришедших
+    за кадр, показывается только последний. Важные статусы (ошибки,
+    распознанный текст) не вытесняются и доставляются все по порядку.
+    """
+    
+    # Доставленный статус (в потоке, где создан канал)
+    status_changed = pyqtSignal(str)
+    
+    # Внутренний сигнал: запуск таймера доставки из чужого потока
+    _schedule = pyqtSignal()
+    
+    # Один кадр при 60 Гц
+    FRAME_INTERVAL_MS = 16
+    
+    # Ограничение очереди важных статусов при лавине ошибок
+    MAX_STICKY = 100
+    
+    def __init__(self, sticky_prefixes: Tuple[str, ...] = ("Ошибка",),
+                 interval_ms: int = FRAME_INTERVAL_MS, parent=None):
+        """
+        Args:
+            sticky_prefixes: Начала статусов, которые нельзя пропускать
+            interval_ms: Период доставки (мс)
+        """
+        super().__init__(parent)
+        self.sticky_prefixes = tuple(sticky_prefixes)
+        
+        self._lock = threading.Lock()
+        self._sticky: List[Tuple[int, str]] = []
+        self._latest: Optional[Tuple[int, str]] = None
+        self._sequence = 0
+        self._scheduled = False
+        self._last_delivered = None
+        
+        self.published = 0
+        self.delivered = 0
+        self.suppressed = 0
+        
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._deliver)
+        self._schedule.connect(self._start_timer)
+    
+    def is_sticky(self, status: str) -> bool:
+        """Относится ли статус к важным"""
+        return status.startswith(self.sticky_prefixes)
+    
+    def publish(self, status: str):
+        """
+        Отправка статуса (из любого потока)
+        
+        Args:
+            status: Текст статуса
+        """
+        with self._lock:
+            self.published += 1
+            self._sequence += 1
+            item = (self._sequence, status)
+            
+            if self.is_sticky(status):
+                if self._sticky and self._sticky[-1][1] == status:
+                    # Повтор той же ошибки подряд
+                    self.suppressed += 1
+                elif len(self._sticky) >= self.MAX_STICKY:
+                    self.suppressed += 1
+                else:
+                    self._sticky.append(item)
+            else:
+                if self._latest is not None:
+                    self.suppressed += 1
+                self._latest = item
+            
+            if self._scheduled:
+                return
+            self._scheduled = True
+        
+        # Один межпоточный сигнал на кадр, а не на каждый статус
+        self._schedule.emit()
+    
+    def _start_timer(self):
+        if not self._timer.isActive():
+            self._timer.start()
+    
+    def _deliver(self):
+        """Доставка накопленных статусов в потоке интерфейса"""
+        with self._lock:
+            sticky, self._sticky = self._sticky, []
+            latest, self._latest = self._latest, None
+            self._scheduled = False
+        
+        last_sticky = sticky[-1][0] if sticky else 0
+        if latest is not None and latest[0] < last_sticky:
+            # Обычный статус устарел: после него пришел важный
+            with self._lock:
+                self.suppressed += 1
+            latest = None
+        
+        statuses = [status for _, status in sticky]
+        if latest is not None:
+            if latest[1] == self._last_delivered and not statuses:
+                with self._lock:
+                    self.suppressed += 1
+            else:
+                statuses.append(latest[1])
+        
+        for status in statuses:
+            self._last_delivered = status
+            self.status_changed.emit(status)
+        with self._lock:
+            self.delivered += len(statuses)
+    
+    def flush(self):
+        """Немедленная доставка (вызывать из потока интерфейса)"""
+        self._timer.stop()
+        self._deliver()
+    
+    def get_statistics(self) -> dict:
+        """Число отправленных, доставленных и пропущенных статусов"""
+        with self._lock:
+            return {
+                'published': self.published,
+                'delivered': self.delivered,
+                'suppressed': self.suppressed
+            }
@@ -2,15 +2,16 @@
 Голосовой помощник - основной класс для распознавания речи
 """
 
-import speech_recognition as sr
 from PyQt5.QtCore import QThread, pyqtSignal
 import sys
 import os
 
 # Добавляем путь к модулям
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from commands.command_processor import CommandProcessor
-from core.tts_engine import TTSEngine
+from voice.assistant_core import AssistantCore
+from voice.audio_source import create_audio_source
+from voice.recognizers import RecognitionError
+from core.status_channel import StatusChannel
 
 
 class VoiceAssistant(QThread):
@@ -18,115 +19,188 @@ class VoiceAssistant(QThread):
     command_received = pyqtSignal(str)
     status_changed = pyqtSignal(str)
     speech_recognized = pyqtSignal(str)
+    tts_started = pyqtSignal(str, float)
+    partial_recognized = pyqtSignal(str)
+    trace_summary = pyqtSignal(str)
+
+    # Собственные постоянные ответы помощника (общие с HeadlessAssistant)
+    NOT_FOUND_RESPONSE = AssistantCore.NOT_FOUND_RESPONSE
+    ERROR_RESPONSE = AssistantCore.ERROR_RESPONSE
+    FIXED_RESPONSES = AssistantCore.FIXED_RESPONSES
+    
+    # Статусы, которые интерфейс должен увидеть, даже если за ними сразу идут другие
+    STICKY_STATUSES = ("Ошибка", "Распознано", "Выполнено")
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, audio_source=None, speech_backend=None):
+        """
+        Args:
+            config: Плоские настройки помощника
+            audio_source: Источник звука вместо заданного в настройках
+                (например, FileReplaySource для прогонов на записях)
+            speech_backend: Движок распознавания вместо заданного в настройках
+        """
         super().__init__()
         self.running = True
-        self.config = config or {}
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
         
-        # Обработчик команд
-        self.command_processor = CommandProcessor()
+        # Статусы из потоков конвейера доставляются в интерфейс пакетами по кадрам
+        self.status_channel = StatusChannel(self.STICKY_STATUSES)
+        self.status_channel.status_changed.connect(self.status_changed)
         
-        # TTS движок
-        self.tts_engine = None
+        # Обработчик команд, синтез, распознавание и конвейер — общие с демоном
+        self.core = AssistantCore(
+            config,
+            speech_backend=speech_backend,
+            on_first_audio=self.tts_started.emit,
+            on_launch_failed=self._on_launch_failed
+        )
+        self.config = self.core.config
+        self.command_processor = self.core.command_processor
+        self.tts_service = self.core.tts_service
+        self.recognizer = self.core.recognizer
+        self.tracer = self.core.tracer
+        self.microphone = audio_source if audio_source is not None else create_audio_source(self.config)
         
         # Настройка параметров распознавания
         self.timeout = self.config.get('timeout', 1)
-        self.phrase_time_limit = self.config.get('phrase_time_limit', 5)
-        self.ambient_duration = self.config.get('ambient_duration', 1)
         self.language = self.config.get('language', 'ru-RU')
         
         # Настройка микрофона
-        self._setup_microphone()
+        self.core.calibrate(self.microphone)
     
-    def _setup_microphone(self):
-        """Настройка микрофона"""
-        try:
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(
-                    source, 
-                    duration=self.ambient_duration
-                )
-        except Exception as e:
-            print(f"Ошибка настройки микрофона: {e}")
+    @property
+    def pipeline(self):
+        return self.core.pipeline
+    
+    @property
+    def speech_backend(self):
+        return self.core.speech_backend
+    
+    @property
+    def wake_word_gate(self):
+        return self.core.wake_word_gate
+    
+    def _on_launch_failed(self, target: str, error: Exception):
+        """Ошибка запуска приложения или ссылки (из потока запуска)"""
+        self.status_channel.publish(f"Ошибка: не удалось открыть {target}")
     
     def speak(self, text):
         """Произнести текст"""
+        self.core.speak(text)
+    
+    def recognize_audio(self, audio):
+        """
+        Стадия распознавания: фраза -> текст
+        
+        Returns:
+            str: Распознанный текст или None
+        """
+        # Команда уже выполнена по частичной гипотезе
+        if getattr(audio, 'dispatched', False):
+            return None
+        
         try:
-            if self.tts_engine and self.tts_engine.isRunning():
-                self.tts_engine.stop()
+            text = self.core.transcribe(audio)
+        except RecognitionError:
+            self.status_channel.publish("Ошибка распознавания")
+            return None
+        if not text:
+            return None
+        
+        self.status_channel.publish(f"Распознано: {text}")
+        self.speech_recognized.emit(text)
+        self.command_received.emit(text)
+        return text
+    
+    def on_partial(self, text, repeats):
+        """
+        Частичная гипотеза потокового распознавания
+        
+        Args:
+            text: Текущая гипотеза
+            repeats: Сколько фреймов подряд гипотеза не менялась
             
-            self.tts_engine = TTSEngine(text, self.config)
-            self.tts_engine.start()
-        except Exception as e:
-            print(f"Ошибка TTS: {e}")
+        Returns:
+            bool: True если команда передана на выполнение досрочно
+        """
+        if repeats == 1:
+            self.partial_recognized.emit(text)
+        
+        if not self.core.should_dispatch_early(text, repeats):
+            return False
+        
+        self.status_channel.publish(f"Распознано: {text}")
+        self.speech_recognized.emit(text)
+        self.command_received.emit(text)
+        return self.core.dispatch_early(text)
+    
+    def execute_command(self, text):
+        """
+        Стадия выполнения: текст -> ответ для озвучивания
+        
+        Returns:
+            str: Ответ помощника
+        """
+        result = self.core.execute(text)
+        if 'error' in result:
+            self.status_channel.publish(f"Ошибка обработки команды: {result['error']}")
+        elif result['success']:
+            self.status_channel.publish(f"Выполнено: {result['response']}")
+        else:
+            self.status_channel.publish(f"Ошибка: {result['response']}")
+        return result['spoken']
     
     def process_command(self, text):
         """Обработать команду"""
-        try:
-            success, response = self.command_processor.process_command(text)
-            
-            if success:
-                self.speak(response)
-                self.status_changed.emit(f"Выполнено: {response}")
-            else:
-                self.speak("Команда не найдена")
-                self.status_changed.emit(f"Ошибка: {response}")
-                
-        except Exception as e:
-            error_msg = f"Ошибка обработки команды: {str(e)}"
-            self.speak("Произошла ошибка")
-            self.status_changed.emit(error_msg)
+        self.speak(self.execute_command(text))
     
     def run(self):
         """Основной цикл распознавания речи"""
-        self.status_changed.emit("Ожидание команды...")
+        self.status_channel.publish("Ожидание команды...")
+        
+        try:
+            self.core.start_pipeline(
+                self.microphone,
+                recognize=self.recognize_audio,
+                dispatch=self.execute_command,
+                on_partial=self.on_partial
+            )
+        except Exception as e:
+            self.status_channel.publish(f"Ошибка: {str(e)}")
+            return
         
+        self.status_channel.publish("Слушаю...")
+        
+        # Стадии работают в своих потоках, здесь только ждем остановки
         while self.running:
-            try:
-                with self.microphone as source:
-                    self.status_changed.emit("Слушаю...")
-                    audio = self.recognizer.listen(
-                        source, 
-                        timeout=self.timeout, 
-                        phrase_time_limit=self.phrase_time_limit
-                    )
-                
-                try:
-                    text = self.recognizer.recognize_google(
-                        audio, 
-                        language=self.language
-                    ).lower()
-                    
-                    self.status_changed.emit(f"Распознано: {text}")
-                    self.speech_recognized.emit(text)
-                    
-                    # Обрабатываем команду
-                    self.command_received.emit(text)
-                    self.process_command(text)
-                        
-                except sr.UnknownValueError:
-                    pass
-                except sr.RequestError:
-                    self.status_changed.emit("Ошибка распознавания")
-                    
-            except sr.WaitTimeoutError:
-                pass
-            except Exception as e:
-                self.status_changed.emit(f"Ошибка: {str(e)}")
+            self.msleep(100)
+        
+        self.core.stop_pipeline()
+        for line in self.tracer.summary_lines():
+            print(line)
+            self.trace_summary.emit(line)
     
     def stop(self):
         """Остановка потока"""
         self.running = False
-        if self.tts_engine and self.tts_engine.isRunning():
-            self.tts_engine.stop()
+        self.tts_service.flush()
+        self.tts_service.cancel()
+    
+    def shutdown(self):
+        """Остановка потока, синтеза, пула команд и подписки на ошибки запуска"""
+        self.stop()
+        self.wait()
+        self.core.shutdown()
     
     def update_config(self, new_config):
         """Обновление конфигурации"""
-        self.config.update(new_config)
+        self.core.update_config(new_config)
         self.timeout = self.config.get('timeout', 1)
-        self.phrase_time_limit = self.config.get('phrase_time_limit', 5)
-        self.ambient_duration = self.config.get('ambient_duration', 1)
-        self.language = self.config.get('language', 'ru-RU') 
\ No newline at end of file
+        self.language = self.config.get('language', 'ru-RU')
+
+    def get_pipeline_statistics(self):
+        """Глубина очередей, времена стадий и команд, потери захвата, доставка статусов и трассировка"""
+        stats = self.pipeline.get_statistics() if self.pipeline else {}
+        stats['trace'] = self.tracer.get_statistics()
+        stats['status'] = self.status_channel.get_statistics()
+        stats['commands'] = self.command_processor.get_execution_statistics()
+        return stats
\ No newline at end of file
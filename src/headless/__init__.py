@@ -0,0 +1,9 @@
+"""
+Работа без графического интерфейса
+"""
+
+from .assistant import HeadlessAssistant
+from .server import DaemonServer
+from .bulk import BulkRunner
+
+__all__ = ['HeadlessAssistant', 'DaemonServer', 'BulkRunner']
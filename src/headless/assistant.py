@@ -0,0 +1,182 @@
+"""
+Голосовой помощник без графического интерфейса
+"""
+
+import time
+from typing import Callable, Optional
+import sys
+import os
+
+import speech_recognition as sr
+
+# Добавляем путь к модулям
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voice.assistant_core import AssistantCore
+from voice.audio_source import create_audio_source
+from voice.recognizers import RecognitionError
+
+
+class HeadlessAssistant:
+    """
+    Конвейер распознавания и выполнения команд без Qt.
+    
+    Компоненты и ответы те же, что у VoiceAssistant (общее AssistantCore),
+    но события (распознанный текст, частичные гипотезы, результаты,
+    статусы) передаются обычным callback вместо сигналов Qt, а микрофон
+    подключается только по запросу. Callback вызывается из потоков
+    конвейера и должен сам передать событие в свой поток.
+    """
+    
+    NOT_FOUND_RESPONSE = AssistantCore.NOT_FOUND_RESPONSE
+    ERROR_RESPONSE = AssistantCore.ERROR_RESPONSE
+    FIXED_RESPONSES = AssistantCore.FIXED_RESPONSES
+    
+    def __init__(self, config=None, on_event: Optional[Callable[[dict], None]] = None,
+                 speak: bool = True, audio_source=None, speech_backend=None):
+        """
+        Args:
+            config: Плоские настройки помощника
+            on_event: Callback(событие) для статусов и результатов
+            speak: Озвучивать ответы
+            audio_source: Источник звука вместо заданного в настройках
+            speech_backend: Движок распознавания вместо заданного в настройках
+        """
+        self.on_event = on_event
+        self.core = AssistantCore(
+            config,
+            speak=speak,
+            speech_backend=speech_backend,
+            on_launch_failed=self._on_launch_failed
+        )
+        self.config = self.core.config
+        self.command_processor = self.core.command_processor
+        self.tts_service = self.core.tts_service
+        self.recognizer = self.core.recognizer
+        self.tracer = self.core.tracer
+        
+        # Источник звука открывается только при запуске прослушивания
+        self.audio_source = audio_source
+    
+    def emit(self, event_type: str, **fields):
+        """Передача события подписчику"""
+        if self.on_event is None:
+            return
+        fields['type'] = event_type
+        fields['time'] = time.time()
+        try:
+            self.on_event(fields)
+        except Exception as e:
+            print(f"Ошибка обработчика событий: {e}")
+    
+    def _on_launch_failed(self, target: str, error: Exception):
+        """Ошибка запуска приложения или ссылки (из потока запуска)"""
+        self.emit('status', status="Ошибка запуска", target=target, error=str(error))
+    
+    def execute_text(self, text: str) -> dict:
+        """
+        Выполнение текстовой команды
+        
+        Args:
+            text: Текст команды
+        
+        Returns:
+            dict: success, response (ответ команды), spoken (ответ для
+                озвучивания), latency_ms
+        """
+        return self.core.execute(text)
+    
+    def recognize(self, audio: sr.AudioData) -> Optional[str]:
+        """
+        Распознавание фразы
+        
+        Raises:
+            RecognitionError: Движок недоступен
+        """
+        return self.core.transcribe(audio)
+    
+    def speak(self, text: str):
+        """Озвучивание ответа (если синтез включен)"""
+        self.core.speak(text)
+    
+    @property
+    def pipeline(self):
+        return self.core.pipeline
+    
+    @property
+    def wake_word_gate(self):
+        return self.core.wake_word_gate
+    
+    def _recognize_stage(self, audio) -> Optional[str]:
+        """Стадия распознавания конвейера микрофона"""
+        # Команда уже выполнена по частичной гипотезе
+        if getattr(audio, 'dispatched', False):
+            return None
+        try:
+            text = self.recognize(audio)
+        except RecognitionError as e:
+            self.emit('status', status="Ошибка распознавания", error=str(e))
+            return None
+        if text:
+            self.emit('recognized', text=text, source='microphone')
+        return text
+    
+    def _on_partial(self, text: str, repeats: int) -> bool:
+        """Частичная гипотеза потокового распознавания"""
+        if repeats == 1:
+            self.emit('partial', text=text, source='microphone')
+        if not self.core.should_dispatch_early(text, repeats):
+            return False
+        self.emit('recognized', text=text, source='microphone', early=True)
+        return self.core.dispatch_early(text)
+    
+    def _dispatch_stage(self, text: str) -> Optional[str]:
+        """Стадия выполнения конвейера микрофона"""
+        result = self.execute_text(text)
+        self.emit('result', source='microphone', **result)
+        return result['spoken']
+    
+    def start_listening(self):
+        """Открытие источника звука и запуск конвейера"""
+        if self.pipeline is not None:
+            return
+        if self.audio_source is None:
+            self.audio_source = create_audio_source(self.config)
+        
+        self.core.calibrate(self.audio_source)
+        try:
+            self.core.start_pipeline(
+                self.audio_source,
+                recognize=self._recognize_stage,
+                dispatch=self._dispatch_stage,
+                on_partial=self._on_partial
+            )
+        except Exception as e:
+            self.emit('status', status="Ошибка", error=str(e))
+            raise
+        self.emit('status', status="Слушаю...")
+    
+    def stop_listening(self):
+        """Остановка конвейера микрофона"""
+        if self.pipeline is None:
+            return
+        self.core.stop_pipeline()
+        self.emit('status', status="Прослушивание остановлено")
+    
+    @property
+    def listening(self) -> bool:
+        return self.pipeline is not None
+    
+    def update_config(self, new_config: dict):
+        """Обновление конфигурации"""
+        self.core.update_config(new_config)
+    
+    def get_statistics(self) -> dict:
+        """Статистика конвейера, команд, синтеза и трассировки"""
+        return self.core.get_statistics()
+    
+    def shutdown(self):
+        """Остановка конвейера, синтеза и пула команд"""
+        self.stop_listening()
+        self.core.shutdown()
+        for line in self.tracer.summary_lines():
+            print(line)
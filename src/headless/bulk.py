@@ -0,0 +1,249 @@
+"""
+Пакетная обработка текстовых команд без звука
+
+Фразы читаются из файла или stdin (по одной в строке или JSONL с полем
+text и необязательным id), проходят через CommandProcessor, а результаты
+пишутся в stdout в JSONL по мере готовности, в порядке входных строк.
+
+Пример:
+    python run_bulk.py phrases.txt --jobs 8 > results.jsonl
+    python run_bulk.py - --format jsonl --match-only --top-k 3 < phrases.jsonl
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator, Tuple
+
+# Добавляем путь к модулям
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from commands.command_processor import CommandProcessor
+from config.config_manager import ConfigManager
+
+
+def read_utterances(stream, input_format: str = "auto") -> Iterator[dict]:
+    """
+    Фразы из потока
+    
+    Args:
+        stream: Текстовый поток
+        input_format: lines, jsonl или auto (JSONL, если строка начинается с "{")
+    
+    Returns:
+        Iterator[dict]: line, text, id (для JSONL) или error
+    """
+    for number, raw in enumerate(stream, 1):
+        line = raw.strip()
+        if not line:
+            continue
+        if input_format == "lines" or (input_format == "auto" and not line.startswith("{")):
+            yield {'line': number, 'text': line}
+            continue
+        try:
+            record = json.loads(line)
+            text = record.get('text') if isinstance(record, dict) else None
+            if not isinstance(text, str):
+                raise ValueError("нет поля text")
+        except ValueError as e:
+            yield {'line': number, 'error': f"Ошибка разбора строки: {e}"}
+            continue
+        item = {'line': number, 'text': text}
+        if 'id' in record:
+            item['id'] = record['id']
+        yield item
+
+
+class BulkRunner:
+    """
+    Прогон множества фраз через CommandProcessor.
+    
+    Поиск команды идет в вызывающем потоке, выполнение — в пуле. Команды
+    с parallel_safe выполняются параллельно, остальные — по одной в
+    отдельном потоке в порядке поступления. В режиме match_only команды
+    только ищутся и не выполняются.
+    """
+    
+    def __init__(self, processor: CommandProcessor, jobs: int = 4,
+                 match_only: bool = False, top_k: int = 0):
+        """
+        Args:
+            processor: Обработчик команд
+            jobs: Число параллельных выполнений
+            match_only: Только поиск команды, без выполнения
+            top_k: Сколько лучших команд по оценке добавлять к результату
+        """
+        self.processor = processor
+        self.jobs = max(1, jobs)
+        self.match_only = match_only
+        self.top_k = top_k
+        self.window = self.jobs * 4
+        
+        self.parallel = ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="BulkParallel")
+        self.serial = ThreadPoolExecutor(max_workers=1, thread_name_prefix="BulkSerial")
+        
+        self.processed = 0
+        self.matched = 0
+        self.succeeded = 0
+        self.errors = 0
+    
+    def _match(self, item: dict) -> Tuple[dict, dict, str]:
+        """Поиск команды для фразы (в вызывающем потоке)"""
+        started = time.perf_counter()
+        text = item['text'].lower().strip()
+        match = self.processor.match_details(text)
+        result = dict(item)
+        result.update({
+            'command': match['command'].name if match['command'] else None,
+            'method': match['method'],
+            'score': round(match['score'], 4),
+            'ambiguous': match['ambiguous'],
+            'candidates': [command.name for command in match['candidates']]
+        })
+        if self.top_k:
+            result['ranking'] = [
+                {'command': command.name, 'score': round(score, 4)}
+                for command, score in self.processor.rank_commands(text, self.top_k)
+            ]
+        result['match_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        return result, match, text
+    
+    def _execute(self, result: dict, match: dict, text: str, submitted_at: float) -> dict:
+        """Выполнение найденной команды"""
+        started = time.perf_counter()
+        try:
+            success, response = self.processor.execute_match(match, text)
+        except Exception as e:
+            success, response = False, f"Ошибка выполнения: {e}"
+        finished = time.perf_counter()
+        result.update({
+            'success': success,
+            'response': response,
+            'execute_ms': round((finished - started) * 1000, 3),
+            'total_ms': round(result['match_ms'] + (finished - submitted_at) * 1000, 3)
+        })
+        return result
+    
+    def _submit(self, item: dict) -> Future:
+        """Поиск команды и постановка выполнения в нужный пул"""
+        if 'error' in item:
+            return self._resolved(item)
+        
+        result, match, text = self._match(item)
+        if self.match_only or match['command'] is None:
+            if not self.match_only:
+                # Ответ "не распознана"/"неоднозначна" без выполнения
+                return self._resolved(self._execute(result, match, text, time.perf_counter()))
+            result['total_ms'] = result['match_ms']
+            return self._resolved(result)
+        
+        pool = self.parallel if match['command'].parallel_safe else self.serial
+        return pool.submit(self._execute, result, match, text, time.perf_counter())
+    
+    @staticmethod
+    def _resolved(result: dict) -> Future:
+        future = Future()
+        future.set_result(result)
+        return future
+    
+    def run(self, utterances: Iterable[dict], write) -> dict:
+        """
+        Обработка фраз с записью результатов по порядку
+        
+        Args:
+            utterances: Фразы (см. read_utterances)
+            write: Функция записи одного результата
+        
+        Returns:
+            dict: Итоги прогона
+        """
+        started = time.perf_counter()
+        pending = deque()
+        for item in utterances:
+            pending.append(self._submit(item))
+            # Окно ограничивает память: вперед уходим не дальше window фраз
+            while pending and (len(pending) >= self.window or pending[0].done()):
+                self._write(pending.popleft().result(), write)
+        while pending:
+            self._write(pending.popleft().result(), write)
+        return self.get_statistics(time.perf_counter() - started)
+    
+    def _write(self, result: dict, write):
+        self.processed += 1
+        if 'error' in result:
+            self.errors += 1
+        if result.get('command'):
+            self.matched += 1
+        if result.get('success'):
+            self.succeeded += 1
+        write(result)
+    
+    def get_statistics(self, elapsed: float) -> dict:
+        """Итоги: число фраз, найденных и выполненных команд, скорость"""
+        return {
+            'processed': self.processed,
+            'matched': self.matched,
+            'succeeded': self.succeeded,
+            'errors': self.errors,
+            'seconds': round(elapsed, 3),
+            'per_second': round(self.processed / elapsed, 1) if elapsed else None
+        }
+    
+    def shutdown(self):
+        self.parallel.shutdown(wait=True)
+        self.serial.shutdown(wait=True)
+
+
+def main(argv=None):
+    """Запуск пакетной обработки из командной строки"""
+    parser = argparse.ArgumentParser(description="Пакетная обработка текстовых команд Sendi")
+    parser.add_argument('input', nargs='?', default='-', help="Файл с фразами или - для stdin")
+    parser.add_argument('--format', choices=['auto', 'lines', 'jsonl'], default='auto',
+                        help="Формат входа")
+    parser.add_argument('--jobs', type=int, default=4, help="Число параллельных выполнений")
+    parser.add_argument('--match-only', action='store_true',
+                        help="Только найти команду, не выполняя ее")
+    parser.add_argument('--top-k', type=int, default=0, help="Добавить N лучших команд по оценке")
+    parser.add_argument('--config', default="config/sendi_config.json", help="Файл конфигурации")
+    parser.add_argument('--output', default='-', help="Файл для JSONL или - для stdout")
+    args = parser.parse_args(argv)
+    
+    source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    
+    def write(result: dict):
+        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output.flush()
+    
+    # Сообщения конфигурации и команд идут в stderr, чтобы не смешиваться с JSONL
+    with contextlib.redirect_stdout(sys.stderr):
+        settings = ConfigManager(args.config).get_command_settings()
+        processor = CommandProcessor.from_settings(settings, max_workers=max(1, args.jobs))
+        runner = BulkRunner(processor, args.jobs, args.match_only, args.top_k)
+        try:
+            stats = runner.run(read_utterances(source, args.format), write)
+        except KeyboardInterrupt:
+            stats = None
+        finally:
+            runner.shutdown()
+            processor.shutdown()
+            if source is not sys.stdin:
+                source.close()
+            if output is not sys.stdout:
+                output.close()
+    
+    if stats is not None:
+        print(
+            f"Фраз: {stats['processed']}, найдено команд: {stats['matched']}, "
+            f"выполнено: {stats['succeeded']}, ошибок: {stats['errors']}, "
+            f"{stats['per_second']} фраз/с",
+            file=sys.stderr
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Служба Sendi без графического интерфейса: команды через Unix-сокет
+
+Протокол — JSON по одной строке в каждую сторону. Запросы:
+
+    {"id": 1, "type": "text", "text": "который час", "speak": false}
+    {"id": 2, "type": "audio", "path": "/путь/фраза.wav"}
+    {"id": 3, "type": "audio", "wav": "<WAV/FLAC в base64>"}
+    {"id": 4, "type": "subscribe"}          # события микрофона и других клиентов
+    {"id": 5, "type": "unsubscribe"}
+    {"id": 6, "type": "listen", "enabled": true}
+    {"id": 7, "type": "stats"}
+    {"id": 8, "type": "ping"}
+
+На каждый запрос приходят события с тем же id: accepted, затем для аудио
+recognized и для команд result (success, response, spoken, latency_ms), либо error.
+Запросы одного клиента выполняются параллельно, ответы могут приходить не
+по порядку.
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import os
+import signal
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Set
+import sys
+
+import speech_recognition as sr
+
+# Добавляем путь к модулям
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.config_manager import ConfigManager
+from headless.assistant import HeadlessAssistant
+from utils.paths import user_runtime_dir
+
+
+class _Client:
+    """Подключенный клиент с собственной очередью исходящих событий"""
+    
+    def __init__(self, writer: asyncio.StreamWriter, max_pending: int):
+        self.writer = writer
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.subscribed = False
+        self.dropped = 0
+    
+    def send(self, event: dict):
+        """Постановка события в очередь (медленный клиент теряет события, а не тормозит остальных)"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+    
+    async def write_loop(self):
+        """Отправка событий клиенту"""
+        while True:
+            event = await self.queue.get()
+            if event is None:
+                break
+            line = json.dumps(event, ensure_ascii=False) + "\n"
+            self.writer.write(line.encode('utf-8'))
+            await self.writer.drain()
+
+
+class DaemonServer:
+    """
+    Сервер на asyncio поверх HeadlessAssistant.
+    
+    Цикл событий только читает запросы и рассылает события; распознавание
+    и выполнение команд идут в пуле потоков, поэтому долгая команда одного
+    клиента не задерживает остальных. События конвейера микрофона приходят
+    из его потоков и передаются в цикл через call_soon_threadsafe.
+    """
+    
+    def __init__(self, socket_path: str, config=None, speak: bool = True,
+                 max_concurrent: int = 8, max_request_bytes: int = 16 * 1024 * 1024,
+                 max_pending_events: int = 256):
+        """
+        Args:
+            socket_path: Путь к Unix-сокету
+            config: Плоские настройки помощника
+            speak: Озвучивать ответы
+            max_concurrent: Сколько запросов выполнять одновременно
+            max_request_bytes: Максимальная длина строки запроса
+            max_pending_events: Емкость очереди событий каждого клиента
+        """
+        self.socket_path = socket_path
+        self.config = config or {}
+        self.speak = speak
+        self.max_concurrent = max_concurrent
+        self.max_request_bytes = max_request_bytes
+        self.max_pending_events = max_pending_events
+        
+        self.assistant: Optional[HeadlessAssistant] = None
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="Daemon")
+        self.clients: Set[_Client] = set()
+        self.requests = 0
+        self.errors = 0
+        
+        self._loop = None
+        self._slots = None
+        self._stopping = None
+    
+    async def serve(self, listen: bool = False):
+        """
+        Запуск службы до сигнала остановки
+        
+        Args:
+            listen: Сразу включить прослушивание микрофона
+        """
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError("Unix-сокеты не поддерживаются в этой системе")
+        
+        self._loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._stopping = asyncio.Event()
+        
+        # Сокет проверяется до создания помощника: занятый путь не должен
+        # оставлять запущенными синтез и пул команд
+        socket_dir = os.path.dirname(self.socket_path)
+        if socket_dir:
+            os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+        self._remove_stale_socket()
+        
+        self.assistant = await self._loop.run_in_executor(
+            self.executor,
+            lambda: HeadlessAssistant(self.config, on_event=self._on_assistant_event, speak=self.speak)
+        )
+        if listen:
+            await self._loop.run_in_executor(self.executor, self.assistant.start_listening)
+        
+        # Права 0600 задаются через umask в момент bind: chmod после bind
+        # оставлял окно, в которое мог подключиться другой пользователь
+        previous_umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(
+                self._handle_client, path=self.socket_path, limit=self.max_request_bytes
+            )
+        finally:
+            os.umask(previous_umask)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass
+        print(f"Sendi слушает {self.socket_path}")
+        
+        try:
+            async with server:
+                await self._stopping.wait()
+        finally:
+            for client in list(self.clients):
+                client.send(None)
+            await self._loop.run_in_executor(self.executor, self.assistant.shutdown)
+            self.executor.shutdown(wait=False)
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+    
+    def stop(self):
+        """Остановка службы (из цикла событий)"""
+        if self._stopping is not None:
+            self._stopping.set()
+    
+    def _remove_stale_socket(self):
+        """Удаление сокета, оставшегося от упавшего процесса"""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            try:
+                os.unlink(self.socket_path)
+            except OSError as e:
+                raise RuntimeError(f"Не удалось удалить старый сокет {self.socket_path}: {e}")
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"Сокет уже используется: {self.socket_path}")
+    
+    def _on_assistant_event(self, event: dict):
+        """Событие конвейера микрофона (вызывается из его потоков)"""
+        self._loop.call_soon_threadsafe(self._broadcast, event)
+    
+    def _broadcast(self, event: dict, exclude: Optional[_Client] = None):
+        """Рассылка события подписчикам"""
+        for client in self.clients:
+            if client.subscribed and client is not exclude:
+                client.send(event)
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = _Client(writer, self.max_pending_events)
+        self.clients.add(client)
+        writer_task = asyncio.ensure_future(client.write_loop())
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    client.send({'type': 'error', 'error': "Слишком длинный запрос"})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self._handle_line(client, line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            for task in tasks:
+                task.cancel()
+            client.send(None)
+            try:
+                await asyncio.wait_for(writer_task, timeout=1.0)
+            except (asyncio.TimeoutError, ConnectionError):
+                writer_task.cancel()
+            writer.close()
+    
+    async def _handle_line(self, client: _Client, line: bytes):
+        """Разбор и выполнение одного запроса"""
+        self.requests += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Запрос должен быть объектом JSON")
+            request_id = request.get('id')
+            await self._dispatch(client, request_id, request)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.errors += 1
+            client.send({'id': request_id, 'type': 'error', 'error': str(e)})
+    
+    async def _dispatch(self, client: _Client, request_id, request: dict):
+        request_type = request.get('type')
+        
+        if request_type == 'ping':
+            client.send({'id': request_id, 'type': 'pong'})
+        elif request_type == 'subscribe':
+            client.subscribed = True
+            client.send({'id': request_id, 'type': 'subscribed', 'listening': self.assistant.listening})
+        elif request_type == 'unsubscribe':
+            client.subscribed = False
+            client.send({'id': request_id, 'type': 'unsubscribed'})
+        elif request_type == 'stats':
+            stats = await self._run(self.assistant.get_statistics)
+            stats['daemon'] = self.get_statistics()
+            client.send({'id': request_id, 'type': 'stats', 'stats': stats})
+        elif request_type == 'listen':
+            if request.get('enabled', True):
+                await self._run(self.assistant.start_listening)
+            else:
+                await self._run(self.assistant.stop_listening)
+            client.send({'id': request_id, 'type': 'listening', 'listening': self.assistant.listening})
+        elif request_type == 'text':
+            text = request.get('text')
+            if not isinstance(text, str) or not text.strip():
+                raise ValueError("Пустой текст команды")
+            client.send({'id': request_id, 'type': 'accepted'})
+            await self._execute(client, request_id, text, request.get('speak', False))
+        elif request_type == 'audio':
+            client.send({'id': request_id, 'type': 'accepted'})
+            audio = await self._run(self._load_audio, request)
+            text = await self._run(self.assistant.recognize, audio)
+            if not text:
+                client.send({'id': request_id, 'type': 'error', 'error': "Речь не распознана"})
+                return
+            event = {'id': request_id, 'type': 'recognized', 'text': text, 'source': 'socket'}
+            client.send(event)
+            self._broadcast(event, exclude=client)
+            await self._execute(client, request_id, text, request.get('speak', False))
+        else:
+            raise ValueError(f"Неизвестный тип запроса: {request_type}")
+    
+    async def _execute(self, client: _Client, request_id, text: str, speak: bool):
+        """Выполнение команды и отправка результата"""
+        result = await self._run(self.assistant.execute_text, text)
+        event = {'id': request_id, 'type': 'result', 'source': 'socket'}
+        event.update(result)
+        client.send(event)
+        self._broadcast(event, exclude=client)
+        if speak:
+            self.assistant.speak(result['spoken'])
+    
+    async def _run(self, func, *args):
+        """Блокирующий вызов в пуле с ограничением числа одновременных"""
+        async with self._slots:
+            return await self._loop.run_in_executor(self.executor, func, *args)
+    
+    def _load_audio(self, request: dict) -> sr.AudioData:
+        """Фраза из файла или из base64 (WAV/AIFF/FLAC)"""
+        if 'path' in request:
+            source = request['path']
+        elif 'wav' in request:
+            source = io.BytesIO(base64.b64decode(request['wav']))
+        else:
+            raise ValueError("Нужен path или wav")
+        with sr.AudioFile(source) as audio_file:
+            return self.assistant.recognizer.record(audio_file)
+    
+    def get_statistics(self) -> dict:
+        """Клиенты, запросы и потерянные события"""
+        return {
+            'clients': len(self.clients),
+            'subscribers': sum(1 for client in self.clients if client.subscribed),
+            'requests': self.requests,
+            'errors': self.errors,
+            'dropped_events': sum(client.dropped for client in self.clients)
+        }
+
+
+def main(argv=None):
+    """Запуск службы из командной строки"""
+    parser = argparse.ArgumentParser(description="Sendi без графического интерфейса")
+    parser.add_argument('--config', default="config/sendi_config.json", help="Файл конфигурации")
+    parser.add_argument('--socket', help="Путь к Unix-сокету (по умолчанию из конфигурации)")
+    parser.add_argument('--listen', action='store_true', help="Сразу слушать микрофон")
+    parser.add_argument('--no-speak', action='store_true', help="Не озвучивать ответы")
+    args = parser.parse_args(argv)
+    
+    config_manager = ConfigManager(args.config)
+    settings = config_manager.get_daemon_settings()
+    server = DaemonServer(
+        args.socket or settings.get('socket_path') or os.path.join(user_runtime_dir(), "sendi.sock"),
+        config_manager.get_assistant_settings(),
+        speak=settings.get('speak', True) and not args.no_speak,
+        max_concurrent=settings.get('max_concurrent', 8),
+        max_request_bytes=int(settings.get('max_request_mb', 16) * 1024 * 1024)
+    )
+    try:
+        asyncio.run(server.serve(listen=args.listen or settings.get('listen', False)))
+    except KeyboardInterrupt:
+        pass
+    except (RuntimeError, OSError) as e:
+        print(f"Ошибка запуска службы: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,5 +3,6 @@
 """
 
 from .logger import Logger
+from .log_rotation import LogRotator
 
-__all__ = ['Logger'] 
\ No newline at end of file
+__all__ = ['Logger', 'LogRotator'] 
\ No newline at end of file
@@ -0,0 +1,302 @@
+"""
+Ротация файла лога со сжатыми архивами и индексом смещений
+"""
+
+import bisect
+import datetime
+import glob
+import gzip
+import io
+import json
+import os
+import threading
+from typing import Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Длина метки времени в записи "[YYYY-MM-DD HH:MM:SS] ..."
+TIMESTAMP_LENGTH = 19
+
+
+def entry_timestamp(line: str) -> Optional[str]:
+    """
+    Метка времени записи лога
+    
+    Args:
+        line: Строка лога
+    
+    Returns:
+        Optional[str]: Метка "YYYY-MM-DD HH:MM:SS" или None для строк без метки
+    """
+    if len(line) > TIMESTAMP_LENGTH + 1 and line[0] == '[' and line[TIMESTAMP_LENGTH + 1] == ']':
+        return line[1:TIMESTAMP_LENGTH + 1]
+    return None
+
+
+def format_timestamp(value) -> str:
+    """Приведение datetime или строки к формату меток лога"""
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+
+def filter_entries(lines, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[str]:
+    """
+    Отбор строк лога по интервалу времени
+    
+    Строки без метки (продолжение многострочной записи) относятся к
+    предыдущей записи. Строки должны идти по возрастанию времени.
+    
+    Args:
+        lines: Итерируемые строки лога
+        start: Начало интервала "YYYY-MM-DD HH:MM:SS"
+        end: Конец интервала включительно
+    
+    Yields:
+        str: Строки без перевода строки
+    """
+    inside = start is None
+    for line in lines:
+        timestamp = entry_timestamp(line)
+        if timestamp is not None:
+            if end is not None and timestamp > end:
+                return
+            inside = start is None or timestamp >= start
+        if inside:
+            yield line.rstrip('\n')
+
+
+class LogRotator:
+    """
+    Ротация лога по числу записей и по времени.
+    
+    Архив состоит из независимо сжатых блоков по block_entries записей.
+    Рядом с архивом лежит индекс: метка первой записи блока и смещение
+    блока в сжатом файле. Запрос по интервалу времени переходит сразу к
+    нужному блоку и не распаковывает архив целиком.
+    """
+    
+    def __init__(self, log_file: str, max_entries: int = 1000,
+                 interval_hours: Optional[float] = None, compression: str = "gzip",
+                 max_archives: int = 20, block_entries: int = 256,
+                 archive_dir: Optional[str] = None):
+        """
+        Args:
+            log_file: Путь к активному файлу лога
+            max_entries: Число записей в файле, после которого выполняется ротация
+            interval_hours: Период ротации по времени (None — только по числу записей)
+            compression: "gzip" или "zstd"
+            max_archives: Сколько архивов хранить
+            block_entries: Записей в одном сжатом блоке
+            archive_dir: Директория архивов (по умолчанию logs/archive)
+        """
+        self.log_file = log_file
+        self.max_entries = max_entries
+        self.interval_hours = interval_hours
+        self.max_archives = max_archives
+        self.block_entries = block_entries
+        self.archive_dir = archive_dir or os.path.join(os.path.dirname(log_file) or ".", "archive")
+        
+        if compression == "zstd" and zstandard is None:
+            print("Пакет zstandard не установлен, архивы будут сжаты gzip")
+            compression = "gzip"
+        self.compression = compression
+        self.extension = ".zst" if compression == "zstd" else ".gz"
+        self.base_name = os.path.splitext(os.path.basename(log_file))[0]
+        
+        self.segment_started = datetime.datetime.now()
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        
+        os.makedirs(self.archive_dir, exist_ok=True)
+        
+        # Сегменты, не сжатые до завершения прошлого запуска
+        for pending in self._pending_segments():
+            self._compress(pending)
+    
+    def should_rotate(self, entries: int) -> bool:
+        """
+        Нужна ли ротация
+        
+        Args:
+            entries: Число записей в активном файле
+        
+        Returns:
+            bool: True если превышено число записей или период
+        """
+        if entries <= 0:
+            return False
+        if self.max_entries and entries >= self.max_entries:
+            return True
+        if self.interval_hours:
+            age = datetime.datetime.now() - self.segment_started
+            return age >= datetime.timedelta(hours=self.interval_hours)
+        return False
+    
+    def rotate(self, wait: bool = False) -> Optional[str]:
+        """
+        Перенос активного файла в архив
+        
+        Файл переименовывается сразу, сжатие идет в фоновом потоке, поэтому
+        запись в новый активный файл может продолжаться немедленно.
+        
+        Args:
+            wait: Дождаться окончания сжатия
+        
+        Returns:
+            Optional[str]: Путь к будущему архиву или None
+        """
+        with self._lock:
+            if not os.path.exists(self.log_file) or os.path.getsize(self.log_file) == 0:
+                return None
+            
+            stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            segment = os.path.join(self.archive_dir, f"{self.base_name}-{stamp}.log.rotating")
+            os.replace(self.log_file, segment)
+            self.segment_started = datetime.datetime.now()
+        
+        worker = threading.Thread(target=self._compress, args=(segment,), name="LogRotator", daemon=True)
+        self._workers = [w for w in self._workers if w.is_alive()] + [worker]
+        worker.start()
+        if wait:
+            worker.join()
+        return segment[:-len(".rotating")] + self.extension
+    
+    def wait(self):
+        """Ожидание завершения фонового сжатия"""
+        for worker in list(self._workers):
+            worker.join()
+    
+    def _compress(self, segment: str):
+        """Сжатие сегмента блоками с построением индекса"""
+        archive = segment[:-len(".rotating")] + self.extension
+        blocks = []
+        last_timestamp = None
+        
+        try:
+            with open(segment, 'r', encoding='utf-8') as source, open(archive + ".part", 'wb') as target:
+                block = []
+                for line in source:
+                    timestamp = entry_timestamp(line)
+                    if timestamp:
+                        last_timestamp = timestamp
+                    if not block:
+                        blocks.append([timestamp or last_timestamp, target.tell()])
+                    block.append(line)
+                    if len(block) >= self.block_entries:
+                        target.write(self._compress_block(block))
+                        block = []
+                if block:
+                    target.write(self._compress_block(block))
+            
+            os.replace(archive + ".part", archive)
+            self._write_index(archive, blocks, last_timestamp)
+            os.remove(segment)
+        except Exception as e:
+            print(f"Ошибка сжатия лога {segment}: {e}")
+            return
+        
+        self._prune()
+    
+    def _compress_block(self, lines: List[str]) -> bytes:
+        """Сжатие одного блока в независимый кадр"""
+        data = ''.join(lines).encode('utf-8')
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor().compress(data)
+        return gzip.compress(data)
+    
+    @staticmethod
+    def _write_index(archive: str, blocks: list, last_timestamp: Optional[str]):
+        """Запись индекса метка→смещение рядом с архивом"""
+        index = {
+            'first': blocks[0][0] if blocks else None,
+            'last': last_timestamp,
+            'blocks': blocks
+        }
+        with open(archive + ".idx", 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+    
+    def _prune(self):
+        """Удаление самых старых архивов сверх лимита"""
+        archives = self.list_archives()
+        for archive in archives[:max(0, len(archives) - self.max_archives)]:
+            for path in (archive, archive + ".idx"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    
+    def list_archives(self) -> List[str]:
+        """Архивы от старых к новым"""
+        prefix = os.path.join(glob.escape(self.archive_dir), glob.escape(self.base_name) + "-*.log")
+        archives = glob.glob(prefix + ".gz") + glob.glob(prefix + ".zst")
+        return sorted(archives, key=os.path.basename)
+    
+    def _pending_segments(self) -> List[str]:
+        """Переименованные, но еще не сжатые сегменты"""
+        prefix = os.path.join(glob.escape(self.archive_dir), glob.escape(self.base_name))
+        return sorted(glob.glob(prefix + "-*.log.rotating"))
+    
+    def query(self, start=None, end=None) -> Iterator[str]:
+        """
+        Записи за интервал времени из архивов и активного файла
+        
+        Args:
+            start: Начало интервала (datetime или строка "YYYY-MM-DD HH:MM:SS")
+            end: Конец интервала включительно
+        
+        Yields:
+            str: Строки лога без перевода строки
+        """
+        start = format_timestamp(start) if start is not None else None
+        end = format_timestamp(end) if end is not None else None
+        
+        for archive in self.list_archives():
+            yield from self._query_archive(archive, start, end)
+        
+        # Сегменты, еще не сжатые фоновым потоком, и активный файл
+        for path in self._pending_segments() + [self.log_file]:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    yield from filter_entries(f, start, end)
+    
+    def _query_archive(self, archive: str, start: Optional[str], end: Optional[str]) -> Iterator[str]:
+        """Чтение архива начиная с блока, найденного по индексу"""
+        try:
+            with open(archive + ".idx", 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = None
+        
+        offset = 0
+        if index and index.get('blocks'):
+            if end is not None and index['first'] and index['first'] > end:
+                return
+            if start is not None and index['last'] and index['last'] < start:
+                return
+            if start is not None:
+                firsts = [block[0] or "" for block in index['blocks']]
+                # Последний блок, который начинается строго раньше start: блоки
+                # режутся по числу записей, и одна метка времени может попасть в два
+                position = max(0, bisect.bisect_left(firsts, start) - 1)
+                offset = index['blocks'][position][1]
+        
+        with open(archive, 'rb') as raw:
+            raw.seek(offset)
+            yield from filter_entries(self._open_stream(archive, raw), start, end)
+    
+    @staticmethod
+    def _open_stream(archive: str, raw):
+        """Текстовый поток по сжатым кадрам начиная с текущей позиции"""
+        if archive.endswith(".zst"):
+            if zstandard is None:
+                raise RuntimeError("Для чтения архивов .zst нужен пакет zstandard")
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        else:
+            reader = gzip.GzipFile(fileobj=raw, mode='rb')
+        return io.TextIOWrapper(reader, encoding='utf-8')
+
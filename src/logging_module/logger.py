@@ -3,20 +3,79 @@
 """
 
 import os
+import atexit
 import datetime
-from typing import List, Optional
+import itertools
+import threading
+from collections import deque
+from typing import Deque, List, Optional
+
+from .log_rotation import LogRotator, filter_entries, format_timestamp
 
 
 class Logger:
     """Система логирования"""
     
-    def __init__(self, log_file: Optional[str] = None, max_entries: int = 1000):
+    def __init__(self, log_file: Optional[str] = None, max_entries: int = 1000,
+                 buffered: bool = False, flush_interval: float = 1.0,
+                 flush_size: int = 100, rotator: Optional[LogRotator] = None):
+        """
+        Args:
+            log_file: Путь к файлу лога
+            max_entries: Количество записей, хранимых в памяти
+            buffered: Писать в файл пакетами из фонового потока
+            flush_interval: Максимальная задержка записи пакета (секунды)
+            flush_size: Размер пакета, при котором запись начинается сразу
+            rotator: Ротация файла в сжатые архивы (None — один файл без ротации)
+        """
         self.log_file = log_file or "logs/sendi.log"
         self.max_entries = max_entries
-        self.log_entries: List[str] = []
+        self.log_entries: Deque[str] = deque(maxlen=max_entries)
+        
+        self.buffered = buffered
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._file = None
+        self._flusher = None
+        self._closed = False
+        self.rotator = rotator
         
         # Создание директории для логов
         self._ensure_log_directory()
+        self._file_entries = self._count_file_entries()
+        
+        if self.buffered:
+            self._start_flusher()
+
+    @classmethod
+    def from_settings(cls, settings: dict, buffered: bool = False) -> 'Logger':
+        """
+        Создание логгера по секции logging конфигурации
+        
+        Args:
+            settings: Настройки (log_file, max_log_entries, auto_export,
+                export_interval, compression, max_archives)
+            buffered: Писать в файл пакетами из фонового потока
+        
+        Returns:
+            Logger: Логгер с ротацией файла
+        """
+        log_file = settings.get('log_file', 'logs/sendi.log')
+        max_entries = settings.get('max_log_entries', 1000)
+        interval = settings.get('export_interval', 24) if settings.get('auto_export', False) else None
+        
+        rotator = LogRotator(
+            log_file,
+            max_entries=max_entries,
+            interval_hours=interval,
+            compression=settings.get('compression', 'gzip'),
+            max_archives=settings.get('max_archives', 20)
+        )
+        return cls(log_file, max_entries, buffered=buffered, rotator=rotator)
     
     def _ensure_log_directory(self):
         """Создание директории для логов"""
@@ -24,6 +83,39 @@ class Logger:
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir, exist_ok=True)
     
+    def _count_file_entries(self) -> int:
+        """Число записей в файле лога на момент запуска"""
+        if self.rotator is None or not os.path.exists(self.log_file):
+            return 0
+        try:
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                return sum(1 for _ in f)
+        except Exception:
+            return 0
+    
+    def _rotate_if_needed(self, written: int):
+        """
+        Учет записанных строк и ротация файла (вызывается под _write_lock)
+        
+        Args:
+            written: Сколько записей только что добавлено в файл
+        """
+        if self.rotator is None:
+            return
+        self._file_entries += written
+        if not self.rotator.should_rotate(self._file_entries):
+            return
+        
+        if self._file is not None:
+            self._file.close()
+        try:
+            self.rotator.rotate()
+        except Exception as e:
+            print(f"Ошибка ротации лога: {e}")
+        self._file_entries = 0
+        if self._file is not None:
+            self._file = open(self.log_file, 'a', encoding='utf-8')
+    
     def log(self, level: str, source: str, message: str) -> str:
         """
         Добавление записи в лог
@@ -39,26 +131,105 @@ class Logger:
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         entry = f"[{timestamp}] [{level}] {source}: {message}"
         
-        # Добавление в память
-        self.log_entries.append(entry)
+        queued = False
+        with self._lock:
+            # Добавление в память (старые записи вытесняются деком); под
+            # блокировкой, чтобы экспорт и статистика видели целый снимок
+            self.log_entries.append(entry)
+            
+            # Запись в файл. Проверка под блокировкой: после close() запись
+            # не должна остаться в буфере
+            if self.buffered and not self._closed:
+                self._pending.append(entry)
+                queued = True
+                if len(self._pending) >= self.flush_size:
+                    self._wakeup.notify()
+        if not queued:
+            self._write_to_file(entry)
         
-        # Ограничение количества записей в памяти
-        if len(self.log_entries) > self.max_entries:
-            self.log_entries = self.log_entries[-self.max_entries:]
+        return entry
+    
+    def _start_flusher(self):
+        """Открытие файла и запуск фонового потока записи"""
+        try:
+            self._file = open(self.log_file, 'a', encoding='utf-8')
+        except Exception as e:
+            print(f"Ошибка открытия лога, буферизация отключена: {e}")
+            self.buffered = False
+            return
         
-        # Запись в файл
-        self._write_to_file(entry)
+        self._flusher = threading.Thread(target=self._flush_loop, name="LoggerFlusher", daemon=True)
+        self._flusher.start()
+        # Записи из буфера не должны теряться при завершении процесса
+        atexit.register(self.close)
+    
+    def _flush_loop(self):
+        """Запись пакетов по размеру или по времени"""
+        while True:
+            with self._lock:
+                if not self._closed and len(self._pending) < self.flush_size:
+                    self._wakeup.wait(self.flush_interval)
+                if self._closed:
+                    return
+            self.flush()
+    
+    def flush(self):
+        """Немедленная запись накопленных записей в файл"""
+        if not self.buffered:
+            return
         
-        return entry
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                if self._file is None:
+                    # Файл уже закрыт: пакет дописывается без потока записи
+                    self._append_entries(batch)
+                else:
+                    self._file.write('\n'.join(batch) + '\n')
+                    self._file.flush()
+                    self._rotate_if_needed(len(batch))
+            except Exception as e:
+                print(f"Ошибка записи в лог: {e}")
     
+    def close(self):
+        """Остановка фоновой записи с сохранением всех записей"""
+        if not self.buffered or self._closed:
+            return
+        
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        if self._flusher and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        
+        self.flush()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        
+        try:
+            atexit.unregister(self.close)
+        except Exception:
+            pass
+
     def _write_to_file(self, entry: str):
         """Запись в файл"""
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(entry + '\n')
+            with self._write_lock:
+                self._append_entries([entry])
         except Exception as e:
             print(f"Ошибка записи в лог: {e}")
     
+    def _append_entries(self, entries: List[str]):
+        """Дозапись записей с открытием файла (вызывается под _write_lock)"""
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(entries) + '\n')
+        self._rotate_if_needed(len(entries))
+    
     def get_recent_logs(self, count: int = 50) -> List[str]:
         """
         Получение последних записей
@@ -69,23 +240,72 @@ class Logger:
         Returns:
             List[str]: Список записей
         """
-        return self.log_entries[-count:] if self.log_entries else []
-    
+        if count <= 0:
+            return []
+        with self._lock:
+            start = max(0, len(self.log_entries) - count)
+            return list(itertools.islice(self.log_entries, start, None))
+
     def clear_logs(self):
         """Очистка логов"""
-        self.log_entries.clear()
+        with self._lock:
+            self.log_entries.clear()
+        self._file_entries = 0
+        
+        if self.buffered and self._file is not None:
+            with self._write_lock:
+                with self._lock:
+                    self._pending = []
+                try:
+                    self._file.seek(0)
+                    self._file.truncate()
+                except Exception as e:
+                    print(f"Ошибка очистки лога: {e}")
+            return
+        
         try:
             with open(self.log_file, 'w', encoding='utf-8') as f:
                 f.write("")
         except Exception as e:
             print(f"Ошибка очистки лога: {e}")
-    
-    def export_logs(self, filename: Optional[str] = None) -> tuple[bool, str]:
+
+    def query_logs(self, start=None, end=None) -> List[str]:
+        """
+        Записи за интервал времени, включая архивы
+        
+        Args:
+            start: Начало интервала (datetime или "YYYY-MM-DD HH:MM:SS")
+            end: Конец интервала включительно
+            
+        Returns:
+            List[str]: Записи по возрастанию времени
+        """
+        self.flush()
+        if self.rotator is not None:
+            return list(self.rotator.query(start, end))
+        
+        start = format_timestamp(start) if start is not None else None
+        end = format_timestamp(end) if end is not None else None
+        try:
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                return list(filter_entries(f, start, end))
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Ошибка чтения лога: {e}")
+            return []
+
+    def export_logs(self, filename: Optional[str] = None, start=None, end=None) -> tuple[bool, str]:
         """
         Экспорт логов в файл
         
+        Без интервала выгружаются записи из памяти, с интервалом — записи
+        из файла и архивов.
+        
         Args:
             filename: Имя файла для экспорта
+            start: Начало интервала
+            end: Конец интервала
             
         Returns:
             tuple[bool, str]: (успех, сообщение)
@@ -100,8 +320,15 @@ class Logger:
             if export_dir and not os.path.exists(export_dir):
                 os.makedirs(export_dir, exist_ok=True)
             
+            if start is None and end is None:
+                # Снимок под блокировкой: дек нельзя обходить, пока в него пишут
+                with self._lock:
+                    entries = list(self.log_entries)
+            else:
+                entries = self.query_logs(start, end)
+            
             with open(filename, 'w', encoding='utf-8') as f:
-                for entry in self.log_entries:
+                for entry in entries:
                     f.write(entry + '\n')
             return True, f"Логи экспортированы в {filename}"
         except Exception as e:
@@ -114,7 +341,11 @@ class Logger:
         Returns:
             dict: Статистика логов
         """
-        if not self.log_entries:
+        with self._lock:
+            total = len(self.log_entries)
+            oldest = self.log_entries[0] if total else None
+            newest = self.log_entries[-1] if total else None
+        if not total:
             return {
                 'total_entries': 0,
                 'file_size': 0,
@@ -122,14 +353,15 @@ class Logger:
                 'newest_entry': None
             }
         
+        self.flush()
         try:
             file_size = os.path.getsize(self.log_file) if os.path.exists(self.log_file) else 0
         except:
             file_size = 0
         
         return {
-            'total_entries': len(self.log_entries),
+            'total_entries': total,
             'file_size': file_size,
-            'oldest_entry': self.log_entries[0] if self.log_entries else None,
-            'newest_entry': self.log_entries[-1] if self.log_entries else None
+            'oldest_entry': oldest,
+            'newest_entry': newest
         } 
\ No newline at end of file
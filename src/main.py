@@ -6,13 +6,15 @@ import sys
 import os
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QTextEdit, QLabel, QTabWidget, QScrollArea,
+    QPushButton, QLabel, QTabWidget, QScrollArea,
     QFrame, QGridLayout, QSpacerItem, QSizePolicy
 )
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QIcon, QPixmap, QPalette, QColor, QLinearGradient
 
 from core.voice_assistant import VoiceAssistant
+from config.config_manager import ConfigManager
+from ui.log_view import LogView
 
 
 class ModernMainWindow(QMainWindow):
@@ -20,7 +22,8 @@ class ModernMainWindow(QMainWindow):
     
     def __init__(self):
         super().__init__()
-        self.voice_assistant = VoiceAssistant()
+        self.config_manager = ConfigManager()
+        self.voice_assistant = VoiceAssistant(self.config_manager.get_assistant_settings())
         self.setup_ui()
         self.setup_connections()
         
@@ -247,12 +250,9 @@ class ModernMainWindow(QMainWindow):
         logs_layout.addWidget(logs_title)
         
         # Область логов
-        self.logs_text = QTextEdit()
-        self.logs_text.setObjectName("logsText")
-        self.logs_text.setReadOnly(True)
-        self.logs_text.setPlaceholderText("Здесь будут отображаться все события и команды...")
+        self.logs_view = LogView()
         
-        logs_layout.addWidget(self.logs_text)
+        logs_layout.addWidget(self.logs_view)
         
         # Кнопки управления логами
         logs_buttons_layout = QHBoxLayout()
@@ -291,8 +291,9 @@ class ModernMainWindow(QMainWindow):
         self.save_logs_button.clicked.connect(self.save_logs)
         
         # Подключение сигналов голосового помощника
-        self.voice_assistant.speech_recognized.connect(self.add_log)
+        self.voice_assistant.speech_recognized.connect(self.on_speech_recognized)
         self.voice_assistant.status_changed.connect(self.update_status)
+        self.voice_assistant.trace_summary.connect(self.on_trace_summary)
         
     def start_listening(self):
         """Начать прослушивание"""
@@ -318,21 +319,27 @@ class ModernMainWindow(QMainWindow):
         self.voice_assistant.speak("Привет! Я Sendi, ваш голосовой помощник.")
         self.add_log("🔊 Тест голоса выполнен")
         
-    def add_log(self, message):
+    def add_log(self, message, level="INFO", source="Интерфейс"):
         """Добавить сообщение в логи"""
-        self.logs_text.append(f"[{self.get_current_time()}] {message}")
-        # Автопрокрутка к последнему сообщению
-        self.logs_text.verticalScrollBar().setValue(
-            self.logs_text.verticalScrollBar().maximum()
-        )
+        self.logs_view.append(message, level, source)
+        
+    def on_speech_recognized(self, text):
+        """Распознанная фраза в логах"""
+        self.add_log(text, source="Распознавание")
+        
+    def on_trace_summary(self, line):
+        """Сводка задержек по стадиям в логах"""
+        self.add_log(line, source="Трассировка")
         
     def update_status(self, status):
         """Обновить статус"""
         self.connection_status.setText(status)
+        if status.startswith("Ошибка"):
+            self.add_log(status, "ERROR", "Помощник")
         
     def clear_logs(self):
         """Очистить логи"""
-        self.logs_text.clear()
+        self.logs_view.clear()
         
     def save_logs(self):
         """Сохранить логи в файл"""
@@ -342,9 +349,14 @@ class ModernMainWindow(QMainWindow):
         )
         if filename:
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write(self.logs_text.toPlainText())
+                f.write(self.logs_view.to_plain_text())
             self.add_log(f"Логи сохранены в файл: {filename}")
             
+    def closeEvent(self, event):
+        """Остановка помощника при закрытии окна"""
+        self.voice_assistant.shutdown()
+        super().closeEvent(event)
+        
     def get_current_time(self):
         """Получить текущее время"""
         from datetime import datetime
@@ -0,0 +1,227 @@
+"""
+Журнал событий на модели/представлении с ограниченным числом строк
+"""
+
+import datetime
+from collections import deque
+from typing import List, Optional
+
+from PyQt5.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QTimer, pyqtSignal
+)
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QListView, QComboBox, QLabel
+
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+LEVEL_COLORS = {
+    "DEBUG": QColor("#a0aec0"),
+    "WARNING": QColor("#f6e05e"),
+    "ERROR": QColor("#fc8181")
+}
+
+LevelRole = Qt.UserRole + 1
+SourceRole = Qt.UserRole + 2
+
+
+class LogModel(QAbstractListModel):
+    """
+    Модель строк журнала.
+    
+    Хранит не больше max_rows строк: при переполнении самые старые строки
+    удаляются одним сигналом на пакет, а не по одной.
+    """
+    
+    source_added = pyqtSignal(str)
+    
+    def __init__(self, max_rows: int = 5000, parent=None):
+        super().__init__(parent)
+        self.max_rows = max_rows
+        # Строка: (время, уровень, источник, текст)
+        self._rows = deque()
+        self.sources = set()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        
+        time_text, level, source, message = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return f"[{time_text}] {message}"
+        if role == Qt.ForegroundRole:
+            return LEVEL_COLORS.get(level)
+        if role == Qt.ToolTipRole:
+            return f"{level} · {source}"
+        if role == LevelRole:
+            return level
+        if role == SourceRole:
+            return source
+        return None
+    
+    def append_rows(self, rows: List[tuple]):
+        """
+        Добавление пакета строк
+        
+        Args:
+            rows: Кортежи (время, уровень, источник, текст)
+        """
+        if not rows:
+            return
+        rows = rows[-self.max_rows:]
+        
+        overflow = len(self._rows) + len(rows) - self.max_rows
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._rows.popleft()
+            self.endRemoveRows()
+        
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+        
+        for row in rows:
+            if row[2] not in self.sources:
+                self.sources.add(row[2])
+                self.source_added.emit(row[2])
+    
+    def clear(self):
+        """Удаление всех строк"""
+        self.beginResetModel()
+        self._rows.clear()
+        self.endResetModel()
+    
+    def to_plain_text(self) -> str:
+        """Все строки журнала одним текстом"""
+        return "\n".join(f"[{row[0]}] {row[3]}" for row in self._rows)
+
+
+class LogFilterProxy(QSortFilterProxyModel):
+    """Фильтр строк по минимальному уровню и источнику"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.min_level = 0
+        self.source = None
+    
+    def set_min_level(self, level: str):
+        self.min_level = LEVELS.index(level) if level in LEVELS else 0
+        self.invalidateFilter()
+    
+    def set_source(self, source: Optional[str]):
+        self.source = source or None
+        self.invalidateFilter()
+    
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if self.min_level == 0 and self.source is None:
+            return True
+        
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        level = index.data(LevelRole)
+        if level in LEVELS and LEVELS.index(level) < self.min_level:
+            return False
+        return self.source is None or index.data(SourceRole) == self.source
+
+
+class LogView(QWidget):
+    """
+    Панель журнала: фильтры и список строк.
+    
+    Сообщения копятся в буфере и вставляются в модель пакетом по таймеру,
+    так что частые сообщения не вызывают перерисовку на каждое из них.
+    """
+    
+    ALL_SOURCES = "Все источники"
+    
+    def __init__(self, max_rows: int = 5000, batch_interval: int = 100, parent=None):
+        """
+        Args:
+            max_rows: Сколько строк хранить
+            batch_interval: Период вставки накопленных строк (мс)
+        """
+        super().__init__(parent)
+        self.model = LogModel(max_rows, self)
+        self.proxy = LogFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self._pending = []
+        
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(batch_interval)
+        self._timer.timeout.connect(self.flush)
+        
+        self._setup_ui()
+        self.model.source_added.connect(self.source_combo.addItem)
+    
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        filters_layout = QHBoxLayout()
+        filters_layout.addWidget(QLabel("Уровень:"))
+        self.level_combo = QComboBox()
+        self.level_combo.addItems(LEVELS)
+        self.level_combo.currentTextChanged.connect(self.proxy.set_min_level)
+        filters_layout.addWidget(self.level_combo)
+        
+        self.source_combo = QComboBox()
+        self.source_combo.addItem(self.ALL_SOURCES)
+        self.source_combo.currentTextChanged.connect(self._on_source_changed)
+        filters_layout.addWidget(self.source_combo)
+        filters_layout.addStretch()
+        layout.addLayout(filters_layout)
+        
+        self.list_view = QListView()
+        self.list_view.setObjectName("logsText")
+        self.list_view.setModel(self.proxy)
+        # Одинаковая высота строк: представлению не нужно измерять каждую
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.list_view.setSelectionMode(QListView.ExtendedSelection)
+        self.list_view.setWordWrap(False)
+        layout.addWidget(self.list_view)
+    
+    def _on_source_changed(self, source: str):
+        self.proxy.set_source(None if source == self.ALL_SOURCES else source)
+    
+    def append(self, message: str, level: str = "INFO", source: str = "Sendi"):
+        """
+        Добавление сообщения (вставка произойдет с ближайшим пакетом)
+        
+        Args:
+            message: Текст сообщения
+            level: Уровень (DEBUG, INFO, WARNING, ERROR)
+            source: Источник сообщения
+        """
+        time_text = datetime.datetime.now().strftime("%H:%M:%S")
+        self._pending.append((time_text, level, source, message))
+        if not self._timer.isActive():
+            self._timer.start()
+    
+    def flush(self):
+        """Вставка накопленных сообщений"""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        
+        scroll_bar = self.list_view.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+        self.model.append_rows(batch)
+        # Прокрутка только если пользователь не листает историю
+        if at_bottom:
+            self.list_view.scrollToBottom()
+    
+    def clear(self):
+        """Очистка журнала"""
+        self._pending = []
+        self.model.clear()
+    
+    def to_plain_text(self) -> str:
+        """Текст журнала для сохранения (без учета фильтров)"""
+        self.flush()
+        return self.model.to_plain_text()
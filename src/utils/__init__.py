@@ -4,6 +4,14 @@
 
 from .system_utils import SystemUtils
 from .voice_utils import VoiceUtils
+from .latency_stats import LatencyStats
+from .metrics_sampler import MetricsSampler
+from .app_locator import AppLocator
+from .launcher import ProcessLauncher
+from .tracing import PipelineTracer
+from .paths import user_cache_dir, user_runtime_dir
 # from .command_processor import CommandProcessor
 
-__all__ = ['SystemUtils', 'VoiceUtils', 'CommandProcessor'] 
\ No newline at end of file
+__all__ = ['SystemUtils', 'VoiceUtils', 'LatencyStats', 'MetricsSampler', 'AppLocator',
+           'ProcessLauncher', 'PipelineTracer', 'user_cache_dir', 'user_runtime_dir',
+           'CommandProcessor'] 
\ No newline at end of file
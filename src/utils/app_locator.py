@@ -0,0 +1,353 @@
+"""
+Индекс установленных приложений для команд запуска
+"""
+
+import glob
+import json
+import os
+import platform
+import shlex
+import threading
+from typing import Dict, List, Optional
+
+from .paths import user_cache_path
+
+
+class AppLocator:
+    """
+    Поиск приложений по индексу.
+    
+    Индекс строится из PATH, XDG .desktop-файлов, настроенных директорий и
+    известных путей установки, сохраняется на диск и перестраивается в
+    фоне, когда меняется одна из просканированных директорий. Команды
+    получают команду запуска одним поиском в словаре.
+    """
+    
+    # Файл индекса; None — app_index.json в кэше пользователя. Путь
+    # вычисляется при создании, а не при импорте: SENDI_CACHE_DIR и
+    # XDG_CACHE_HOME могут задать уже после загрузки модуля
+    INDEX_FILE: Optional[str] = None
+    
+    # Версия формата: индекс другой версии строится заново (например, после
+    # изменения KNOWN_APPS)
+    INDEX_VERSION = 2
+    
+    # Известные приложения: имена исполняемых/desktop-файлов и пути установки
+    KNOWN_APPS = {
+        'telegram': {
+            'names': ["telegram-desktop", "telegram", "org.telegram.desktop"],
+            'paths': [
+                "~/AppData/Roaming/Telegram Desktop/Telegram.exe",
+                "C:/Program Files/Telegram Desktop/Telegram.exe",
+                "C:/Program Files (x86)/Telegram Desktop/Telegram.exe",
+                "/opt/telegram/Telegram",
+                "~/.local/share/TelegramDesktop/Telegram"
+            ]
+        },
+        'opera_gx': {
+            'names': ["opera-gx"],
+            'paths': [
+                "~/AppData/Local/Programs/Opera GX/launcher.exe",
+                "C:/Program Files/Opera GX/launcher.exe",
+                "C:/Program Files (x86)/Opera GX/launcher.exe"
+            ]
+        },
+        'opera': {
+            'names': ["opera", "opera-stable", "com.opera.opera"],
+            'paths': [
+                "~/AppData/Local/Programs/Opera/launcher.exe",
+                "C:/Program Files/Opera/launcher.exe",
+                "C:/Program Files (x86)/Opera/launcher.exe",
+                "/snap/bin/opera"
+            ]
+        },
+        'spotify': {
+            'names': ["spotify", "com.spotify.client"],
+            'paths': [
+                "~/AppData/Roaming/Spotify/Spotify.exe",
+                "C:/Program Files/WindowsApps/SpotifyAB.SpotifyMusic_*/Spotify.exe",
+                "/snap/bin/spotify"
+            ]
+        },
+        'psiphon': {
+            'names': ["psiphon", "psiphon3", "psiphon-tunnel-core"],
+            'paths': [
+                "D:/psiphon*.exe",
+                "~/Downloads/psiphon*.exe",
+                "C:/Program Files/Psiphon/psiphon*.exe"
+            ]
+        }
+    }
+    
+    # Коды полей в строке Exec, которые подставляет окружение рабочего стола
+    DESKTOP_FIELD_CODES = {"%f", "%F", "%u", "%U", "%d", "%D", "%n", "%N", "%i", "%c", "%k", "%v", "%m"}
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    def __init__(self, index_file: Optional[str] = None, extra_dirs: Optional[List[str]] = None,
+                 refresh_interval: float = 30.0):
+        """
+        Args:
+            index_file: Файл сохраненного индекса (по умолчанию INDEX_FILE или кэш пользователя)
+            extra_dirs: Дополнительные директории с приложениями
+            refresh_interval: Период проверки директорий на изменения (секунды)
+        """
+        self.index_file = index_file or self.INDEX_FILE or user_cache_path("app_index.json")
+        self.extra_dirs = list(extra_dirs or [])
+        self.refresh_interval = refresh_interval
+        
+        self.apps: Dict[str, List[str]] = {}
+        self.executables: Dict[str, str] = {}
+        self.sources: Dict[str, float] = {}
+        self.rebuilds = 0
+        
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    @classmethod
+    def instance(cls) -> 'AppLocator':
+        """Общий индекс: загружается или строится при первом обращении"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                locator = cls()
+                # Сохраненный индекс доступен сразу, проверка изменений идет в фоне
+                if not locator.load():
+                    locator.rebuild()
+                locator.start()
+                cls._instance = locator
+            return cls._instance
+    
+    def resolve(self, app_id: str) -> Optional[List[str]]:
+        """
+        Команда запуска приложения
+        
+        Args:
+            app_id: Идентификатор из KNOWN_APPS или имя исполняемого файла
+        
+        Returns:
+            Optional[List[str]]: Аргументы для subprocess или None
+        """
+        argv = self.apps.get(app_id)
+        if argv is not None:
+            return list(argv)
+        path = self.executables.get(app_id.lower())
+        return [path] if path else None
+    
+    def set_extra_dirs(self, dirs: List[str]):
+        """Смена настроенных директорий (с перестройкой индекса)"""
+        dirs = list(dirs or [])
+        if dirs != self.extra_dirs:
+            self.extra_dirs = dirs
+            self.rebuild()
+    
+    # Сканирование
+    
+    def _scan_dirs(self) -> List[str]:
+        """Директории, от которых зависит индекс"""
+        dirs = [d for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+        dirs += self._desktop_dirs()
+        dirs += [os.path.expanduser(d) for d in self.extra_dirs]
+        # Родительские директории известных путей (новая установка меняет их mtime)
+        for app in self.KNOWN_APPS.values():
+            for pattern in app['paths']:
+                parent = os.path.dirname(os.path.expanduser(pattern))
+                if '*' not in parent:
+                    dirs.append(parent)
+        return list(dict.fromkeys(os.path.normpath(d) for d in dirs))
+    
+    @staticmethod
+    def _desktop_dirs() -> List[str]:
+        """Директории XDG с .desktop-файлами"""
+        data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+        roots = [data_home] + data_dirs.split(":") + ["/var/lib/flatpak/exports/share"]
+        return [os.path.join(root, "applications") for root in roots if root]
+    
+    @staticmethod
+    def _mtime(path: str) -> Optional[float]:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+    
+    def _scan_executables(self, dirs: List[str]) -> Dict[str, str]:
+        """Исполняемые файлы из PATH и настроенных директорий"""
+        if platform.system() == "Windows":
+            extensions = {ext.lower() for ext in os.environ.get("PATHEXT", ".EXE;.BAT;.CMD").split(";")}
+        else:
+            extensions = None
+        
+        executables = {}
+        for directory in dirs:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                name, ext = os.path.splitext(entry.name)
+                if extensions is not None:
+                    if ext.lower() not in extensions:
+                        continue
+                    key = name.lower()
+                else:
+                    key = entry.name.lower()
+                    try:
+                        if not entry.is_file() or not os.access(entry.path, os.X_OK):
+                            continue
+                    except OSError:
+                        continue
+                # Первое вхождение в PATH имеет приоритет, как у оболочки
+                executables.setdefault(key, entry.path)
+        return executables
+    
+    def _scan_desktop_entries(self, dirs: List[str]) -> Dict[str, List[str]]:
+        """Команды запуска из .desktop-файлов (ключ — id файла без расширения)"""
+        entries = {}
+        for directory in dirs:
+            for path in glob.glob(os.path.join(glob.escape(directory), "*.desktop")):
+                desktop_id = os.path.basename(path)[:-len(".desktop")].lower()
+                if desktop_id in entries:
+                    continue
+                argv = self._parse_desktop_file(path)
+                if argv:
+                    entries[desktop_id] = argv
+        return entries
+    
+    def _parse_desktop_file(self, path: str) -> Optional[List[str]]:
+        """Строка Exec секции [Desktop Entry]"""
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                in_entry = False
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('['):
+                        in_entry = line == "[Desktop Entry]"
+                    elif in_entry and line.startswith("Exec="):
+                        args = shlex.split(line[len("Exec="):])
+                        return [arg for arg in args if arg not in self.DESKTOP_FIELD_CODES] or None
+        except (OSError, ValueError):
+            pass
+        return None
+    
+    def rebuild(self):
+        """Полное сканирование и сохранение индекса"""
+        dirs = self._scan_dirs()
+        sources = {d: self._mtime(d) for d in dirs}
+        path_dirs = [d for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+        extra_dirs = [os.path.expanduser(d) for d in self.extra_dirs]
+        
+        executables = self._scan_executables(path_dirs + extra_dirs)
+        desktop = self._scan_desktop_entries(self._desktop_dirs())
+        
+        apps = {}
+        for app_id, app in self.KNOWN_APPS.items():
+            argv = None
+            for name in app['names']:
+                if name in desktop:
+                    argv = desktop[name]
+                elif name in executables:
+                    argv = [executables[name]]
+                if argv:
+                    break
+            if argv is None:
+                for pattern in app['paths']:
+                    matches = sorted(glob.glob(os.path.expanduser(pattern)))
+                    if matches:
+                        # Самая новая версия при нескольких совпадениях
+                        argv = [matches[-1]]
+                        break
+            if argv:
+                apps[app_id] = argv
+        
+        with self._lock:
+            self.apps = apps
+            self.executables = executables
+            self.sources = sources
+            self.rebuilds += 1
+        self.save()
+    
+    def load(self) -> bool:
+        """
+        Загрузка сохраненного индекса
+        
+        Returns:
+            bool: True если индекс прочитан
+        """
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.INDEX_VERSION:
+                return False
+            apps, executables, sources = data['apps'], data['executables'], data['sources']
+        except (OSError, ValueError, KeyError, AttributeError):
+            return False
+        
+        with self._lock:
+            self.apps = apps
+            self.executables = executables
+            self.sources = sources
+        return True
+    
+    def save(self):
+        """Сохранение индекса на диск"""
+        try:
+            index_dir = os.path.dirname(self.index_file)
+            if index_dir:
+                os.makedirs(index_dir, exist_ok=True)
+            with self._lock:
+                data = {
+                    'version': self.INDEX_VERSION,
+                    'apps': self.apps,
+                    'executables': self.executables,
+                    'sources': self.sources
+                }
+            with open(self.index_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"Ошибка сохранения индекса приложений: {e}")
+    
+    def _changed(self) -> bool:
+        """Изменилась ли хотя бы одна директория с момента сканирования"""
+        dirs = self._scan_dirs()
+        if set(dirs) != set(self.sources):
+            return True
+        return any(self._mtime(d) != self.sources[d] for d in dirs)
+    
+    # Фоновое обновление
+    
+    def start(self):
+        """Запуск фоновой проверки изменений"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="AppLocator", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Остановка фоновой проверки"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(1.0)
+            self._thread = None
+    
+    def _watch(self):
+        # Первая проверка сразу: индекс мог устареть, пока приложение не работало
+        while True:
+            try:
+                if self._changed():
+                    self.rebuild()
+            except Exception as e:
+                print(f"Ошибка обновления индекса приложений: {e}")
+            if self._stop.wait(self.refresh_interval):
+                return
+    
+    def get_statistics(self) -> dict:
+        """Размер индекса и число перестроек"""
+        return {
+            'apps': sorted(self.apps),
+            'executables': len(self.executables),
+            'watched_dirs': len(self.sources),
+            'rebuilds': self.rebuilds
+        }
@@ -0,0 +1,86 @@
+"""
+Скользящая статистика задержек
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+
+class LatencyStats:
+    """Скользящее окно измерений с перцентилями"""
+    
+    def __init__(self, window: int = 1000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+    
+    def add(self, seconds: float):
+        """
+        Добавление измерения
+        
+        Args:
+            seconds: Длительность в секундах
+        """
+        with self._lock:
+            self.samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+    
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Перцентиль по текущему окну
+        
+        Args:
+            percent: Перцентиль (0-100)
+        
+        Returns:
+            Optional[float]: Значение в секундах или None, если данных нет
+        """
+        with self._lock:
+            ordered = sorted(self.samples)
+        return self._pick(ordered, percent)
+    
+    @staticmethod
+    def _pick(ordered, percent: float) -> Optional[float]:
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, int(round(percent / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+    
+    def summary(self) -> Dict[str, Optional[float]]:
+        """
+        Сводка по окну измерений
+        
+        Среднее, перцентили и максимум считаются по одному и тому же окну;
+        count и lifetime_mean_ms — по всем измерениям с последнего сброса.
+        
+        Returns:
+            dict: count, window, mean, p50, p95, p99, max, lifetime_mean (в миллисекундах)
+        """
+        with self._lock:
+            ordered = sorted(self.samples)
+            count = self.count
+            total = self.total
+        
+        def ms(value):
+            return round(value * 1000, 3) if value is not None else None
+        
+        return {
+            'count': count,
+            'window': len(ordered),
+            'mean_ms': ms(sum(ordered) / len(ordered)) if ordered else None,
+            'p50_ms': ms(self._pick(ordered, 50)),
+            'p95_ms': ms(self._pick(ordered, 95)),
+            'p99_ms': ms(self._pick(ordered, 99)),
+            'max_ms': ms(ordered[-1]) if ordered else None,
+            'lifetime_mean_ms': ms(total / count) if count else None
+        }
+    
+    def reset(self):
+        """Сброс статистики"""
+        with self._lock:
+            self.samples.clear()
+            self.count = 0
+            self.total = 0.0
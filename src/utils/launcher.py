@@ -0,0 +1,206 @@
+"""
+Асинхронный запуск приложений и ссылок
+"""
+
+import platform
+import queue
+import subprocess
+import threading
+import time
+import webbrowser
+from typing import Callable, List
+
+from .latency_stats import LatencyStats
+
+
+class ProcessLauncher:
+    """
+    Запуск процессов и открытие ссылок в фоновом потоке.
+    
+    Команда только ставит запуск в очередь и сразу возвращает ответ.
+    Поток запуска держит дескрипторы дочерних процессов и периодически
+    опрашивает их, чтобы завершившиеся не оставались зомби. Браузер
+    определяется один раз и переиспользуется. Ошибки запуска случаются уже
+    после ответа команды и передаются подписчикам (add_failure_listener).
+    """
+    
+    # Ответ команды, когда очередь запусков переполнена
+    REJECTED_RESPONSE = "Слишком много запусков, попробуйте позже"
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    # Период опроса завершившихся дочерних процессов (секунды)
+    REAP_INTERVAL = 1.0
+    
+    def __init__(self, max_pending: int = 32):
+        """
+        Args:
+            max_pending: Емкость очереди запусков
+        """
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._children: List[subprocess.Popen] = []
+        self._browser = None
+        self._failure_listeners: List[Callable[[str, Exception], None]] = []
+        self._running = False
+        self._thread = None
+        
+        self.launch_stats = LatencyStats()
+        self.launched = 0
+        self.failed = 0
+        self.reaped = 0
+        self.rejected = 0
+    
+    @classmethod
+    def instance(cls) -> 'ProcessLauncher':
+        """Общий запущенный загрузчик"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                cls._instance.start()
+            return cls._instance
+    
+    def start(self):
+        """Запуск потока"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="ProcessLauncher", daemon=True)
+        self._thread.start()
+        # Поиск браузера заранее, чтобы первая ссылка не ждала его
+        self._submit(('browser', None))
+    
+    def stop(self, timeout: float = 1.0):
+        """Остановка потока (запущенные процессы продолжают работать)"""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def add_failure_listener(self, callback: Callable[[str, Exception], None]):
+        """
+        Подписка на ошибки запуска
+        
+        Args:
+            callback: Вызывается из потока запуска с (цель, исключение)
+        """
+        self._failure_listeners.append(callback)
+    
+    def remove_failure_listener(self, callback: Callable[[str, Exception], None]):
+        """Отписка от ошибок запуска"""
+        if callback in self._failure_listeners:
+            self._failure_listeners.remove(callback)
+    
+    def launch(self, argv: List[str]) -> bool:
+        """
+        Постановка запуска процесса в очередь
+        
+        Args:
+            argv: Команда и аргументы
+        
+        Returns:
+            bool: False если очередь переполнена
+        """
+        return self._submit(('process', list(argv)))
+    
+    def open_url(self, url: str) -> bool:
+        """
+        Постановка открытия ссылки в очередь
+        
+        Args:
+            url: Адрес
+        
+        Returns:
+            bool: False если очередь переполнена
+        """
+        return self._submit(('url', url))
+    
+    def _submit(self, job) -> bool:
+        try:
+            self._queue.put_nowait((job, time.monotonic()))
+            return True
+        except queue.Full:
+            self.rejected += 1
+            return False
+    
+    def _run(self):
+        while self._running:
+            try:
+                job, enqueued_at = self._queue.get(timeout=self.REAP_INTERVAL)
+            except queue.Empty:
+                self._reap()
+                continue
+            
+            kind, target = job
+            if kind == 'browser':
+                try:
+                    self._get_browser()
+                except webbrowser.Error as e:
+                    print(f"Браузер не найден: {e}")
+                continue
+            
+            try:
+                if kind == 'process':
+                    self._children.append(self._spawn(target))
+                elif not self._get_browser().open(target):
+                    raise webbrowser.Error("браузер не открыл ссылку")
+                self.launched += 1
+                self.launch_stats.add(time.monotonic() - enqueued_at)
+            except Exception as e:
+                self.failed += 1
+                print(f"Ошибка запуска {target}: {e}")
+                self._notify_failure(target, e)
+            self._reap()
+    
+    def _notify_failure(self, target, error: Exception):
+        """Передача ошибки запуска подписчикам"""
+        name = " ".join(target) if isinstance(target, list) else str(target)
+        for callback in list(self._failure_listeners):
+            try:
+                callback(name, error)
+            except Exception as e:
+                print(f"Ошибка обработчика ошибок запуска: {e}")
+    
+    @staticmethod
+    def _spawn(argv: List[str]) -> subprocess.Popen:
+        """Запуск процесса, отвязанного от консоли помощника"""
+        kwargs = {
+            'stdin': subprocess.DEVNULL,
+            'stdout': subprocess.DEVNULL,
+            'stderr': subprocess.DEVNULL
+        }
+        if platform.system() == "Windows":
+            kwargs['creationflags'] = getattr(subprocess, 'DETACHED_PROCESS', 0)
+        else:
+            kwargs['start_new_session'] = True
+        return subprocess.Popen(argv, **kwargs)
+    
+    def _get_browser(self):
+        """Контроллер браузера (определяется один раз)"""
+        if self._browser is None:
+            self._browser = webbrowser.get()
+        return self._browser
+    
+    def _reap(self):
+        """Сбор завершившихся дочерних процессов"""
+        if not self._children:
+            return
+        alive = []
+        for child in self._children:
+            if child.poll() is None:
+                alive.append(child)
+            else:
+                self.reaped += 1
+        self._children = alive
+    
+    def get_statistics(self) -> dict:
+        """Число запусков, ошибок, живых процессов и задержка запуска"""
+        return {
+            'launched': self.launched,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'pending': self._queue.qsize(),
+            'running_children': len(self._children),
+            'reaped': self.reaped,
+            'latency': self.launch_stats.summary()
+        }
@@ -0,0 +1,216 @@
+"""
+Фоновый сбор метрик системы и процессов
+"""
+
+import heapq
+import threading
+import time
+from typing import Dict, List, Optional
+
+import psutil
+
+
+class MetricsSampler:
+    """
+    Периодические снимки загрузки CPU, памяти, диска и процессов.
+    
+    Объекты psutil.Process хранятся между проходами, поэтому cpu_percent
+    процесса считается от предыдущего снимка, а не от нуля. Читатели
+    получают последний готовый снимок без обращения к системе.
+    """
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    # Пауза между первым проходом (точка отсчета CPU) и первым снимком
+    WARMUP_SECONDS = 0.5
+    
+    def __init__(self, interval: float = 2.0, top_n: int = 10, disk_path: str = '/'):
+        """
+        Args:
+            interval: Период снимков (секунды)
+            top_n: Сколько самых нагруженных процессов хранить в снимке
+            disk_path: Путь для статистики диска
+        """
+        self.interval = interval
+        self.top_n = top_n
+        self.disk_path = disk_path
+        
+        self._processes: Dict[int, psutil.Process] = {}
+        self._snapshot: Optional[dict] = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.samples = 0
+        self.sample_seconds = 0.0
+    
+    @classmethod
+    def instance(cls) -> 'MetricsSampler':
+        """Общий запущенный сборщик для команд и утилит"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                cls._instance.start()
+            return cls._instance
+    
+    def start(self):
+        """Запуск фонового потока"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="MetricsSampler", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 1.0):
+        """Остановка фонового потока"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _run(self):
+        # Первый проход только задает точку отсчета для cpu_percent
+        self._prime()
+        if self._stop.wait(self.WARMUP_SECONDS):
+            return
+        
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"Ошибка сбора метрик: {e}")
+            elapsed = time.perf_counter() - started
+            self._stop.wait(max(0.0, self.interval - elapsed))
+    
+    def _prime(self):
+        psutil.cpu_percent(interval=None)
+        for proc in psutil.process_iter(['pid']):
+            try:
+                proc.cpu_percent(None)
+                self._processes[proc.pid] = proc
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+    
+    def sample(self) -> dict:
+        """
+        Один проход сбора метрик
+        
+        Returns:
+            dict: Новый снимок
+        """
+        started = time.perf_counter()
+        
+        processes = []
+        alive = {}
+        for pid in psutil.pids():
+            proc = self._processes.get(pid)
+            try:
+                if proc is None:
+                    # Новый процесс: загрузка будет известна со следующего прохода
+                    proc = psutil.Process(pid)
+                    proc.cpu_percent(None)
+                    alive[pid] = proc
+                    continue
+                with proc.oneshot():
+                    processes.append({
+                        'pid': pid,
+                        'name': proc.name(),
+                        'cpu_percent': proc.cpu_percent(None),
+                        'memory_rss': proc.memory_info().rss
+                    })
+                alive[pid] = proc
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+        # Завершившиеся процессы выпадают из словаря
+        self._processes = alive
+        
+        memory = psutil.virtual_memory()
+        try:
+            disk = psutil.disk_usage(self.disk_path)
+            disk_info = {
+                'total': disk.total,
+                'used': disk.used,
+                'free': disk.free,
+                'percent': disk.percent
+            }
+        except OSError:
+            disk_info = None
+        freq = psutil.cpu_freq()
+        
+        snapshot = {
+            'timestamp': time.time(),
+            'cpu': {
+                'count': psutil.cpu_count(),
+                'percent': psutil.cpu_percent(interval=None),
+                'freq': freq._asdict() if freq else None
+            },
+            'memory': {
+                'total': memory.total,
+                'available': memory.available,
+                'used': memory.used,
+                'percent': memory.percent
+            },
+            'disk': disk_info,
+            'processes': processes,
+            'top_processes': heapq.nlargest(
+                self.top_n, processes, key=lambda p: p['cpu_percent']
+            )
+        }
+        
+        # Замена ссылки атомарна: читатели видят либо старый, либо новый снимок
+        self._snapshot = snapshot
+        self.samples += 1
+        self.sample_seconds += time.perf_counter() - started
+        self._ready.set()
+        return snapshot
+    
+    def snapshot(self, timeout: float = 0.0) -> Optional[dict]:
+        """
+        Последний снимок
+        
+        Args:
+            timeout: Сколько ждать первого снимка, если его еще нет
+        
+        Returns:
+            Optional[dict]: Снимок или None
+        """
+        if self._snapshot is None and timeout > 0:
+            self._ready.wait(timeout)
+        return self._snapshot
+    
+    def top_processes(self, count: int = 5, min_cpu: float = 0.0,
+                      timeout: float = 0.0) -> List[dict]:
+        """
+        Самые нагруженные процессы из последнего снимка
+        
+        Args:
+            count: Количество процессов
+            min_cpu: Минимальная загрузка CPU (%)
+            timeout: Сколько ждать первого снимка
+        
+        Returns:
+            List[dict]: Процессы по убыванию загрузки CPU
+        """
+        snapshot = self.snapshot(timeout)
+        if snapshot is None:
+            return []
+        
+        if count <= len(snapshot['top_processes']):
+            top = snapshot['top_processes'][:count]
+        else:
+            top = heapq.nlargest(count, snapshot['processes'], key=lambda p: p['cpu_percent'])
+        return [proc for proc in top if proc['cpu_percent'] > min_cpu]
+    
+    def get_statistics(self) -> dict:
+        """Число проходов и их средняя длительность"""
+        return {
+            'samples': self.samples,
+            'tracked_processes': len(self._processes),
+            'mean_sample_ms': (
+                self.sample_seconds / self.samples * 1000 if self.samples else None
+            ),
+            'age_seconds': (
+                time.time() - self._snapshot['timestamp'] if self._snapshot else None
+            )
+        }
@@ -0,0 +1,61 @@
+"""
+Расположение файлов приложения вне рабочей директории
+"""
+
+import os
+import platform
+
+
+def user_cache_dir() -> str:
+    """
+    Каталог кэша пользователя
+    
+    SENDI_CACHE_DIR, иначе %LOCALAPPDATA%\\Sendi\\cache в Windows,
+    ~/Library/Caches/Sendi в macOS и $XDG_CACHE_HOME/sendi (~/.cache/sendi)
+    в остальных системах. Не зависит от директории запуска.
+    
+    Returns:
+        str: Абсолютный путь к каталогу (может еще не существовать)
+    """
+    override = os.environ.get("SENDI_CACHE_DIR")
+    if override:
+        return os.path.abspath(os.path.expanduser(override))
+    
+    system = platform.system()
+    if system == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~/AppData/Local")
+        return os.path.join(base, "Sendi", "cache")
+    if system == "Darwin":
+        return os.path.expanduser("~/Library/Caches/Sendi")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "sendi")
+
+
+def user_runtime_dir() -> str:
+    """
+    Каталог сокетов и других файлов работающего процесса
+    
+    $XDG_RUNTIME_DIR (доступен только владельцу), иначе каталог кэша
+    пользователя. Общий /tmp не используется: путь в нем предсказуем, и
+    чужой процесс может занять его раньше.
+    
+    Returns:
+        str: Абсолютный путь к каталогу (может еще не существовать)
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(runtime):
+        return runtime
+    return user_cache_dir()
+
+
+def user_cache_path(*parts: str) -> str:
+    """
+    Путь внутри каталога кэша пользователя
+    
+    Args:
+        parts: Компоненты пути относительно каталога кэша
+    
+    Returns:
+        str: Абсолютный путь
+    """
+    return os.path.join(user_cache_dir(), *parts)
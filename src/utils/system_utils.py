@@ -3,27 +3,109 @@
 """
 
 import os
+import sys
+import json
+import time
 import platform
 import subprocess
+import threading
 import psutil
 import datetime
 from pathlib import Path
 
+from .metrics_sampler import MetricsSampler
+from .paths import user_cache_path
+
 
 class SystemUtils:
     """Утилиты для работы с системой"""
     
+    # Неизменные сведения о машине сохраняются между запусками. None —
+    # host_facts.json в кэше пользователя (путь вычисляется при обращении,
+    # чтобы учитывать SENDI_CACHE_DIR, заданный после импорта)
+    HOST_FACTS_FILE = None
+    
+    # Как долго считаются актуальными изменяемые сведения (секунды)
+    VOLATILE_FACTS_TTL = 60.0
+    
+    _static_facts = None
+    _volatile_facts = None
+    _volatile_expires = 0.0
+    _facts_lock = threading.Lock()
+    
     @staticmethod
     def get_system_info():
         """Получение информации о системе"""
+        static = SystemUtils._static_facts
+        volatile = SystemUtils._volatile_facts
+        if static is None or time.monotonic() >= SystemUtils._volatile_expires:
+            static, volatile = SystemUtils._refresh_facts()
+        
+        info = dict(static)
+        info.update(volatile)
+        return info
+    
+    @staticmethod
+    def _refresh_facts():
+        """Вычисление недостающих сведений о машине"""
+        with SystemUtils._facts_lock:
+            if SystemUtils._static_facts is None:
+                SystemUtils._static_facts = SystemUtils._load_static_facts()
+            
+            if SystemUtils._volatile_facts is None or time.monotonic() >= SystemUtils._volatile_expires:
+                SystemUtils._volatile_facts = {'hostname': platform.node()}
+                SystemUtils._volatile_expires = time.monotonic() + SystemUtils.VOLATILE_FACTS_TTL
+            
+            return SystemUtils._static_facts, SystemUtils._volatile_facts
+    
+    @staticmethod
+    def _host_fingerprint():
+        """Признаки, при смене которых сохраненные сведения устаревают"""
+        try:
+            with open("/proc/sys/kernel/random/boot_id", 'r') as f:
+                boot = f.read().strip()
+        except OSError:
+            boot = str(int(psutil.boot_time()))
         return {
+            'boot': boot,
+            'kernel': platform.release(),
+            'python': sys.version
+        }
+    
+    @staticmethod
+    def _host_facts_file():
+        """Файл сохраненных сведений о машине"""
+        return SystemUtils.HOST_FACTS_FILE or user_cache_path("host_facts.json")
+    
+    @staticmethod
+    def _load_static_facts():
+        """Неизменные сведения из файла или, если он устарел, заново"""
+        fingerprint = SystemUtils._host_fingerprint()
+        facts_file = SystemUtils._host_facts_file()
+        try:
+            with open(facts_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('fingerprint') == fingerprint:
+                return saved['facts']
+        except (OSError, ValueError, KeyError):
+            pass
+        
+        facts = {
             'os': platform.system(),
             'version': platform.version(),
             'architecture': platform.architecture()[0],
             'processor': platform.processor(),
-            'python_version': platform.python_version(),
-            'hostname': platform.node()
+            'python_version': platform.python_version()
         }
+        try:
+            cache_dir = os.path.dirname(facts_file)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            with open(facts_file, 'w', encoding='utf-8') as f:
+                json.dump({'fingerprint': fingerprint, 'facts': facts}, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"Ошибка сохранения сведений о системе: {e}")
+        return facts
     
     @staticmethod
     def get_desktop_path():
@@ -62,6 +144,9 @@ class SystemUtils:
     @staticmethod
     def get_memory_info():
         """Получение информации о памяти"""
+        snapshot = MetricsSampler.instance().snapshot()
+        if snapshot is not None:
+            return snapshot['memory']
         try:
             memory = psutil.virtual_memory()
             return {
@@ -76,10 +161,14 @@ class SystemUtils:
     @staticmethod
     def get_cpu_info():
         """Получение информации о процессоре"""
+        # Загрузка берется из фонового снимка; ждать приходится только до первого
+        snapshot = MetricsSampler.instance().snapshot(timeout=MetricsSampler.WARMUP_SECONDS + 1)
+        if snapshot is not None:
+            return snapshot['cpu']
         try:
             return {
                 'count': psutil.cpu_count(),
-                'percent': psutil.cpu_percent(interval=1),
+                'percent': psutil.cpu_percent(interval=None),
                 'freq': psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None
             }
         except Exception:
@@ -88,6 +177,9 @@ class SystemUtils:
     @staticmethod
     def get_disk_info():
         """Получение информации о дисках"""
+        snapshot = MetricsSampler.instance().snapshot()
+        if snapshot is not None and snapshot['disk'] is not None:
+            return snapshot['disk']
         try:
             disk = psutil.disk_usage('/')
             return {
@@ -0,0 +1,194 @@
+"""
+Трассировка задержек по стадиям голосового конвейера
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from .latency_stats import LatencyStats
+
+
+_local = threading.local()
+
+
+def current_trace() -> Optional['Trace']:
+    """Трасса фразы, которую обрабатывает текущий поток"""
+    return getattr(_local, 'trace', None)
+
+
+def activate(trace: Optional['Trace']):
+    """
+    Назначение текущей трассы потока
+    
+    Args:
+        trace: Трасса или None, чтобы снять
+    """
+    _local.trace = trace
+
+
+class Trace:
+    """
+    Отметки времени одной фразы.
+    
+    Каждая отметка закрывает стадию: ее длительность — время от
+    предыдущей отметки (или начала фразы) до этой.
+    """
+    
+    __slots__ = ('id', 'started_at', 'last_at', 'marks', 'finished', '_tracer')
+    
+    def __init__(self, tracer: 'PipelineTracer', trace_id: int, started_at: float):
+        self.id = trace_id
+        self.started_at = started_at
+        self.last_at = started_at
+        self.marks: List[tuple] = []
+        self.finished = False
+        self._tracer = tracer
+    
+    def mark(self, stage: str, at: Optional[float] = None):
+        """
+        Отметка конца стадии (после завершения трассы не учитывается)
+        
+        Args:
+            stage: Название стадии
+            at: Время по time.monotonic() (по умолчанию сейчас)
+        """
+        if self.finished:
+            return
+        at = time.monotonic() if at is None else at
+        duration = max(0.0, at - self.last_at)
+        self.last_at = at
+        self.marks.append((stage, duration))
+        self._tracer.record(stage, duration)
+    
+    def finish(self, stage: Optional[str] = None, at: Optional[float] = None):
+        """
+        Последняя отметка и учет полного времени фразы
+        
+        Args:
+            stage: Название последней стадии (None — без отметки)
+            at: Время по time.monotonic() (по умолчанию сейчас)
+        """
+        if self.finished:
+            return
+        if stage is not None:
+            self.mark(stage, at)
+        self.finished = True
+        self._tracer.complete(self)
+
+
+class PipelineTracer:
+    """
+    Скользящие гистограммы задержек по стадиям конвейера.
+    
+    Фраза получает номер трассы при захвате. Поток стадии делает трассу
+    текущей (activate), поэтому отметки внутри обработчиков ставятся без
+    передачи трассы через все вызовы. Выключенный трассировщик не создает
+    трасс, и все отметки сводятся к проверке на None.
+    """
+    
+    def __init__(self, enabled: bool = False, window: int = 1000, keep_recent: int = 20):
+        """
+        Args:
+            enabled: Включена ли трассировка
+            window: Размер скользящего окна каждой гистограммы
+            keep_recent: Сколько последних завершенных трасс хранить
+        """
+        self.enabled = enabled
+        self.window = window
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stages: Dict[str, LatencyStats] = {}
+        self._total = LatencyStats(window)
+        self._recent = deque(maxlen=keep_recent)
+        
+        self.started = 0
+        self.completed = 0
+    
+    def begin(self, started_at: Optional[float] = None) -> Optional[Trace]:
+        """
+        Новая трасса
+        
+        Args:
+            started_at: Начало фразы по time.monotonic() (по умолчанию сейчас)
+        
+        Returns:
+            Optional[Trace]: Трасса или None, если трассировка выключена
+        """
+        if not self.enabled:
+            return None
+        self.started += 1
+        started_at = time.monotonic() if started_at is None else started_at
+        return Trace(self, next(self._ids), started_at)
+    
+    def record(self, stage: str, seconds: float):
+        """Учет длительности стадии"""
+        stats = self._stages.get(stage)
+        if stats is None:
+            with self._lock:
+                stats = self._stages.setdefault(stage, LatencyStats(self.window))
+        stats.add(seconds)
+    
+    def complete(self, trace: Trace):
+        """Учет завершенной трассы"""
+        total = trace.last_at - trace.started_at
+        self._total.add(total)
+        with self._lock:
+            self.completed += 1
+            self._recent.append({
+                'id': trace.id,
+                'total_ms': round(total * 1000, 3),
+                'stages': [(stage, round(seconds * 1000, 3)) for stage, seconds in trace.marks]
+            })
+    
+    def get_statistics(self) -> dict:
+        """
+        Гистограммы стадий и последние трассы
+        
+        Returns:
+            dict: enabled, started, completed, total, stages — {стадия: перцентили},
+                recent — последние завершенные трассы
+        """
+        with self._lock:
+            stages = dict(self._stages)
+            recent = list(self._recent)
+        return {
+            'enabled': self.enabled,
+            'started': self.started,
+            'completed': self.completed,
+            'total': self._total.summary(),
+            'stages': {name: stats.summary() for name, stats in stages.items()},
+            'recent': recent
+        }
+    
+    def summary_lines(self) -> List[str]:
+        """Сводка для журнала (пустая, если трасс не было)"""
+        stats = self.get_statistics()
+        if not stats['started']:
+            return []
+        
+        def describe(summary):
+            # Перцентили считаются по окну: при переполнении указываем его размер
+            counted = summary['count']
+            if summary['window'] < counted:
+                counted = f"последние {summary['window']} из {counted}"
+            return (f"p50 {summary['p50_ms']} мс, p95 {summary['p95_ms']} мс, "
+                    f"p99 {summary['p99_ms']} мс ({counted})")
+        
+        lines = [f"Трассировка: фраз {stats['started']}, завершено {stats['completed']}"]
+        if stats['completed']:
+            lines.append(f"  полный цикл: {describe(stats['total'])}")
+        for name, summary in stats['stages'].items():
+            lines.append(f"  {name}: {describe(summary)}")
+        return lines
+    
+    def reset(self):
+        """Сброс гистограмм"""
+        with self._lock:
+            self._stages.clear()
+            self._recent.clear()
+            self.started = 0
+            self.completed = 0
+        self._total.reset()
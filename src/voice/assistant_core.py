@@ -0,0 +1,306 @@
+"""
+Общее ядро голосового помощника без Qt
+"""
+
+import time
+from typing import Callable, Optional
+
+import speech_recognition as sr
+
+from commands.command_processor import CommandProcessor
+from utils.app_locator import AppLocator
+from utils.launcher import ProcessLauncher
+from utils.metrics_sampler import MetricsSampler
+from utils.tracing import PipelineTracer, current_trace
+from voice.audio_cache import AudioCache
+from voice.audio_capture import AudioCapture
+from voice.pipeline import VoicePipeline
+from voice.recognizers import VoskRecognizer, create_recognizer
+from voice.tts_service import TTSService
+from voice.wake_word import create_wake_word_gate
+
+
+class AssistantCore:
+    """
+    Компоненты помощника, общие для окна и демона.
+    
+    Обработчик команд, синтез, распознавание, фильтр слова активации и
+    конвейер микрофона строятся здесь по одним и тем же настройкам, а
+    результат команды одинаково превращается в ответ для озвучивания.
+    Оболочки (VoiceAssistant, HeadlessAssistant) только передают события
+    своим подписчикам: сигналами Qt или обычным callback.
+    """
+    
+    # Собственные постоянные ответы помощника
+    NOT_FOUND_RESPONSE = "Команда не найдена"
+    ERROR_RESPONSE = "Произошла ошибка"
+    FIXED_RESPONSES = (NOT_FOUND_RESPONSE, ERROR_RESPONSE)
+    
+    def __init__(self, config=None, speak: bool = True, speech_backend=None,
+                 on_first_audio: Optional[Callable[[str, float], None]] = None,
+                 on_launch_failed: Optional[Callable[[str, Exception], None]] = None):
+        """
+        Args:
+            config: Плоские настройки помощника (изменяются через update_config)
+            speak: Создать сервис синтеза речи
+            speech_backend: Движок распознавания вместо заданного в настройках
+            on_first_audio: Callback(text, seconds) с задержкой до начала звучания
+            on_launch_failed: Callback(target, error) для ошибок запуска приложений
+        """
+        self.config = config if config is not None else {}
+        
+        self.command_processor = CommandProcessor.from_settings(self.config)
+        AppLocator.instance().set_extra_dirs(self.config.get('app_dirs', []))
+        # Запуск идет после ответа команды, поэтому его ошибки приходят отдельно
+        self.on_launch_failed = on_launch_failed
+        if on_launch_failed is not None:
+            ProcessLauncher.instance().add_failure_listener(on_launch_failed)
+        # Команды получают загрузчик и сборщик метрик только при выполнении;
+        # сборщик запускается заранее, чтобы к первой команде уже был снимок
+        MetricsSampler.instance()
+        
+        # Постоянный сервис синтеза речи с кэшем готовых фраз
+        self.tts_service = None
+        if speak:
+            self.tts_service = TTSService(
+                self.config,
+                on_first_audio=on_first_audio,
+                cache=self._create_audio_cache()
+            )
+            self.tts_service.start()
+            self.tts_service.warm(
+                list(self.FIXED_RESPONSES) + self.command_processor.get_fixed_responses()
+            )
+        
+        # Движок распознавания (секция recognition конфигурации)
+        self.recognizer = sr.Recognizer()
+        self.speech_backend = speech_backend or create_recognizer(self.config, self.recognizer)
+        
+        # Фильтр слова активации перед распознаванием (секция commands конфигурации);
+        # если слово обязательно, а детектор недоступен, создание помощника падает
+        self.wake_word_gate = self._create_wake_word_gate()
+        
+        # Задержки по стадиям для каждой фразы (выключено — почти без накладных расходов)
+        self.tracer = PipelineTracer(enabled=self.config.get('trace_latency', False))
+        
+        # Конвейер захват → распознавание → выполнение → речь (создается при запуске)
+        self.capture = None
+        self.pipeline = None
+    
+    def _create_audio_cache(self):
+        """Создание кэша синтезированных фраз"""
+        try:
+            return AudioCache(
+                self.config.get('cache_dir'),
+                int(self.config.get('cache_max_mb', 50) * 1024 * 1024)
+            )
+        except Exception as e:
+            print(f"Ошибка создания кэша TTS: {e}")
+            return None
+    
+    def _create_wake_word_gate(self):
+        """Фильтр слова активации на модели движка Vosk, если она уже загружена"""
+        model = None
+        if isinstance(self.speech_backend, VoskRecognizer):
+            model = self.speech_backend.model
+        return create_wake_word_gate(self.config, model=model)
+    
+    def calibrate(self, audio_source):
+        """Настройка порога шума по окружению"""
+        ambient_duration = self.config.get('ambient_duration', 1)
+        if not ambient_duration:
+            return
+        try:
+            with audio_source as source:
+                self.recognizer.adjust_for_ambient_noise(source, duration=ambient_duration)
+        except Exception as e:
+            print(f"Ошибка настройки микрофона: {e}")
+    
+    def speak(self, text: str):
+        """Озвучивание ответа (если синтез включен)"""
+        if self.tts_service is None:
+            return
+        try:
+            self.tts_service.speak(text, interrupt=True, trace=current_trace())
+        except Exception as e:
+            print(f"Ошибка TTS: {e}")
+    
+    def transcribe(self, audio) -> Optional[str]:
+        """
+        Текст фразы: готовая расшифровка потокового движка или распознавание
+        
+        Raises:
+            RecognitionError: Движок недоступен
+        """
+        text = getattr(audio, 'transcript', None)
+        if not text:
+            text = self.speech_backend.recognize(audio)
+        return text or None
+    
+    def execute(self, text: str) -> dict:
+        """
+        Выполнение текстовой команды
+        
+        Args:
+            text: Текст команды
+        
+        Returns:
+            dict: text, success, response (ответ команды), spoken (ответ для
+                озвучивания), latency_ms и error, если обработка упала
+        """
+        started = time.perf_counter()
+        result = {'text': text}
+        try:
+            success, response = self.command_processor.process_command(text)
+        except Exception as e:
+            print(f"Ошибка обработки команды: {e}")
+            success, response = False, self.ERROR_RESPONSE
+            result['error'] = str(e)
+        result.update({
+            'success': success,
+            'response': response,
+            'spoken': self.spoken_response(success, response),
+            'latency_ms': round((time.perf_counter() - started) * 1000, 3)
+        })
+        return result
+    
+    def spoken_response(self, success: bool, response: str) -> str:
+        """Ответ для озвучивания по результату команды"""
+        if success or response == self.ERROR_RESPONSE:
+            return response
+        # Постоянные ответы об ошибках (таймаут, перегрузка, отказ в запуске,
+        # "приложение не установлено") озвучиваем как есть, а не как "не найдено"
+        if response in self.command_processor.get_fixed_responses():
+            return response
+        return self.NOT_FOUND_RESPONSE
+    
+    def _gate(self, audio):
+        """Стадия фильтра: текущий фильтр слова активации или пропуск фразы"""
+        gate = self.wake_word_gate
+        return gate.process(audio) if gate is not None else audio
+    
+    def should_dispatch_early(self, text: str, repeats: int) -> bool:
+        """
+        Можно ли выполнить команду по частичной гипотезе
+        
+        Args:
+            text: Текущая гипотеза
+            repeats: Сколько фреймов подряд гипотеза не менялась
+        """
+        if not self.config.get('early_dispatch', False):
+            return False
+        # Гипотеза строится до фильтра: при слове активации ждем его решения
+        if self.wake_word_gate is not None:
+            return False
+        if repeats < self.config.get('partial_stability', 3):
+            return False
+        return self.command_processor.find_command(text) is not None
+    
+    def dispatch_early(self, text: str) -> bool:
+        """
+        Передача гипотезы сразу на стадию выполнения
+        
+        Returns:
+            bool: True если команда принята конвейером
+        """
+        if self.pipeline is None:
+            return False
+        return self.pipeline.dispatch.offer(text, self.tracer.begin())
+    
+    def start_pipeline(self, audio_source, recognize, dispatch, on_partial=None) -> VoicePipeline:
+        """
+        Сборка и запуск конвейера микрофона
+        
+        Args:
+            audio_source: Источник звука
+            recognize: Стадия распознавания audio -> текст или None
+            dispatch: Стадия выполнения текст -> ответ для озвучивания
+            on_partial: Callback(text, repeats) -> bool для частичных гипотез
+                потокового распознавания (True — команда выполнена досрочно)
+        
+        Returns:
+            VoicePipeline: Запущенный конвейер
+        """
+        self.capture = AudioCapture(
+            audio_source,
+            energy_threshold=self.recognizer.energy_threshold,
+            phrase_time_limit=self.config.get('phrase_time_limit', 5),
+            buffer_seconds=self.config.get('buffer_seconds', 10)
+        )
+        self.pipeline = VoicePipeline(
+            self.capture,
+            recognize=recognize,
+            dispatch=dispatch,
+            speak=self.speak,
+            queue_size=self.config.get('queue_size', 4),
+            # Стадия фильтра есть всегда и берет текущий фильтр при каждой фразе:
+            # update_config может включить, выключить или пересоздать его на ходу
+            gate=self._gate,
+            tracer=self.tracer
+        )
+        # Потоковые гипотезы идут до фильтра; при включенном фильтре досрочного
+        # выполнения нет, а вырезанный остаток фразы распознается заново
+        if on_partial is not None and self.speech_backend.supports_streaming:
+            self.capture.stream_factory = self.speech_backend.start_stream
+            self.capture.on_partial = on_partial
+        
+        try:
+            self.pipeline.start()
+        except Exception:
+            self.pipeline.stop()
+            self.capture = None
+            self.pipeline = None
+            raise
+        return self.pipeline
+    
+    def stop_pipeline(self):
+        """Остановка конвейера микрофона с отчетом о потерях захвата"""
+        if self.pipeline is None:
+            return
+        stats = self.capture.get_statistics()
+        self.pipeline.stop()
+        self.capture = None
+        self.pipeline = None
+        if stats.get('dropped_frames') or stats.get('dropped_phrases'):
+            print(
+                f"Потеряно аудиофреймов: {stats['dropped_frames']}, "
+                f"фраз: {stats['dropped_phrases']}"
+            )
+    
+    def update_config(self, new_config: dict):
+        """Применение измененных настроек к движку, фильтру и трассировке"""
+        self.config.update(new_config)
+        
+        engine_keys = ('engine', 'model_path', 'language')
+        engine_changed = any(key in new_config for key in engine_keys)
+        if engine_changed:
+            self.speech_backend = create_recognizer(self.config, self.recognizer)
+        
+        # Новый движок может принести другую модель Vosk, поэтому фильтр тоже пересоздается
+        wake_keys = ('require_wake_word', 'wake_word', 'wake_word_aliases', 'wake_window')
+        if engine_changed or any(key in new_config for key in wake_keys):
+            self.wake_word_gate = self._create_wake_word_gate()
+        
+        if 'app_dirs' in new_config:
+            AppLocator.instance().set_extra_dirs(self.config['app_dirs'])
+        
+        if 'trace_latency' in new_config:
+            self.tracer.enabled = bool(self.config['trace_latency'])
+    
+    def get_statistics(self) -> dict:
+        """Статистика конвейера, команд, синтеза и трассировки"""
+        stats = self.pipeline.get_statistics() if self.pipeline else {}
+        stats['commands'] = self.command_processor.get_execution_statistics()
+        stats['trace'] = self.tracer.get_statistics()
+        if self.tts_service is not None:
+            stats['tts'] = self.tts_service.get_statistics()
+        return stats
+    
+    def shutdown(self):
+        """Остановка конвейера, синтеза и пула команд"""
+        self.stop_pipeline()
+        if self.tts_service is not None:
+            self.tts_service.shutdown()
+        self.command_processor.shutdown()
+        if self.on_launch_failed is not None:
+            ProcessLauncher.instance().remove_failure_listener(self.on_launch_failed)
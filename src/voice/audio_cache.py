@@ -0,0 +1,284 @@
+"""
+Кэш заранее синтезированных WAV-файлов
+"""
+
+import hashlib
+import json
+import os
+import platform
+import threading
+import wave
+from collections import OrderedDict
+from typing import Optional
+
+from utils.paths import user_cache_path
+
+
+class AudioCache:
+    """
+    Контентно-адресуемый кэш WAV-файлов с вытеснением LRU.
+    
+    Ключ — хэш от (текст, голос, скорость, громкость), поэтому смена
+    настроек голоса не приводит к воспроизведению устаревшей записи.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 50 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: Директория кэша (None — tts в каталоге кэша пользователя)
+            max_bytes: Предельный размер кэша
+        """
+        self.cache_dir = cache_dir or user_cache_path("tts")
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        self._entries = OrderedDict()  # ключ -> размер файла
+        self._lock = threading.Lock()
+        
+        self._ensure_cache_directory()
+        self._load_entries()
+    
+    def _ensure_cache_directory(self):
+        """Создание директории кэша"""
+        if self.cache_dir and not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def _load_entries(self):
+        """Восстановление порядка LRU по времени последнего доступа"""
+        try:
+            files = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.wav') or name.endswith('.tmp.wav'):
+                    continue
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                files.append((stat.st_mtime, name[:-4], stat.st_size))
+        except OSError as e:
+            print(f"Ошибка чтения кэша TTS: {e}")
+            return
+        
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self.total_bytes += size
+        self._evict()
+    
+    @staticmethod
+    def make_key(text: str, voice_id, rate, volume) -> str:
+        """
+        Построение ключа кэша
+        
+        Args:
+            text: Текст фразы
+            voice_id: Идентификатор голоса
+            rate: Скорость речи
+            volume: Громкость
+        
+        Returns:
+            str: Хэш ключа
+        """
+        payload = json.dumps([text, voice_id, rate, volume], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def path_for(self, key: str) -> str:
+        """Путь к файлу записи"""
+        return os.path.join(self.cache_dir, f"{key}.wav")
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Поиск записи в кэше
+        
+        Args:
+            key: Ключ записи
+        
+        Returns:
+            Optional[str]: Путь к WAV-файлу или None
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        
+        path = self.path_for(key)
+        try:
+            # Время изменения хранит порядок LRU между запусками
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._drop(key)
+            return None
+        return path
+    
+    def contains(self, key: str) -> bool:
+        """Есть ли запись в кэше (без учета в статистике)"""
+        with self._lock:
+            return key in self._entries
+    
+    def temp_path_for(self, key: str) -> str:
+        """Временный путь для синтеза записи"""
+        return os.path.join(self.cache_dir, f"{key}.tmp.wav")
+    
+    def commit(self, key: str, temp_path: str) -> bool:
+        """
+        Перенос синтезированного файла в кэш
+        
+        Args:
+            key: Ключ записи
+            temp_path: Путь к синтезированному файлу
+        
+        Returns:
+            bool: True если запись добавлена
+        """
+        try:
+            size = os.path.getsize(temp_path)
+            if size == 0:
+                os.remove(temp_path)
+                return False
+            os.replace(temp_path, self.path_for(key))
+        except OSError as e:
+            print(f"Ошибка сохранения в кэш TTS: {e}")
+            return False
+        
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries[key]
+            self._entries[key] = size
+            self._entries.move_to_end(key)
+            self.total_bytes += size
+            self._evict()
+        return True
+    
+    def _drop(self, key: str):
+        """Удаление записи из учета"""
+        size = self._entries.pop(key, 0)
+        self.total_bytes -= size
+    
+    def _evict(self):
+        """Вытеснение самых старых записей сверх лимита"""
+        while self.total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path_for(key))
+            except OSError:
+                pass
+    
+    def clear(self):
+        """Очистка кэша"""
+        with self._lock:
+            for key in list(self._entries):
+                try:
+                    os.remove(self.path_for(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self.total_bytes = 0
+    
+    def get_statistics(self) -> dict:
+        """Статистика кэша"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+class WavPlayer:
+    """Воспроизведение WAV-файлов без повторного синтеза"""
+    
+    CHUNK = 1024
+    
+    def __init__(self):
+        self._pyaudio = None
+        self._stop = threading.Event()
+    
+    @staticmethod
+    def is_wav(path: str) -> bool:
+        """
+        Записан ли файл в формате WAV
+        
+        Драйвер nsss (macOS) сохраняет синтез в AIFF, хотя имя файла .wav.
+        """
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(12)
+        except OSError:
+            return False
+        return header[:4] == b'RIFF' and header[8:12] == b'WAVE'
+    
+    @staticmethod
+    def is_available() -> bool:
+        """Есть ли способ воспроизвести файл"""
+        if platform.system() == "Windows":
+            return True
+        try:
+            import pyaudio  # noqa: F401
+            return True
+        except ImportError:
+            return False
+    
+    def play(self, path: str, on_start=None) -> bool:
+        """
+        Воспроизведение файла до конца или до вызова stop()
+        
+        Args:
+            path: Путь к WAV-файлу
+            on_start: Callback, вызываемый перед первым звуком
+        
+        Returns:
+            bool: True если файл воспроизведен
+        """
+        self._stop.clear()
+        if not self.is_wav(path):
+            raise ValueError(f"Файл не в формате WAV: {path}")
+        
+        if platform.system() == "Windows":
+            import winsound
+            if on_start:
+                on_start()
+            winsound.PlaySound(path, winsound.SND_FILENAME)
+            return True
+        
+        import pyaudio
+        if self._pyaudio is None:
+            self._pyaudio = pyaudio.PyAudio()
+        
+        with wave.open(path, 'rb') as wav:
+            stream = self._pyaudio.open(
+                format=self._pyaudio.get_format_from_width(wav.getsampwidth()),
+                channels=wav.getnchannels(),
+                rate=wav.getframerate(),
+                output=True
+            )
+            try:
+                data = wav.readframes(self.CHUNK)
+                if on_start:
+                    on_start()
+                while data and not self._stop.is_set():
+                    stream.write(data)
+                    data = wav.readframes(self.CHUNK)
+            finally:
+                stream.stop_stream()
+                stream.close()
+        return not self._stop.is_set()
+    
+    def stop(self):
+        """Прерывание воспроизведения"""
+        self._stop.set()
+        if platform.system() == "Windows":
+            import winsound
+            winsound.PlaySound(None, winsound.SND_PURGE)
+    
+    def close(self):
+        """Освобождение аудиоустройства"""
+        if self._pyaudio is not None:
+            self._pyaudio.terminate()
+            self._pyaudio = None
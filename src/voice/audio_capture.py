@@ -0,0 +1,490 @@
+"""
+Непрерывный захват звука с кольцевым буфером и детектором речи
+"""
+
+import math
+import queue
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Optional
+
+import speech_recognition as sr
+
+try:
+    import audioop
+except ImportError:  # Python 3.13+
+    audioop = None
+
+
+def frame_rms(frame: bytes, sample_width: int) -> float:
+    """
+    Среднеквадратичная энергия фрейма
+    
+    Args:
+        frame: Сырые PCM-данные
+        sample_width: Размер отсчета в байтах
+    
+    Returns:
+        float: Энергия фрейма
+    """
+    if audioop is not None:
+        return audioop.rms(frame, sample_width)
+    
+    samples = array({1: 'b', 2: 'h', 4: 'i'}[sample_width])
+    samples.frombytes(frame[:len(frame) - len(frame) % sample_width])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class Phrase(sr.AudioData):
+    """Фраза, вырезанная стадией захвата"""
+    
+    def __init__(self, frame_data: bytes, sample_rate: int, sample_width: int,
+                 transcript: Optional[str] = None, dispatched: bool = False):
+        """
+        Args:
+            frame_data: Сырые PCM-данные фразы
+            sample_rate: Частота дискретизации
+            sample_width: Размер отсчета в байтах
+            transcript: Текст, уже полученный потоковым распознаванием
+            dispatched: Команда уже выполнена по частичной гипотезе
+        """
+        super().__init__(frame_data, sample_rate, sample_width)
+        self.transcript = transcript
+        self.dispatched = dispatched
+        self.ended_at = time.monotonic()
+
+
+class FrameRingBuffer:
+    """
+    Кольцевой буфер фиксированного размера для аудиофреймов.
+    
+    Запись никогда не блокирует поток захвата: при переполнении
+    перезаписывается самый старый фрейм и увеличивается счетчик потерь.
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._frames = [None] * self.capacity
+        self._head = 0  # индекс следующего фрейма для чтения
+        self._size = 0
+        self.dropped_frames = 0
+        self.written_frames = 0
+        self._condition = threading.Condition()
+    
+    def write(self, frame: bytes):
+        """Запись фрейма"""
+        with self._condition:
+            tail = (self._head + self._size) % self.capacity
+            self._frames[tail] = frame
+            if self._size == self.capacity:
+                self._head = (self._head + 1) % self.capacity
+                self.dropped_frames += 1
+            else:
+                self._size += 1
+            self.written_frames += 1
+            self._condition.notify()
+    
+    def read(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Чтение самого старого фрейма
+        
+        Args:
+            timeout: Время ожидания в секундах
+        
+        Returns:
+            Optional[bytes]: Фрейм или None по таймауту
+        """
+        with self._condition:
+            if not self._size and not self._condition.wait_for(lambda: self._size, timeout):
+                return None
+            frame = self._frames[self._head]
+            self._frames[self._head] = None
+            self._head = (self._head + 1) % self.capacity
+            self._size -= 1
+            return frame
+    
+    def __len__(self) -> int:
+        with self._condition:
+            return self._size
+
+
+class EnergyVAD:
+    """
+    Детектор речи по энергии с адаптацией к уровню шума.
+    
+    В паузах уровень шума подстраивается быстро, во время речи — медленно,
+    чтобы порог поднялся, если шум стал постоянно громче (включили
+    вентилятор). Слишком длинная непрерывная «речь» считается новым шумом:
+    уровень сбрасывается к самому тихому фрейму этого участка.
+    """
+    
+    def __init__(self, energy_threshold: float = 300, ratio: float = 1.5,
+                 adaptation: float = 0.05, speech_adaptation: float = 0.002,
+                 max_speech_frames: int = 300):
+        """
+        Args:
+            energy_threshold: Начальный порог энергии
+            ratio: Во сколько раз речь должна быть громче шума
+            adaptation: Скорость подстройки под уровень шума в паузах
+            speech_adaptation: Скорость подстройки во время речи
+            max_speech_frames: Сколько фреймов речи подряд допустимо до сброса уровня шума
+        """
+        self.energy_threshold = energy_threshold
+        self.min_threshold = energy_threshold / 4
+        self.ratio = ratio
+        self.adaptation = adaptation
+        self.speech_adaptation = speech_adaptation
+        self.max_speech_frames = max_speech_frames
+        self.noise_level = energy_threshold / ratio
+        
+        self._speech_frames = 0
+        self._speech_floor = None
+        self.resets = 0
+    
+    def is_speech(self, energy: float) -> bool:
+        """
+        Классификация фрейма
+        
+        Args:
+            energy: Энергия фрейма
+        
+        Returns:
+            bool: True если фрейм содержит речь
+        """
+        if energy > self.energy_threshold:
+            self._speech_frames += 1
+            self._speech_floor = energy if self._speech_floor is None else min(self._speech_floor, energy)
+            if self._speech_frames > self.max_speech_frames:
+                # Так долго без пауз не говорят: громче стал сам шум
+                self.noise_level = self._speech_floor
+                self._update_threshold()
+                self._speech_frames = 0
+                self._speech_floor = None
+                self.resets += 1
+                return energy > self.energy_threshold
+            self.noise_level += (energy - self.noise_level) * self.speech_adaptation
+            self._update_threshold()
+            return True
+        
+        self._speech_frames = 0
+        self._speech_floor = None
+        self.noise_level += (energy - self.noise_level) * self.adaptation
+        self._update_threshold()
+        return False
+    
+    def _update_threshold(self):
+        self.energy_threshold = max(self.min_threshold, self.noise_level * self.ratio)
+
+
+class PhraseSegmenter:
+    """
+    Нарезка потока фреймов на фразы с адаптивным определением конца фразы.
+    
+    Для коротких фраз требуется более длинная пауза (пользователь может
+    продолжать мысль), длинные фразы завершаются быстрее.
+    """
+    
+    def __init__(self, frame_duration: float, vad: EnergyVAD,
+                 phrase_time_limit: float = 5, pre_roll: float = 0.3,
+                 min_phrase: float = 0.25, max_pause: float = 0.9,
+                 min_pause: float = 0.4):
+        self.frame_duration = frame_duration
+        self.vad = vad
+        self.phrase_time_limit = phrase_time_limit
+        self.min_phrase = min_phrase
+        self.max_pause = max_pause
+        self.min_pause = min_pause
+        
+        self._pre_roll = deque(maxlen=max(1, int(pre_roll / frame_duration)))
+        self._frames = []
+        self._voiced = 0.0
+        self._silence = 0.0
+        self._in_phrase = False
+    
+    @property
+    def in_phrase(self) -> bool:
+        """Идет ли сейчас фраза"""
+        return self._in_phrase
+    
+    @property
+    def current_frames(self) -> list:
+        """Фреймы текущей незавершенной фразы"""
+        return self._frames
+    
+    def required_pause(self, phrase_length: float) -> float:
+        """Длительность паузы, завершающей фразу заданной длины"""
+        progress = min(1.0, phrase_length / max(self.phrase_time_limit, 0.1))
+        return self.max_pause - (self.max_pause - self.min_pause) * progress
+    
+    def push(self, frame: bytes, energy: float):
+        """
+        Обработка очередного фрейма
+        
+        Args:
+            frame: Сырые PCM-данные
+            energy: Энергия фрейма
+        
+        Returns:
+            Optional[bytes]: Данные завершенной фразы или None
+        """
+        speech = self.vad.is_speech(energy)
+        
+        if not self._in_phrase:
+            if not speech:
+                self._pre_roll.append(frame)
+                return None
+            # Начало фразы: захватываем предшествующие фреймы, чтобы не срезать начало
+            self._in_phrase = True
+            self._frames = list(self._pre_roll)
+            self._pre_roll.clear()
+            self._voiced = 0.0
+            self._silence = 0.0
+        
+        self._frames.append(frame)
+        length = len(self._frames) * self.frame_duration
+        
+        if speech:
+            self._voiced += self.frame_duration
+            self._silence = 0.0
+        else:
+            self._silence += self.frame_duration
+        
+        if length >= self.phrase_time_limit:
+            # Принудительный разрез: следующая фраза начнется со следующего фрейма
+            return self._finish(continue_phrase=speech)
+        if self._silence >= self.required_pause(length - self._silence):
+            return self._finish()
+        return None
+    
+    def _finish(self, continue_phrase: bool = False) -> Optional[bytes]:
+        """Завершение текущей фразы"""
+        frames, voiced = self._frames, self._voiced
+        self._frames = []
+        self._voiced = 0.0
+        self._silence = 0.0
+        self._in_phrase = continue_phrase
+        
+        if voiced < self.min_phrase:
+            return None
+        return b''.join(frames)
+    
+    def flush(self) -> Optional[bytes]:
+        """Завершение незаконченной фразы (при остановке захвата)"""
+        if not self._in_phrase:
+            return None
+        return self._finish()
+
+
+class AudioCapture:
+    """
+    Стадия захвата звука.
+    
+    Держит один открытый поток микрофона, складывает фреймы в кольцевой
+    буфер и передает готовые фразы распознаванию через очередь.
+    """
+    
+    def __init__(self, microphone, energy_threshold: float = 300,
+                 phrase_time_limit: float = 5, buffer_seconds: float = 10,
+                 max_pending_phrases: int = 8):
+        """
+        Args:
+            microphone: Источник звука (sr.Microphone)
+            energy_threshold: Начальный порог энергии речи
+            phrase_time_limit: Максимальная длительность фразы в секундах
+            buffer_seconds: Емкость кольцевого буфера в секундах
+            max_pending_phrases: Емкость очереди готовых фраз
+        """
+        self.microphone = microphone
+        self.energy_threshold = energy_threshold
+        self.phrase_time_limit = phrase_time_limit
+        self.buffer_seconds = buffer_seconds
+        
+        self.phrases = queue.Queue(maxsize=max_pending_phrases)
+        self.dropped_phrases = 0
+        # Внешний приемник фраз (например, стадия конвейера); возвращает False при переполнении
+        self.on_phrase = None
+        self.ring = None
+        
+        # Потоковое распознавание: фабрика потоков и обработчик частичных гипотез.
+        # Обработчик возвращает True, если команда уже выполнена по гипотезе.
+        self.stream_factory = None
+        self.on_partial = None
+        self._stream = None
+        self._partial = ""
+        self._partial_repeats = 0
+        self._partial_consumed = False
+        
+        self._source = None
+        self._running = False
+        self._threads = []
+    
+    def start(self):
+        """Открытие потока микрофона и запуск захвата"""
+        if self._running:
+            return
+        
+        self._source = self.microphone.__enter__()
+        self.sample_rate = self._source.SAMPLE_RATE
+        self.sample_width = self._source.SAMPLE_WIDTH
+        self.chunk = self._source.CHUNK
+        
+        frame_duration = self.chunk / self.sample_rate
+        self.ring = FrameRingBuffer(int(self.buffer_seconds / frame_duration))
+        self.segmenter = PhraseSegmenter(
+            frame_duration,
+            # Непрерывная речь дольше 10 секунд считается шумом
+            EnergyVAD(self.energy_threshold, max_speech_frames=int(10 / frame_duration)),
+            phrase_time_limit=self.phrase_time_limit
+        )
+        
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._read_loop, name="AudioCaptureReader", daemon=True),
+            threading.Thread(target=self._segment_loop, name="AudioCaptureVAD", daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def _read_loop(self):
+        """Чтение фреймов из открытого потока"""
+        while self._running:
+            try:
+                frame = self._source.stream.read(self.chunk)
+            except Exception as e:
+                print(f"Ошибка чтения микрофона: {e}")
+                time.sleep(0.1)
+                continue
+            if frame:
+                self.ring.write(frame)
+    
+    def _segment_loop(self):
+        """Детектор речи и нарезка фраз"""
+        while self._running or len(self.ring):
+            frame = self.ring.read(timeout=0.1)
+            if frame is None:
+                continue
+            phrase = self.segmenter.push(frame, frame_rms(frame, self.sample_width))
+            transcript = self._feed_stream(frame, phrase)
+            if phrase:
+                self._emit(phrase, transcript)
+        
+        phrase = self.segmenter.flush()
+        transcript = self._finish_stream(phrase)
+        if phrase:
+            self._emit(phrase, transcript)
+    
+    def _feed_stream(self, frame: bytes, phrase: Optional[bytes]) -> Optional[str]:
+        """
+        Потоковое распознавание текущей фразы
+        
+        Returns:
+            Optional[str]: Итоговый текст, если фраза завершилась
+        """
+        if self.stream_factory is None:
+            return None
+        
+        if self._stream is not None:
+            self._update_partial(self._stream.feed(frame))
+        elif self.segmenter.in_phrase and not phrase:
+            self._stream = self.stream_factory(self.sample_rate, self.sample_width)
+            if self._stream is None:
+                return None
+            # Первый фрейм фразы идет вместе с предшествующими ему фреймами
+            partial = ""
+            for buffered in self.segmenter.current_frames:
+                partial = self._stream.feed(buffered)
+            self._update_partial(partial)
+        
+        if phrase or not self.segmenter.in_phrase:
+            return self._finish_stream(phrase)
+        return None
+    
+    def _update_partial(self, partial: str):
+        """Передача частичной гипотезы обработчику"""
+        if not partial:
+            return
+        if partial == self._partial:
+            self._partial_repeats += 1
+        else:
+            self._partial = partial
+            self._partial_repeats = 1
+        
+        if self.on_partial is not None and not self._partial_consumed:
+            try:
+                self._partial_consumed = bool(self.on_partial(partial, self._partial_repeats))
+            except Exception as e:
+                print(f"Ошибка обработки частичной гипотезы: {e}")
+    
+    def _finish_stream(self, phrase: Optional[bytes]) -> Optional[str]:
+        """Завершение потокового распознавания фразы"""
+        stream, self._stream = self._stream, None
+        self._partial = ""
+        self._partial_repeats = 0
+        if stream is None or not phrase:
+            self._partial_consumed = False
+            return None
+        try:
+            return stream.finish().strip().lower()
+        except Exception as e:
+            print(f"Ошибка потокового распознавания: {e}")
+            return None
+    
+    def _emit(self, data: bytes, transcript: Optional[str] = None):
+        """Передача фразы распознаванию"""
+        audio = Phrase(data, self.sample_rate, self.sample_width, transcript, self._partial_consumed)
+        self._partial_consumed = False
+        if self.on_phrase is not None:
+            if not self.on_phrase(audio):
+                self.dropped_phrases += 1
+            return
+        try:
+            self.phrases.put_nowait(audio)
+        except queue.Full:
+            self.dropped_phrases += 1
+    
+    def get_phrase(self, timeout: Optional[float] = None) -> Optional[sr.AudioData]:
+        """
+        Получение следующей фразы
+        
+        Args:
+            timeout: Время ожидания в секундах
+        
+        Returns:
+            Optional[sr.AudioData]: Фраза или None по таймауту
+        """
+        try:
+            return self.phrases.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def get_statistics(self) -> dict:
+        """Статистика захвата"""
+        if self.ring is None:
+            return {}
+        return {
+            'buffered_frames': len(self.ring),
+            'written_frames': self.ring.written_frames,
+            'dropped_frames': self.ring.dropped_frames,
+            'pending_phrases': self.phrases.qsize(),
+            'dropped_phrases': self.dropped_phrases,
+            'energy_threshold': self.segmenter.vad.energy_threshold,
+            'noise_resets': self.segmenter.vad.resets
+        }
+    
+    def stop(self):
+        """Остановка захвата и закрытие потока микрофона"""
+        if not self._running:
+            return
+        self._running = False
+        for thread in self._threads:
+            thread.join(1.0)
+        self._threads = []
+        try:
+            self.microphone.__exit__(None, None, None)
+        except Exception as e:
+            print(f"Ошибка закрытия микрофона: {e}")
+        self._source = None
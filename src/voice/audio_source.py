@@ -0,0 +1,195 @@
+"""
+Источники звука: микрофон или воспроизведение записанных фраз
+"""
+
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import speech_recognition as sr
+
+
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.aif', '.aiff')
+
+
+def list_audio_files(path: str) -> List[str]:
+    """
+    Аудиофайлы каталога по алфавиту (или сам файл)
+    
+    Args:
+        path: Файл или каталог
+    
+    Returns:
+        List[str]: Пути к файлам WAV/FLAC/AIFF
+    """
+    if os.path.isfile(path):
+        return [path]
+    if not os.path.isdir(path):
+        return []
+    return [
+        os.path.join(path, name) for name in sorted(os.listdir(path))
+        if name.lower().endswith(AUDIO_EXTENSIONS)
+    ]
+
+
+class _ReplayStream:
+    """Поток с интерфейсом PyAudio: read() отдает фреймы в темпе воспроизведения"""
+    
+    def __init__(self, source: 'FileReplaySource'):
+        self.source = source
+        self.position = 0
+        self.started_at = None
+    
+    def read(self, size: int, exception_on_overflow: bool = True) -> bytes:
+        source = self.source
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        
+        frames = source.frames
+        index = self.position
+        if source.loop and frames:
+            if index and index % len(frames) == 0:
+                source.finished.set()
+            index %= len(frames)
+        if index < len(frames):
+            frame = frames[index]
+        else:
+            # Записи кончились: тишина, чтобы детектор речи закрыл последнюю фразу
+            source.finished.set()
+            frame = source.silence
+        self.position += 1
+        
+        delay = self.started_at + self.position * source.frame_duration / source.speed - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return frame
+    
+    def close(self):
+        pass
+
+
+class FileReplaySource(sr.AudioSource):
+    """
+    Воспроизведение каталога записей вместо микрофона.
+    
+    Файлы декодируются один раз в 16-битный моно PCM общей частоты, каждый
+    дополняется тишиной до целого фрейма и отделяется паузой, чтобы детектор
+    речи нарезал их на отдельные фразы. Фреймы отдаются в реальном времени,
+    умноженном на speed. Каждый фрейм записи запоминается, поэтому по
+    данным фразы можно узнать, из какого файла она вырезана (identify).
+    """
+    
+    def __init__(self, path: str, speed: float = 1.0, sample_rate: int = 16000,
+                 chunk: int = 1024, gap_seconds: float = 1.0, loop: bool = False):
+        """
+        Args:
+            path: Каталог с записями или один файл
+            speed: Скорость воспроизведения (1.0 — реальное время)
+            sample_rate: Частота, к которой приводятся записи
+            chunk: Размер фрейма в отсчетах
+            gap_seconds: Пауза после каждой записи
+            loop: Повторять записи по кругу
+        """
+        if speed <= 0:
+            raise ValueError("Скорость воспроизведения должна быть больше нуля")
+        self.paths = list_audio_files(path)
+        if not self.paths:
+            raise ValueError(f"Аудиофайлы не найдены: {path}")
+        
+        self.SAMPLE_RATE = sample_rate
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = chunk
+        self.speed = speed
+        self.gap_seconds = gap_seconds
+        self.loop = loop
+        self.frame_duration = chunk / sample_rate
+        self.silence = b"\0" * (chunk * self.SAMPLE_WIDTH)
+        
+        self.stream = None
+        self.frames: List[bytes] = []
+        self.durations: Dict[str, float] = {}
+        self.finished = threading.Event()
+        self._owners: Dict[bytes, str] = {}
+    
+    def _load(self):
+        """Декодирование записей во фреймы"""
+        frame_bytes = self.CHUNK * self.SAMPLE_WIDTH
+        gap = [self.silence] * max(1, int(round(self.gap_seconds / self.frame_duration)))
+        frames = list(gap)
+        for path in self.paths:
+            try:
+                with sr.AudioFile(path) as audio_file:
+                    audio = sr.Recognizer().record(audio_file)
+            except Exception as e:
+                print(f"Ошибка чтения записи {path}: {e}")
+                continue
+            data = audio.get_raw_data(convert_rate=self.SAMPLE_RATE, convert_width=self.SAMPLE_WIDTH)
+            self.durations[path] = len(data) / float(self.SAMPLE_RATE * self.SAMPLE_WIDTH)
+            if len(data) % frame_bytes:
+                data += b"\0" * (frame_bytes - len(data) % frame_bytes)
+            for offset in range(0, len(data), frame_bytes):
+                frame = data[offset:offset + frame_bytes]
+                frames.append(frame)
+                if frame != self.silence:
+                    self._owners.setdefault(frame, path)
+            frames.extend(gap)
+        self.frames = frames
+    
+    def __enter__(self):
+        if not self.frames:
+            self._load()
+        self.finished.clear()
+        self.stream = _ReplayStream(self)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None
+    
+    @property
+    def total_seconds(self) -> float:
+        """Длительность всех записей с паузами"""
+        return len(self.frames) * self.frame_duration
+    
+    def identify(self, frame_data: bytes) -> Optional[str]:
+        """
+        Запись, из которой вырезана фраза
+        
+        Args:
+            frame_data: PCM-данные фразы из AudioCapture
+        
+        Returns:
+            Optional[str]: Путь к записи, которой принадлежит больше всего фреймов
+        """
+        frame_bytes = self.CHUNK * self.SAMPLE_WIDTH
+        votes = Counter()
+        for offset in range(0, len(frame_data) - frame_bytes + 1, frame_bytes):
+            owner = self._owners.get(frame_data[offset:offset + frame_bytes])
+            if owner is not None:
+                votes[owner] += 1
+        if not votes:
+            return None
+        return votes.most_common(1)[0][0]
+
+
+def create_audio_source(settings: dict) -> sr.AudioSource:
+    """
+    Источник звука по секции recognition конфигурации
+    
+    Args:
+        settings: audio_source (microphone или replay), device_index,
+            replay_path, replay_speed
+    
+    Returns:
+        sr.AudioSource: Микрофон или воспроизведение записей
+    """
+    if settings.get('audio_source', 'microphone') == 'replay':
+        try:
+            return FileReplaySource(
+                settings.get('replay_path', 'fixtures/audio'),
+                speed=settings.get('replay_speed', 1.0)
+            )
+        except ValueError as e:
+            print(f"Ошибка источника записей, используется микрофон: {e}")
+    return sr.Microphone(device_index=settings.get('device_index'))
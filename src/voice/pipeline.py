@@ -0,0 +1,223 @@
+"""
+Конвейер голосового помощника: захват → распознавание → выполнение → речь
+"""
+
+import queue
+import threading
+import time
+import sys
+import os
+
+# Добавляем путь к модулям
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.latency_stats import LatencyStats
+from utils.tracing import activate
+
+
+class PipelineStage:
+    """
+    Стадия конвейера со своим потоком и ограниченной входной очередью.
+    
+    Обработчик получает элемент и возвращает результат для следующей
+    стадии или None, если передавать дальше нечего. Трасса элемента
+    идет вместе с ним и на время обработки становится текущей.
+    """
+    
+    def __init__(self, name: str, handler, maxsize: int = 4, output=None):
+        """
+        Args:
+            name: Название стадии
+            handler: Функция обработки элемента
+            maxsize: Емкость входной очереди
+            output: Следующая стадия
+        """
+        self.name = name
+        self.handler = handler
+        self.output = output
+        self.queue = queue.Queue(maxsize=maxsize)
+        
+        self.wait_stats = LatencyStats()
+        self.process_stats = LatencyStats()
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+        
+        self._running = False
+        self._thread = None
+    
+    def start(self):
+        """Запуск потока стадии"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"Pipeline-{self.name}", daemon=True)
+        self._thread.start()
+    
+    def offer(self, item, trace=None) -> bool:
+        """
+        Неблокирующая передача элемента (для источников, которые не могут ждать)
+        
+        Args:
+            item: Элемент
+            trace: Трасса фразы или None
+        
+        Returns:
+            bool: False если очередь заполнена и элемент отброшен
+        """
+        try:
+            self.queue.put_nowait((item, time.monotonic(), trace))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self._track_depth()
+        return True
+    
+    def put(self, item, timeout: float = None, trace=None) -> bool:
+        """
+        Передача элемента с ожиданием места в очереди
+        
+        Returns:
+            bool: False если место не освободилось за timeout
+        """
+        try:
+            self.queue.put((item, time.monotonic(), trace), timeout=timeout)
+        except queue.Full:
+            return False
+        self._track_depth()
+        return True
+    
+    def _track_depth(self):
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+    
+    def _run(self):
+        """Цикл обработки элементов"""
+        while self._running:
+            try:
+                item, enqueued_at, trace = self.queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            
+            started_at = time.monotonic()
+            self.wait_stats.add(started_at - enqueued_at)
+            if trace is not None:
+                trace.mark(f"{self.name}_wait", started_at)
+                activate(trace)
+            try:
+                result = self.handler(item)
+            except Exception as e:
+                self.errors += 1
+                print(f"Ошибка стадии {self.name}: {e}")
+                result = None
+            finished_at = time.monotonic()
+            self.process_stats.add(finished_at - started_at)
+            self.processed += 1
+            if trace is not None:
+                trace.mark(self.name, finished_at)
+                activate(None)
+            
+            if result is not None and self.output is not None:
+                # Пока следующая стадия занята, ждем, проверяя остановку
+                while self._running and not self.output.put(result, timeout=0.2, trace=trace):
+                    pass
+    
+    def stop(self, timeout: float = 1.0):
+        """Остановка потока стадии"""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def clear(self) -> int:
+        """Удаление необработанных элементов"""
+        cleared = 0
+        while True:
+            try:
+                self.queue.get_nowait()
+                cleared += 1
+            except queue.Empty:
+                return cleared
+    
+    def get_statistics(self) -> dict:
+        """Глубина очереди и времена ожидания/обработки"""
+        return {
+            'depth': self.queue.qsize(),
+            'capacity': self.queue.maxsize,
+            'max_depth': self.max_depth,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'wait': self.wait_stats.summary(),
+            'process': self.process_stats.summary()
+        }
+
+
+class VoicePipeline:
+    """
+    Конвейер из независимых стадий.
+    
+    Захват не ждет распознавания: пока распознается или выполняется
+    предыдущая фраза, следующая уже записывается.
+    """
+    
+    def __init__(self, capture, recognize, dispatch, speak, queue_size: int = 4,
+                 gate=None, tracer=None):
+        """
+        Args:
+            capture: AudioCapture — источник фраз
+            recognize: Функция audio -> текст или None
+            dispatch: Функция текст -> ответ для озвучивания или None
+            speak: Функция озвучивания ответа
+            queue_size: Емкость очереди перед каждой стадией
+            gate: Функция audio -> audio или None перед распознаванием
+                (например, фильтр слова активации)
+            tracer: PipelineTracer для задержек по стадиям
+        """
+        self.capture = capture
+        self.tracer = tracer
+        
+        self.speech = PipelineStage('speech', speak, queue_size)
+        self.dispatch = PipelineStage('dispatch', dispatch, queue_size, output=self.speech)
+        self.recognition = PipelineStage('recognition', recognize, queue_size, output=self.dispatch)
+        self.gate = None
+        if gate is not None:
+            self.gate = PipelineStage('gate', gate, queue_size, output=self.recognition)
+        
+        self.capture.on_phrase = self._on_phrase
+    
+    def _on_phrase(self, audio) -> bool:
+        """Передача фразы первой стадии с новой трассой"""
+        trace = self.tracer.begin() if self.tracer is not None else None
+        if trace is not None:
+            # Трасса начинается с начала речи: первая стадия — сама фраза
+            ended_at = getattr(audio, 'ended_at', trace.started_at)
+            duration = len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+            trace.started_at = trace.last_at = ended_at - duration
+            trace.mark('capture', ended_at)
+        return (self.gate or self.recognition).offer(audio, trace)
+    
+    @property
+    def stages(self):
+        stages = [self.recognition, self.dispatch, self.speech]
+        return [self.gate] + stages if self.gate else stages
+    
+    def start(self):
+        """Запуск стадий от конца к началу и затем захвата"""
+        for stage in reversed(self.stages):
+            stage.start()
+        self.capture.start()
+    
+    def stop(self):
+        """Остановка захвата и всех стадий"""
+        self.capture.stop()
+        for stage in self.stages:
+            stage.stop()
+    
+    def get_statistics(self) -> dict:
+        """Статистика захвата и каждой стадии"""
+        stats = {'capture': self.capture.get_statistics()}
+        for stage in self.stages:
+            stats[stage.name] = stage.get_statistics()
+        return stats
@@ -0,0 +1,294 @@
+"""
+Подключаемые движки распознавания речи
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional
+
+import speech_recognition as sr
+
+try:
+    import vosk
+except ImportError:
+    vosk = None
+
+
+class RecognitionError(Exception):
+    """Ошибка движка распознавания (сеть, модель, сервис)"""
+
+
+class RecognitionStream(ABC):
+    """Потоковое распознавание одной фразы"""
+    
+    @abstractmethod
+    def feed(self, frame: bytes) -> str:
+        """
+        Передача очередного фрейма
+        
+        Args:
+            frame: Сырые PCM-данные (16 бит, моно)
+        
+        Returns:
+            str: Текущая частичная гипотеза (может быть пустой)
+        """
+        pass
+    
+    @abstractmethod
+    def finish(self) -> str:
+        """
+        Завершение фразы
+        
+        Returns:
+            str: Итоговый текст
+        """
+        pass
+
+
+class BaseRecognizer(ABC):
+    """Базовый класс движков распознавания"""
+    
+    name = "base"
+    offline = False
+    supports_streaming = False
+    
+    def __init__(self, language: str = "ru-RU"):
+        self.language = language
+    
+    @abstractmethod
+    def recognize(self, audio: sr.AudioData) -> Optional[str]:
+        """
+        Распознавание записанной фразы
+        
+        Args:
+            audio: Аудиоданные фразы
+        
+        Returns:
+            Optional[str]: Текст в нижнем регистре или None, если речь не разобрана
+        
+        Raises:
+            RecognitionError: Движок недоступен
+        """
+        pass
+    
+    def start_stream(self, sample_rate: int, sample_width: int) -> Optional[RecognitionStream]:
+        """
+        Начало потокового распознавания фразы
+        
+        Returns:
+            Optional[RecognitionStream]: Поток или None, если движок его не поддерживает
+        """
+        return None
+
+
+class GoogleRecognizer(BaseRecognizer):
+    """Google Web Speech API (требует сети)"""
+    
+    name = "google"
+    
+    def __init__(self, language: str = "ru-RU", recognizer: sr.Recognizer = None):
+        super().__init__(language)
+        self.recognizer = recognizer or sr.Recognizer()
+    
+    def recognize(self, audio: sr.AudioData) -> Optional[str]:
+        try:
+            return self.recognizer.recognize_google(audio, language=self.language).lower()
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            raise RecognitionError(str(e))
+
+
+class SphinxRecognizer(BaseRecognizer):
+    """CMU Sphinx через pocketsphinx (оффлайн, без потокового режима)"""
+    
+    name = "sphinx"
+    offline = True
+    
+    def __init__(self, language: str = "ru-RU", recognizer: sr.Recognizer = None):
+        super().__init__(language)
+        self.recognizer = recognizer or sr.Recognizer()
+    
+    def recognize(self, audio: sr.AudioData) -> Optional[str]:
+        try:
+            return self.recognizer.recognize_sphinx(audio, language=self.language).lower()
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            raise RecognitionError(str(e))
+
+
+class VoskStream(RecognitionStream):
+    """Потоковое распознавание фразы движком Vosk"""
+    
+    def __init__(self, model, sample_rate: int):
+        self.recognizer = vosk.KaldiRecognizer(model, sample_rate)
+        self.partial = ""
+        self._final_parts = []
+    
+    def feed(self, frame: bytes) -> str:
+        if self.recognizer.AcceptWaveform(frame):
+            # Движок сам закрыл сегмент внутри фразы
+            text = json.loads(self.recognizer.Result()).get('text', '')
+            if text:
+                self._final_parts.append(text)
+            self.partial = " ".join(self._final_parts)
+        else:
+            current = json.loads(self.recognizer.PartialResult()).get('partial', '')
+            self.partial = " ".join(self._final_parts + ([current] if current else []))
+        return self.partial
+    
+    def finish(self) -> str:
+        text = json.loads(self.recognizer.FinalResult()).get('text', '')
+        if text:
+            self._final_parts.append(text)
+        return " ".join(self._final_parts)
+
+
+class VoskRecognizer(BaseRecognizer):
+    """Оффлайн-распознавание Vosk с частичными гипотезами по ходу речи"""
+    
+    name = "vosk"
+    offline = True
+    supports_streaming = True
+    
+    # Частота, на которой обучены модели Vosk
+    MODEL_SAMPLE_RATE = 16000
+    
+    def __init__(self, language: str = "ru-RU", model_path: str = "models/vosk-model-small-ru"):
+        super().__init__(language)
+        if vosk is None:
+            raise RecognitionError("Пакет vosk не установлен")
+        if not os.path.isdir(model_path):
+            raise RecognitionError(f"Модель Vosk не найдена: {model_path}")
+        
+        vosk.SetLogLevel(-1)
+        self.model = vosk.Model(model_path)
+    
+    def recognize(self, audio: sr.AudioData) -> Optional[str]:
+        stream = VoskStream(self.model, self.MODEL_SAMPLE_RATE)
+        stream.feed(audio.get_raw_data(convert_rate=self.MODEL_SAMPLE_RATE, convert_width=2))
+        text = stream.finish().strip()
+        return text.lower() or None
+    
+    def start_stream(self, sample_rate: int, sample_width: int) -> Optional[RecognitionStream]:
+        if sample_width != 2:
+            return None
+        return VoskStream(self.model, sample_rate)
+
+
+class StubRecognizer(BaseRecognizer):
+    """
+    Распознавание без движка для прогонов на записях.
+    
+    Фраза сопоставляется с записью функцией identify (например,
+    FileReplaySource.identify), а текст берется из расшифровок записей.
+    """
+    
+    name = "stub"
+    offline = True
+    
+    # Файл расшифровок в каталоге записей: {"имя файла": "текст"}
+    TRANSCRIPTS_FILE = "transcripts.json"
+    
+    def __init__(self, transcripts: Dict[str, str], identify: Callable[[bytes], Optional[str]],
+                 language: str = "ru-RU"):
+        """
+        Args:
+            transcripts: Путь к записи -> текст
+            identify: Функция PCM-данные фразы -> путь к записи или None
+            language: Язык (для совместимости с другими движками)
+        """
+        super().__init__(language)
+        self.transcripts = transcripts
+        self.identify = identify
+        self.recognized = 0
+        self.unknown = 0
+    
+    @classmethod
+    def load_transcripts(cls, paths) -> Dict[str, str]:
+        """
+        Расшифровки записей
+        
+        Порядок поиска: transcripts.json в каталоге записи, файл .txt рядом
+        с записью, имя файла (подчеркивания заменяются пробелами).
+        
+        Args:
+            paths: Пути к записям
+        
+        Returns:
+            Dict[str, str]: Путь -> текст в нижнем регистре
+        """
+        listings = {}
+        transcripts = {}
+        for path in paths:
+            directory, name = os.path.split(path)
+            if directory not in listings:
+                listings[directory] = {}
+                listing = os.path.join(directory, cls.TRANSCRIPTS_FILE)
+                if os.path.isfile(listing):
+                    try:
+                        with open(listing, 'r', encoding='utf-8') as f:
+                            listings[directory] = json.load(f)
+                    except (OSError, ValueError) as e:
+                        print(f"Ошибка чтения расшифровок {listing}: {e}")
+            
+            stem = os.path.splitext(name)[0]
+            text = listings[directory].get(name)
+            sidecar = os.path.join(directory, stem + ".txt")
+            if text is None and os.path.isfile(sidecar):
+                with open(sidecar, 'r', encoding='utf-8') as f:
+                    text = f.read()
+            if text is None:
+                text = stem.replace("_", " ")
+            transcripts[path] = text.strip().lower()
+        return transcripts
+    
+    @classmethod
+    def for_source(cls, source) -> 'StubRecognizer':
+        """Распознавание фраз FileReplaySource по расшифровкам его записей"""
+        return cls(cls.load_transcripts(source.paths), source.identify)
+    
+    def recognize(self, audio: sr.AudioData) -> Optional[str]:
+        path = self.identify(audio.frame_data)
+        text = self.transcripts.get(path) if path else None
+        if text:
+            self.recognized += 1
+        else:
+            self.unknown += 1
+        return text or None
+
+
+RECOGNIZERS = {
+    GoogleRecognizer.name: GoogleRecognizer,
+    SphinxRecognizer.name: SphinxRecognizer,
+    VoskRecognizer.name: VoskRecognizer
+}
+
+
+def create_recognizer(settings: dict, recognizer: sr.Recognizer = None) -> BaseRecognizer:
+    """
+    Создание движка по секции recognition конфигурации
+    
+    Args:
+        settings: Настройки распознавания (engine, language, model_path)
+        recognizer: Общий sr.Recognizer для онлайн-движков
+    
+    Returns:
+        BaseRecognizer: Выбранный движок или Google при ошибке инициализации
+    """
+    engine = settings.get('engine', GoogleRecognizer.name)
+    language = settings.get('language', 'ru-RU')
+    
+    try:
+        if engine == VoskRecognizer.name:
+            return VoskRecognizer(language, settings.get('model_path', 'models/vosk-model-small-ru'))
+        if engine == SphinxRecognizer.name:
+            return SphinxRecognizer(language, recognizer)
+        if engine != GoogleRecognizer.name:
+            print(f"Неизвестный движок распознавания: {engine}")
+    except RecognitionError as e:
+        print(f"Ошибка инициализации движка {engine}: {e}")
+    
+    return GoogleRecognizer(language, recognizer)
@@ -0,0 +1,346 @@
+"""
+Постоянный сервис синтеза речи с очередью фраз
+"""
+
+import itertools
+import queue
+import threading
+import time
+import sys
+import os
+from collections import deque
+
+import pyttsx3
+
+# Добавляем путь к модулям
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.voice_utils import VoiceUtils
+from utils.latency_stats import LatencyStats
+from voice.audio_cache import WavPlayer
+
+
+class Utterance:
+    """Фраза в очереди синтеза"""
+    
+    __slots__ = ('id', 'text', 'enqueued_at', 'started_at', 'trace')
+    
+    def __init__(self, utterance_id: int, text: str, trace=None):
+        self.id = utterance_id
+        self.text = text
+        self.enqueued_at = time.monotonic()
+        self.started_at = None
+        self.trace = trace
+
+
+# Пустой элемент очереди для пробуждения потока синтеза
+_WAKEUP = object()
+
+
+class TTSService:
+    """
+    Долгоживущий поток синтеза речи.
+    
+    Движок pyttsx3 создается и настраивается один раз, голос выбирается
+    один раз, фразы берутся из очереди по порядку. Если передан кэш,
+    фразы из него воспроизводятся готовыми файлами без синтеза.
+    """
+    
+    # Сколько раз фраза должна прозвучать, чтобы попасть в кэш
+    CACHE_AFTER = 2
+    
+    def __init__(self, config=None, on_first_audio=None, cache=None):
+        """
+        Args:
+            config: Настройки голоса (rate, volume, voice_id)
+            on_first_audio: Callback(text, seconds) с задержкой до начала звучания
+            cache: AudioCache для готовых записей фраз
+        """
+        self.config = config or {}
+        self.on_first_audio = on_first_audio
+        self.ttfa_stats = LatencyStats()
+        
+        self.engine = None
+        self.voice_id = None
+        self.settings = {}
+        self.available = False
+        
+        self.cache = cache
+        self.player = WavPlayer() if cache and WavPlayer.is_available() else None
+        self.cache_after = self.config.get('cache_after', self.CACHE_AFTER)
+        self._render_backlog = deque()
+        self._render_keys = set()
+        self._counts = {}
+        
+        self._queue = queue.Queue()
+        self._ids = itertools.count(1)
+        self._current = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread = None
+        self._running = False
+    
+    def start(self):
+        """Запуск потока синтеза"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="TTSService", daemon=True)
+        self._thread.start()
+    
+    def _init_engine(self):
+        """Однократная инициализация движка и выбор голоса"""
+        settings = VoiceUtils.get_voice_settings()
+        settings.update({k: v for k, v in self.config.items() if v is not None})
+        self.settings = settings
+        
+        self.engine = pyttsx3.init()
+        self.engine.setProperty('rate', settings.get('rate', 150))
+        self.engine.setProperty('volume', settings.get('volume', 0.8))
+        
+        self.voice_id = settings.get('voice_id') or VoiceUtils.find_russian_voice(self.engine)
+        if self.voice_id:
+            self.engine.setProperty('voice', self.voice_id)
+        
+        self.engine.connect('started-utterance', self._on_started)
+    
+    def _run(self):
+        """Основной цикл потока синтеза"""
+        try:
+            self._init_engine()
+            self.available = True
+        except Exception as e:
+            print(f"Ошибка инициализации TTS: {e}")
+        finally:
+            self._ready.set()
+        
+        while self._running:
+            try:
+                # Свободное время между фразами тратится на наполнение кэша
+                if self._render_backlog:
+                    utterance = self._queue.get_nowait()
+                else:
+                    utterance = self._queue.get()
+            except queue.Empty:
+                self._render_next()
+                continue
+            
+            if utterance is None:
+                break
+            if utterance is _WAKEUP or not self.available:
+                continue
+            
+            with self._lock:
+                self._current = utterance
+            try:
+                self._say(utterance)
+            except Exception as e:
+                print(f"Ошибка TTS: {e}")
+            finally:
+                with self._lock:
+                    self._current = None
+        
+        if self.engine:
+            self.engine.stop()
+        if self.player:
+            self.player.close()
+    
+    def _say(self, utterance: Utterance):
+        """Синтез одной фразы или воспроизведение готовой записи"""
+        text = VoiceUtils.format_response(utterance.text)
+        
+        if self.cache is not None and self.player is not None:
+            key = self._cache_key(text)
+            path = self.cache.get(key)
+            if path:
+                try:
+                    self.player.play(path, on_start=lambda: self._report_first_audio(utterance))
+                    return
+                except Exception as e:
+                    print(f"Ошибка воспроизведения из кэша TTS: {e}")
+            self._count_for_cache(text, key)
+        
+        self.engine.say(text)
+        self.engine.runAndWait()
+    
+    def _cache_key(self, text: str) -> str:
+        """Ключ кэша для текущих настроек голоса"""
+        return self.cache.make_key(
+            text,
+            self.voice_id,
+            self.settings.get('rate'),
+            self.settings.get('volume')
+        )
+    
+    def _count_for_cache(self, text: str, key: str):
+        """Учет частоты фразы и постановка частых фраз на запись"""
+        # Словарь частот не должен расти бесконечно
+        if len(self._counts) > 1000:
+            self._counts.clear()
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+        if count >= self.cache_after:
+            self._schedule_render(text, key)
+    
+    def _schedule_render(self, text: str, key: str):
+        """Постановка фразы в очередь записи"""
+        if self.player is None or key in self._render_keys or self.cache.contains(key):
+            return
+        self._render_keys.add(key)
+        self._render_backlog.append((text, key))
+    
+    def _render_next(self):
+        """Запись одной фразы из очереди в кэш"""
+        text, key = self._render_backlog.popleft()
+        self._render_keys.discard(key)
+        if not self.available or self.cache.contains(key):
+            return
+        
+        temp_path = self.cache.temp_path_for(key)
+        try:
+            self.engine.save_to_file(text, temp_path)
+            self.engine.runAndWait()
+            if os.path.exists(temp_path) and not WavPlayer.is_wav(temp_path):
+                # Драйвер пишет другой формат (AIFF на macOS): проигрыватель его не откроет
+                os.remove(temp_path)
+                self._disable_cache("синтезатор сохраняет не WAV")
+                return
+            self.cache.commit(key, temp_path)
+        except Exception as e:
+            print(f"Ошибка записи фразы в кэш TTS: {e}")
+    
+    def _disable_cache(self, reason: str):
+        """Отключение воспроизведения из кэша (вызывается в потоке синтеза)"""
+        print(f"Кэш TTS отключен: {reason}")
+        player, self.player = self.player, None
+        if player is not None:
+            player.close()
+        self._render_backlog.clear()
+        self._render_keys.clear()
+    
+    def warm(self, texts) -> int:
+        """
+        Фоновая запись фраз в кэш
+        
+        Args:
+            texts: Тексты фраз
+        
+        Returns:
+            int: Количество фраз, поставленных на запись
+        """
+        if self.cache is None or self.player is None:
+            return 0
+        
+        # Ключ зависит от голоса, поэтому ждем инициализации движка
+        threading.Thread(target=self._warm, args=(list(texts),), daemon=True).start()
+        return len(texts)
+    
+    def _warm(self, texts):
+        """Постановка фраз на запись после инициализации движка"""
+        self.start()
+        self.wait_ready()
+        if not self.available:
+            return
+        for text in texts:
+            text = VoiceUtils.format_response(text)
+            self._schedule_render(text, self._cache_key(text))
+        # Пробуждение потока, если он ждет фраз
+        self._queue.put(_WAKEUP)
+    
+    def _on_started(self, name=None):
+        """Callback pyttsx3: начало звучания фразы"""
+        with self._lock:
+            utterance = self._current
+        if utterance is not None and utterance.started_at is None:
+            self._report_first_audio(utterance)
+    
+    def _report_first_audio(self, utterance: Utterance):
+        """Учет задержки до первого звука"""
+        utterance.started_at = time.monotonic()
+        elapsed = utterance.started_at - utterance.enqueued_at
+        self.ttfa_stats.add(elapsed)
+        if utterance.trace is not None:
+            utterance.trace.finish('tts_start', utterance.started_at)
+        if self.on_first_audio:
+            try:
+                self.on_first_audio(utterance.text, elapsed)
+            except Exception as e:
+                print(f"Ошибка обработчика TTS: {e}")
+    
+    def speak(self, text: str, interrupt: bool = False, trace=None) -> int:
+        """
+        Постановка фразы в очередь
+        
+        Args:
+            text: Текст для произнесения
+            interrupt: Прервать текущую речь и очистить очередь
+            trace: Трасса фразы пользователя (завершается с началом звучания)
+        
+        Returns:
+            int: Идентификатор фразы
+        """
+        if interrupt:
+            self.flush()
+            self.cancel()
+        
+        utterance = Utterance(next(self._ids), text, trace)
+        self._queue.put(utterance)
+        self.start()
+        return utterance.id
+    
+    def cancel(self):
+        """Прерывание текущей фразы"""
+        with self._lock:
+            speaking = self._current is not None
+        player = self.player
+        if speaking and player:
+            player.stop()
+        if speaking and self.engine:
+            try:
+                self.engine.stop()
+            except Exception as e:
+                print(f"Ошибка остановки TTS: {e}")
+    
+    def flush(self) -> int:
+        """
+        Удаление фраз, которые еще не начали звучать
+        
+        Returns:
+            int: Количество удаленных фраз
+        """
+        dropped = 0
+        while True:
+            try:
+                if self._queue.get_nowait() is not _WAKEUP:
+                    dropped += 1
+            except queue.Empty:
+                return dropped
+    
+    def is_speaking(self) -> bool:
+        """Идет ли сейчас синтез"""
+        with self._lock:
+            return self._current is not None
+    
+    def pending(self) -> int:
+        """Количество фраз в очереди"""
+        return self._queue.qsize()
+    
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Ожидание инициализации движка"""
+        return self._ready.wait(timeout)
+    
+    def get_statistics(self) -> dict:
+        """Статистика задержки до первого звука"""
+        stats = self.ttfa_stats.summary()
+        stats['pending'] = self.pending()
+        if self.cache is not None:
+            stats['cache'] = self.cache.get_statistics()
+        return stats
+    
+    def shutdown(self, timeout: float = 2.0):
+        """Остановка потока синтеза"""
+        self._running = False
+        self.flush()
+        self.cancel()
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout)
@@ -0,0 +1,261 @@
+"""
+Локальное обнаружение слова активации перед полным распознаванием
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional, Tuple
+
+import speech_recognition as sr
+
+try:
+    import vosk
+except ImportError:
+    vosk = None
+
+
+class WakeWordError(RuntimeError):
+    """Обязательное слово активации нельзя обнаружить"""
+    pass
+
+
+class BaseWakeWordSpotter(ABC):
+    """Базовый класс детекторов слова активации"""
+    
+    @abstractmethod
+    def spot(self, audio: sr.AudioData) -> Optional[float]:
+        """
+        Поиск слова активации во фразе
+        
+        Args:
+            audio: Аудиоданные фразы
+        
+        Returns:
+            Optional[float]: Время окончания слова (секунды от начала фразы) или None
+        """
+        pass
+
+
+class VoskWakeWordSpotter(BaseWakeWordSpotter):
+    """
+    Детектор на Vosk с грамматикой из одного слова.
+    
+    Ограниченная грамматика делает декодирование намного дешевле полного
+    распознавания: все прочие слова сворачиваются в [unk]. Модель берется
+    у движка распознавания Vosk, если он уже загружен, а декодер создается
+    один раз и сбрасывается перед каждой фразой.
+    """
+    
+    SAMPLE_RATE = 16000
+    
+    def __init__(self, words, model_path: str = "models/vosk-model-small-ru", model=None):
+        """
+        Args:
+            words: Слово активации и его варианты
+            model_path: Каталог модели Vosk (если model не передана)
+            model: Уже загруженная vosk.Model движка распознавания
+        
+        Raises:
+            WakeWordError: Нет vosk, модели или слов в ее словаре
+        """
+        if vosk is None:
+            raise WakeWordError("Пакет vosk не установлен")
+        if model is None:
+            if not os.path.isdir(model_path):
+                raise WakeWordError(f"Модель Vosk не найдена: {model_path}")
+            vosk.SetLogLevel(-1)
+            model = vosk.Model(model_path)
+        
+        self.words = {word.lower() for word in words}
+        self.model = model
+        # Слова вне словаря грамматика молча заменит на [unk], и фильтр не сработает никогда
+        find_word = getattr(model, 'find_word', None)
+        if find_word is not None:
+            missing = sorted(
+                word for word in self.words
+                if any(find_word(part) < 0 for part in word.split())
+            )
+            if missing:
+                raise WakeWordError(f"Слова активации нет в словаре модели: {', '.join(missing)}")
+        
+        self.grammar = json.dumps(sorted(self.words) + ["[unk]"], ensure_ascii=False)
+        self._recognizer = vosk.KaldiRecognizer(model, self.SAMPLE_RATE, self.grammar)
+        self._recognizer.SetWords(True)
+        self._lock = threading.Lock()
+    
+    def spot(self, audio: sr.AudioData) -> Optional[float]:
+        data = audio.get_raw_data(convert_rate=self.SAMPLE_RATE, convert_width=2)
+        with self._lock:
+            self._recognizer.Reset()
+            self._recognizer.AcceptWaveform(data)
+            result = json.loads(self._recognizer.FinalResult())
+        for word in result.get('result', []):
+            if word.get('word') in self.words:
+                return word.get('end', 0.0)
+        return None
+
+
+class WakeWordGate:
+    """
+    Стадия-фильтр перед распознаванием.
+    
+    Пропускает только звук после слова активации: остаток фразы, в которой
+    оно прозвучало, или следующую фразу в пределах окна ожидания.
+    """
+    
+    # Остаток фразы короче этого считается пустым
+    MIN_COMMAND_SECONDS = 0.3
+    
+    def __init__(self, spotter: BaseWakeWordSpotter, window: float = 5.0):
+        """
+        Args:
+            spotter: Детектор слова активации
+            window: Сколько секунд после слова ждать команду
+        """
+        self.spotter = spotter
+        self.window = window
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+        
+        self.phrases = 0
+        self.detections = 0
+        self.passed = 0
+        self.audio_seconds = 0.0
+        self.cpu_seconds = 0.0
+    
+    def process(self, audio: sr.AudioData) -> Optional[sr.AudioData]:
+        """
+        Фильтрация фразы
+        
+        Args:
+            audio: Аудиоданные фразы
+        
+        Returns:
+            Optional[sr.AudioData]: Звук для распознавания или None
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.phrases += 1
+            if now < self._open_until:
+                # Команда после слова активации: окно закрывается
+                self._open_until = 0.0
+                self.passed += 1
+                return audio
+        
+        end = self._spot(audio)
+        if end is None:
+            return None
+        
+        with self._lock:
+            self.detections += 1
+            duration = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+            if duration - end >= self.MIN_COMMAND_SECONDS:
+                self.passed += 1
+                return self._cut(audio, end)
+            self._open_until = time.monotonic() + self.window
+        return None
+    
+    def _spot(self, audio: sr.AudioData) -> Optional[float]:
+        """Вызов детектора с учетом процессорного времени"""
+        started = time.thread_time()
+        end = self.spotter.spot(audio)
+        elapsed = time.thread_time() - started
+        
+        with self._lock:
+            self.cpu_seconds += elapsed
+            self.audio_seconds += len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+        return end
+    
+    @staticmethod
+    def _cut(audio: sr.AudioData, start: float) -> sr.AudioData:
+        """Отрезание слова активации от начала фразы"""
+        segment = audio.get_segment(start_ms=int(start * 1000))
+        # Сохраняем метаданные фразы захвата (время окончания и т.п.), кроме
+        # потоковой расшифровки: в ней есть слово активации, остаток распознается заново
+        for name, value in vars(audio).items():
+            if name != 'transcript' and name not in vars(segment):
+                setattr(segment, name, value)
+        return segment
+    
+    def is_open(self) -> bool:
+        """Ожидается ли команда после слова активации"""
+        with self._lock:
+            return time.monotonic() < self._open_until
+    
+    def evaluate(self, samples: Iterable[Tuple[sr.AudioData, bool]]) -> dict:
+        """
+        Оценка качества детектора на размеченных фразах
+        
+        Args:
+            samples: Пары (фраза, содержит ли она слово активации)
+        
+        Returns:
+            dict: Доли ложных срабатываний и пропусков, стоимость CPU
+        """
+        positives = negatives = false_accepts = false_rejects = 0
+        cpu_seconds = audio_seconds = 0.0
+        
+        for audio, has_wake_word in samples:
+            started = time.thread_time()
+            detected = self.spotter.spot(audio) is not None
+            cpu_seconds += time.thread_time() - started
+            audio_seconds += len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+            
+            if has_wake_word:
+                positives += 1
+                false_rejects += not detected
+            else:
+                negatives += 1
+                false_accepts += detected
+        
+        return {
+            'positives': positives,
+            'negatives': negatives,
+            'false_accept_rate': false_accepts / negatives if negatives else None,
+            'false_reject_rate': false_rejects / positives if positives else None,
+            'cpu_per_audio_second': cpu_seconds / audio_seconds if audio_seconds else None
+        }
+    
+    def get_statistics(self) -> dict:
+        """Статистика работы фильтра"""
+        with self._lock:
+            return {
+                'phrases': self.phrases,
+                'detections': self.detections,
+                'passed': self.passed,
+                'rejected': self.phrases - self.passed,
+                'audio_seconds': round(self.audio_seconds, 3),
+                'cpu_seconds': round(self.cpu_seconds, 3),
+                'cpu_per_audio_second': (
+                    self.cpu_seconds / self.audio_seconds if self.audio_seconds else None
+                )
+            }
+
+
+def create_wake_word_gate(settings: dict, model=None) -> Optional[WakeWordGate]:
+    """
+    Создание фильтра по настройкам команд
+    
+    Args:
+        settings: Настройки (require_wake_word, wake_word, wake_word_aliases,
+            wake_window, model_path)
+        model: Загруженная vosk.Model движка распознавания (чтобы не грузить вторую)
+    
+    Returns:
+        Optional[WakeWordGate]: Фильтр или None, если он выключен
+    
+    Raises:
+        WakeWordError: Слово активации обязательно, но детектор недоступен —
+            без него помощник выполнял бы любую услышанную фразу
+    """
+    if not settings.get('require_wake_word', False):
+        return None
+    
+    words = [settings.get('wake_word', 'sendi')] + list(settings.get('wake_word_aliases', []))
+    spotter = VoskWakeWordSpotter(
+        words, settings.get('model_path', 'models/vosk-model-small-ru'), model=model
+    )
+    return WakeWordGate(spotter, settings.get('wake_window', 5.0))
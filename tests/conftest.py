@@ -0,0 +1,68 @@
+"""
+Общие заготовки тестов: путь к src, поддельные команды и обработчик без встроенных команд
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from commands.base_command import BaseCommand
+from commands.cache_policy import CachePolicy
+from commands.command_processor import CommandProcessor
+
+
+class FakeCommand(BaseCommand):
+    """Команда без побочных эффектов: считает вызовы и может ждать событие"""
+    
+    def __init__(self, name: str, keywords: list, response: str = None, delay: float = 0.0,
+                 release: threading.Event = None, parallel_safe: bool = False,
+                 timeout: float = 5.0, cache_policy: CachePolicy = None):
+        super().__init__(name, f"Тестовая команда {name}", keywords)
+        self.response = response or name
+        self.delay = delay
+        self.release = release
+        self.parallel_safe = parallel_safe
+        self.timeout = timeout
+        if cache_policy is not None:
+            self.cache_policy = cache_policy
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def execute(self, command_text: str):
+        with self._lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.release is not None:
+            self.release.wait(10)
+        return True, self.response
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Файлы кэша пишутся во временный каталог, а не в кэш пользователя"""
+    monkeypatch.setenv("SENDI_CACHE_DIR", str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def make_processor():
+    """Обработчик только с переданными командами (встроенные удаляются)"""
+    created = []
+    
+    def factory(*commands, **kwargs):
+        processor = CommandProcessor(**kwargs)
+        for name in [command.name for command in processor.all_commands]:
+            processor.remove_command(name)
+        for command in commands:
+            processor.add_command(command)
+        created.append(processor)
+        return processor
+    
+    yield factory
+    for processor in created:
+        processor.shutdown()
@@ -0,0 +1,65 @@
+"""
+Пакетная обработка: порядок результатов при параллельных и последовательных командах
+"""
+
+import io
+
+from headless.bulk import BulkRunner, read_utterances
+
+from conftest import FakeCommand
+
+
+def run_bulk(processor, lines, **kwargs):
+    runner = BulkRunner(processor, **kwargs)
+    results = []
+    try:
+        stats = runner.run(read_utterances(io.StringIO("\n".join(lines))), results.append)
+    finally:
+        runner.shutdown()
+    return results, stats
+
+
+def test_output_follows_input_order(make_processor):
+    # Медленная параллельная команда завершается позже быстрых последовательных
+    slow = FakeCommand("Медленная", ["медленно"], delay=0.1, parallel_safe=True)
+    fast = FakeCommand("Быстрая", ["быстро"], parallel_safe=True)
+    serial = FakeCommand("Последовательная", ["по одной"], delay=0.02)
+    processor = make_processor(slow, fast, serial, fuzzy_threshold=1.0)
+    
+    lines = ["медленно", "быстро", "по одной", "абракадабра", "медленно", "по одной", "быстро"]
+    results, stats = run_bulk(processor, lines, jobs=3)
+    
+    assert [result['text'] for result in results] == lines
+    assert [result['line'] for result in results] == list(range(1, len(lines) + 1))
+    assert [result['command'] for result in results] == [
+        "Медленная", "Быстрая", "Последовательная", None, "Медленная", "Последовательная", "Быстрая"
+    ]
+    assert results[3]['success'] is False
+    assert stats['processed'] == len(lines)
+    assert stats['matched'] == 6
+    assert stats['succeeded'] == 6
+    assert slow.calls == 2 and serial.calls == 2 and fast.calls == 2
+
+
+def test_window_smaller_than_input_keeps_order(make_processor):
+    slow = FakeCommand("Медленная", ["медленно"], delay=0.02, parallel_safe=True)
+    serial = FakeCommand("Последовательная", ["по одной"])
+    processor = make_processor(slow, serial, fuzzy_threshold=1.0)
+    
+    lines = ["медленно", "по одной"] * 10
+    results, _ = run_bulk(processor, lines, jobs=1)
+    
+    assert [result['text'] for result in results] == lines
+
+
+def test_match_only_does_not_execute(make_processor):
+    command = FakeCommand("Медленная", ["медленно"], parallel_safe=True)
+    processor = make_processor(command)
+    
+    results, stats = run_bulk(processor, ["медленно", '{"id": 7, "text": "медленно"}'], match_only=True)
+    
+    assert [result['command'] for result in results] == ["Медленная", "Медленная"]
+    assert results[1]['id'] == 7
+    assert 'success' not in results[0]
+    assert command.calls == 0
+    assert stats['succeeded'] == 0
@@ -0,0 +1,81 @@
+"""
+Выполнение команд в пуле: таймауты, отказ при перегрузке и учет занятых мест
+"""
+
+import threading
+import time
+
+from commands.command_processor import CommandProcessor
+
+from conftest import FakeCommand
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_timeout_keeps_slot_until_command_finishes(make_processor):
+    release = threading.Event()
+    command = FakeCommand("Зависшая", ["зависни"], release=release, timeout=0.05)
+    processor = make_processor(max_workers=1)
+    
+    assert processor.execute_with_timeout(command, "зависни") == (False, CommandProcessor.TIMEOUT_RESPONSE)
+    assert processor.timeouts == {"Зависшая": 1}
+    # Команду нельзя прервать: место занято, пока она не завершится
+    assert processor._in_flight == 1
+    
+    release.set()
+    assert wait_for(lambda: processor._in_flight == 0)
+
+
+def test_busy_when_abandoned_commands_fill_pool(make_processor):
+    release = threading.Event()
+    hung = FakeCommand("Зависшая", ["зависни"], release=release, timeout=0.05)
+    queued = FakeCommand("В очереди", ["жди"], timeout=5.0)
+    processor = make_processor(max_workers=1)
+    
+    processor.execute_with_timeout(hung, "зависни")
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(processor.execute_with_timeout(queued, "жди")))
+    waiter.start()
+    assert wait_for(lambda: processor._in_flight == 2)
+    
+    # Лимит max_workers * 2 исчерпан: новая команда сразу получает отказ
+    assert processor.execute_with_timeout(queued, "жди") == (False, CommandProcessor.BUSY_RESPONSE)
+    assert processor._in_flight == 2
+    
+    release.set()
+    waiter.join(2)
+    assert results == [(True, "В очереди")]
+    assert wait_for(lambda: processor._in_flight == 0)
+
+
+def test_cancelled_queued_command_releases_slot(make_processor):
+    release = threading.Event()
+    hung = FakeCommand("Зависшая", ["зависни"], release=release, timeout=0.05)
+    queued = FakeCommand("В очереди", ["жди"], timeout=0.05)
+    processor = make_processor(max_workers=1)
+    
+    processor.execute_with_timeout(hung, "зависни")
+    # Вторая команда не успевает начаться и отменяется по таймауту
+    assert processor.execute_with_timeout(queued, "жди") == (False, CommandProcessor.TIMEOUT_RESPONSE)
+    assert queued.calls == 0
+    assert processor._in_flight == 1
+    
+    release.set()
+    assert wait_for(lambda: processor._in_flight == 0)
+
+
+def test_shutdown_answers_busy(make_processor):
+    processor = make_processor(max_workers=1)
+    processor.shutdown()
+    
+    command = FakeCommand("Любая", ["любая"])
+    assert processor.execute_with_timeout(command, "любая") == (False, CommandProcessor.BUSY_RESPONSE)
+    assert processor._in_flight == 0
+    assert command.calls == 0
@@ -0,0 +1,78 @@
+"""
+Поиск команды: нормальные формы слов и неоднозначность в режиме ranked
+"""
+
+from commands.command_processor import CommandProcessor
+
+from conftest import FakeCommand
+
+
+def test_lemma_match_finds_telegram():
+    processor = CommandProcessor()
+    try:
+        match = processor.match_details("открой телеграмм")
+        assert match['command'] is not None
+        assert match['command'].name == "Открой Телеграм"
+        assert match['method'] == 'exact'
+    finally:
+        processor.shutdown()
+
+
+def test_lemma_index_matches_other_word_form(make_processor):
+    notes = FakeCommand("Заметки", ["покажи заметки"])
+    processor = make_processor(notes, fuzzy_threshold=1.0)
+    
+    # Подстрока "покажи заметки" не входит в текст, совпадают только нормальные формы
+    match = processor.match_details("покажи заметку")
+    assert match['command'] is notes
+    assert match['score'] == 1.0
+
+
+def test_lemma_index_respects_word_boundaries(make_processor):
+    processor = make_processor(FakeCommand("Погода", ["погоду"]), fuzzy_threshold=1.0)
+    
+    # Основа "погод" есть внутри слова "непогоды", но не отдельным словом
+    assert processor.match_details("непогоды")['command'] is None
+    assert processor.match_details("какая погода")['command'] is not None
+
+
+def test_ranked_picks_clear_winner(make_processor):
+    browser = FakeCommand("Браузер", ["открой браузер", "браузер"])
+    mail = FakeCommand("Почта", ["проверь почту", "почта"])
+    processor = make_processor(browser, mail, dispatch_mode=CommandProcessor.RANKED)
+    
+    match = processor.match_details("открой браузер")
+    assert match['command'] is browser
+    assert match['method'] == 'ranked'
+    assert not match['ambiguous']
+
+
+def test_ranked_reports_ambiguous_pair(make_processor):
+    browser = FakeCommand("Браузер", ["открой браузер"])
+    mail = FakeCommand("Почта", ["открой почту"])
+    processor = make_processor(
+        browser, mail, dispatch_mode=CommandProcessor.RANKED,
+        ambiguity_margin=0.5, fuzzy_threshold=1.0
+    )
+    
+    match = processor.match_details("открой браузер и почту")
+    assert match['command'] is None
+    assert match['ambiguous']
+    assert set(match['candidates']) == {browser, mail}
+    
+    success, response = processor.execute_match(match, "открой браузер и почту")
+    assert not success
+    assert response.startswith("Команда неоднозначна")
+    assert browser.calls == mail.calls == 0
+
+
+def test_ranked_below_threshold_is_not_recognized(make_processor):
+    processor = make_processor(
+        FakeCommand("Браузер", ["открой браузер"]),
+        dispatch_mode=CommandProcessor.RANKED, fuzzy_threshold=1.0
+    )
+    
+    match = processor.match_details("абракадабра")
+    assert match['command'] is None
+    assert not match['ambiguous']
+    assert processor.execute_match(match, "абракадабра") == (False, "Команда не распознана")
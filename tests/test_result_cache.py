@@ -0,0 +1,62 @@
+"""
+Кэш результатов команд: время жизни, вытеснение и удаление по команде
+"""
+
+from commands.cache_policy import CachePolicy, ResultCache
+
+from conftest import FakeCommand
+
+
+def test_entry_expires_at_deadline():
+    cache = ResultCache()
+    cache.put("key", (True, "ответ"), expires_at=100.0)
+    
+    assert cache.get("key", now=99.9) == (True, "ответ")
+    assert cache.get("key", now=100.0) is None
+    assert cache.get("key", now=50.0) is None
+    
+    stats = cache.get_statistics()
+    assert stats['hits'] == 1
+    assert stats['expirations'] == 1
+    assert stats['entries'] == 0
+
+
+def test_ttl_policy_expiry():
+    assert CachePolicy.ttl(30).expiry(1000.0) == 1030.0
+    assert CachePolicy.none().expiry(1000.0) is None
+    assert CachePolicy.ttl(0).expiry(1000.0) is None
+
+
+def test_lru_evicts_oldest():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", (True, "a"), expires_at=100.0)
+    cache.put("b", (True, "b"), expires_at=100.0)
+    cache.get("a", now=0.0)
+    cache.put("c", (True, "c"), expires_at=100.0)
+    
+    assert cache.get("b", now=0.0) is None
+    assert cache.get("a", now=0.0) == (True, "a")
+    assert cache.get_statistics()['evictions'] == 1
+
+
+def test_invalidate_command_keeps_names_sharing_prefix():
+    cache = ResultCache()
+    cache.put(ResultCache.make_key("Время"), (True, "1"), expires_at=100.0)
+    cache.put(ResultCache.make_key("Время", "москва"), (True, "2"), expires_at=100.0)
+    cache.put(ResultCache.make_key("Время года"), (True, "3"), expires_at=100.0)
+    
+    assert cache.invalidate_command("Время") == 2
+    assert cache.get(ResultCache.make_key("Время"), now=0.0) is None
+    assert cache.get(ResultCache.make_key("Время года"), now=0.0) == (True, "3")
+
+
+def test_processor_reuses_and_invalidates_cached_result(make_processor):
+    command = FakeCommand("Сведения", ["сведения"], cache_policy=CachePolicy.ttl(60))
+    processor = make_processor(command)
+    
+    assert processor.process_command("сведения") == (True, "Сведения")
+    assert processor.process_command("сведения") == (True, "Сведения")
+    assert command.calls == 1
+    
+    processor.remove_command("Сведения")
+    assert processor.result_cache.get_statistics()['entries'] == 0